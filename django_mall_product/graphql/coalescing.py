@@ -0,0 +1,201 @@
+from concurrent.futures import Future
+from functools import lru_cache
+import asyncio
+import hashlib
+import json
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+
+from graphql import GraphQLError, get_operation_ast, parse, print_ast
+from graphql.language import OperationType
+
+from django_mall_product.graphql.middleware import should_read_from_replica
+
+
+@lru_cache(maxsize=1024)
+def normalize_query(query, operation_name):
+    try:
+        document = parse(query)
+    except GraphQLError:
+        return None
+
+    operation = get_operation_ast(document, operation_name)
+    if operation is None or operation.operation != OperationType.QUERY:
+        return None
+
+    return print_ast(document)
+
+
+def get_flight_key(request, data):
+    query = normalize_query(data.get("query") or "", data.get("operationName"))
+    if query is None:
+        return None
+
+    user = getattr(request, "user", None)
+
+    return hashlib.sha1(
+        json.dumps(
+            [
+                getattr(connection, "schema_name", "public"),
+                should_read_from_replica(request),
+                getattr(request, "LANGUAGE_CODE", None)
+                or request.headers.get("Accept-Language"),
+                str(user.pk) if user is not None and user.is_authenticated else None,
+                query,
+                data.get("variables"),
+                data.get("operationName"),
+            ],
+            sort_keys=True,
+            default=str,
+        ).encode("utf-8")
+    ).hexdigest()
+
+
+class SingleFlight:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.flights = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def begin(self, key):
+        with self.lock:
+            future = self.flights.get(key)
+            if future is not None:
+                self.followers += 1
+                return future, False
+
+            future = Future()
+            self.flights[key] = future
+            self.leaders += 1
+
+            return future, True
+
+    def end(self, key, future, result=None, error=None):
+        with self.lock:
+            self.flights.pop(key, None)
+
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key, fn):
+        future, is_leader = self.begin(key)
+        if not is_leader:
+            return future.result()
+
+        result = error = None
+        try:
+            result = fn()
+        except BaseException as exception:
+            error = exception
+            raise
+        finally:
+            self.end(key, future, result=result, error=error)
+
+        return result
+
+    async def do_async(self, key, fn):
+        future, is_leader = self.begin(key)
+        if not is_leader:
+            return await asyncio.wrap_future(future)
+
+        result = error = None
+        try:
+            result = await fn()
+        except BaseException as exception:
+            error = exception
+            raise
+        finally:
+            self.end(key, future, result=result, error=error)
+
+        return result
+
+    def get_metrics(self):
+        with self.lock:
+            total = self.leaders + self.followers
+
+            return {
+                "leaders": self.leaders,
+                "followers": self.followers,
+                "in_flight": len(self.flights),
+                "coalescing_ratio": self.followers / total if total else 0.0,
+            }
+
+
+single_flight = SingleFlight()
+
+
+class ResponseCache:
+    def __init__(self):
+        self.alias = getattr(settings, "PRODUCT_RESPONSE_CACHE", None)
+        self.timeout = getattr(settings, "PRODUCT_RESPONSE_CACHE_TIMEOUT", 5)
+        self.stale_timeout = getattr(settings, "PRODUCT_RESPONSE_CACHE_STALE", 30)
+
+    @property
+    def enabled(self):
+        return self.alias is not None
+
+    def get_cache_key(self, key):
+        return "product:response:{}".format(key)
+
+    def get(self, key):
+        entry = caches[self.alias].get(self.get_cache_key(key))
+        if entry is None:
+            return None, False
+
+        stored_at, result = entry
+
+        return result, stored_at + self.timeout < time.time()
+
+    def set(self, key, result):
+        caches[self.alias].set(
+            self.get_cache_key(key),
+            (time.time(), result),
+            self.timeout + self.stale_timeout,
+        )
+
+
+class Coalescer:
+    def __init__(self, flights=None, response_cache=None):
+        self.flights = flights or single_flight
+        self.response_cache = response_cache or ResponseCache()
+        self.revalidating = set()
+
+    async def execute(self, request, data, fn):
+        key = get_flight_key(request, data)
+        if key is None:
+            return await fn()
+
+        if not self.response_cache.enabled:
+            return await self.flights.do_async(key, fn)
+
+        result, is_stale = self.response_cache.get(key)
+        if result is None:
+            return await self.flights.do_async(key, self.fill(key, fn))
+        if is_stale and key not in self.revalidating:
+            self.revalidating.add(key)
+            asyncio.ensure_future(self.revalidate(key, fn))
+
+        return result
+
+    def fill(self, key, fn):
+        async def wrapper():
+            result = await fn()
+            if result[1] == 200:
+                self.response_cache.set(key, result)
+
+            return result
+
+        return wrapper
+
+    async def revalidate(self, key, fn):
+        try:
+            await self.flights.do_async(key, self.fill(key, fn))
+        finally:
+            self.revalidating.discard(key)
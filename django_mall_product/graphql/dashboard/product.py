@@ -3,9 +3,12 @@ import re
 
 from django.core.exceptions import ValidationError
 from django.db import connection, transaction
+from django.db.models import Case, Value, When
 
 from graphene import ResolveInfo
-from graphql_relay import from_global_id
+from graphene_django.registry import get_global_registry
+from graphql_jwt.decorators import login_required
+from graphql_relay import from_global_id, to_global_id
 from safedelete.models import HARD_DELETE
 import graphene
 
@@ -14,19 +17,127 @@ from django_app_core.helpers.translation_helper import TranslationHelper
 from django_app_core.relay.connection import DjangoFilterConnectionField
 from django_app_core.types import TaskWarningType
 from django_app_organization.models import Organization
+from django_mall_product import models
 from django_mall_product.graphql.dashboard.types.product import (
     ProductNode,
     ProductTransInput,
 )
-from django_mall_product.models import (
-    Collection,
-    CollectionProduct,
-    Product,
-    ProductTrans,
-    ProductPlace,
-    ProductSupplier,
-    Variant,
+from django_mall_product.graphql.dashboard.types.product_duplicate_job import (
+    ProductDuplicateJobType,
 )
+from django_mall_product.graphql.dashboard.types.product_stat import (
+    ProductStatTotalType,
+    ProductStatType,
+    attach_products,
+)
+from django_mall_product.helpers.collection_helper import CollectionHelper
+from django_mall_product.helpers.duplicate_helper import DuplicateHelper
+from django_mall_product.helpers.invalidation_helper import InvalidationHelper
+from django_mall_product.helpers.product_page_helper import ProductPageHelper
+from django_mall_product.helpers.reference_helper import (
+    MissingReferenceError,
+    ReferenceHelper,
+)
+from django_mall_product.helpers.slug_helper import SlugHelper
+from django_mall_product.helpers.sort_key_helper import SortKeyHelper
+from django_mall_product.helpers.stat_helper import StatHelper
+from django_mall_product.helpers.trans_helper import TransHelper
+from django_mall_product.models import Product, ProductDuplicateJob, Variant
+
+
+def get_node_type_name(model):
+    node = get_global_registry().get_type_for_model(model)
+
+    return node._meta.name if node is not None else None
+
+
+def resolve_references(placeId, supplierId, collectionIds, collectionId):
+    if collectionId and collectionId not in collectionIds:
+        raise ValidationError("The collectionId must in collectionIds!")
+
+    reference_helper = ReferenceHelper()
+    unsupported = {}
+    for name, value, model_name, many in (
+        ("placeId", placeId, "ProductPlace", False),
+        ("supplierId", supplierId, "ProductSupplier", False),
+        ("collectionIds", collectionIds, "Collection", True),
+    ):
+        model = getattr(models, model_name, None)
+        if model is None:
+            if value:
+                unsupported[name] = list(value) if many else [value]
+            continue
+
+        add = reference_helper.add_many if many else reference_helper.add
+        add(name, value, model, type_name=get_node_type_name(model))
+
+    if unsupported:
+        raise MissingReferenceError(unsupported)
+
+    references = reference_helper.resolve()
+
+    collections = references.get("collectionIds", [])
+    collection_ids = {str(collection.id) for collection in collections}
+    collection_id = (
+        str(collections[collectionIds.index(collectionId)].id) if collectionId else None
+    )
+    place = references.get("placeId")
+    supplier = references.get("supplierId")
+
+    return (
+        place.id if place else None,
+        supplier.id if supplier else None,
+        collection_ids,
+        collection_id,
+    )
+
+
+def sync_collections(product, collection_ids, primary_collection_id=None):
+    membership_model = CollectionHelper().membership_model
+    if membership_model is None:
+        return
+
+    existing = {
+        str(collection_id): is_primary
+        for collection_id, is_primary in membership_model.objects.filter(
+            product=product
+        ).values_list("collection_id", "is_primary")
+    }
+
+    removed = existing.keys() - collection_ids
+    if removed:
+        membership_model.objects.filter(
+            product=product, collection_id__in=removed
+        ).delete(force_policy=HARD_DELETE)
+
+    added = collection_ids - existing.keys()
+    if added:
+        membership_model.objects.bulk_create(
+            [
+                membership_model(
+                    collection_id=collection_id,
+                    product=product,
+                    is_primary=collection_id == primary_collection_id,
+                )
+                for collection_id in added
+            ]
+        )
+
+    changed = [
+        collection_id
+        for collection_id, is_primary in existing.items()
+        if collection_id in collection_ids
+        and is_primary != (collection_id == primary_collection_id)
+    ]
+    if changed:
+        membership_model.objects.filter(
+            product=product, collection_id__in=changed
+        ).update(
+            is_primary=Case(
+                When(collection_id=primary_collection_id, then=Value(True)),
+                default=Value(False),
+            )
+        )
 
 
 class CreateProduct(graphene.relay.ClientIDMutation):
@@ -91,48 +202,14 @@ class CreateProduct(graphene.relay.ClientIDMutation):
                 "The priceSaleAmount must be a positive number or zero!"
             )
 
-        if placeId:
-            try:
-                _, place_id = from_global_id(placeId)
-                ProductPlace.objects.only("id").get(id=place_id)
-            except:
-                raise Exception("Can not find this productPlace!")
-        else:
-            place_id = None
-
-        if supplierId:
-            try:
-                _, supplier_id = from_global_id(supplierId)
-                ProductSupplier.objects.only("id").get(id=supplier_id)
-            except:
-                raise Exception("Can not find this productSupplier!")
-        else:
-            supplier_id = None
+        place_id, supplier_id, collection_ids, collection_id = resolve_references(
+            placeId, supplierId, collectionIds, collectionId
+        )
 
         organization = Organization.objects.only("id").get(
             schema_name=connection.schema_name
         )
 
-        collection_id = None
-        if collectionId:
-            if collectionId not in collectionIds:
-                raise ValidationError("The collectionId must in collectionIds!")
-            try:
-                _, collection_id = from_global_id(collectionId)
-            except:
-                raise Exception("Can not find this collection!")
-
-        collections = []
-        if collectionIds:
-            for collectionId in collectionIds:
-                try:
-                    _, _id = from_global_id(collectionId)
-
-                    collection = Collection.objects.only("id").get(pk=_id)
-                    collections.append(collection)
-                except:
-                    raise Exception("Can not find some collection!")
-
         if (
             Product.objects.only("id")
             .filter(organization_id=organization.id, slug=slug)
@@ -151,14 +228,7 @@ class CreateProduct(graphene.relay.ClientIDMutation):
                 is_published=isPublished,
                 published_at=publishedAt,
             )
-            for translation in translations:
-                product.translations.create(
-                    language_code=translation["language_code"],
-                    name=translation["name"],
-                    description=translation["description"],
-                    summary=translation["summary"],
-                    content=translation["content"],
-                )
+            TransHelper().upsert("product", product.id, translations)
 
             Variant.objects.create(
                 product=product,
@@ -171,13 +241,11 @@ class CreateProduct(graphene.relay.ClientIDMutation):
                 published_at=publishedAt,
             )
 
-            if collections:
-                for collection in collections:
-                    product.collections.add(collection)
-                if collection_id:
-                    CollectionProduct.objects.filter(
-                        collection_id=collection_id, product=product
-                    ).update(is_primary=True)
+            sync_collections(product, collection_ids, collection_id)
+
+            transaction.on_commit(lambda: ProductPageHelper().rebuild([product.id]))
+            InvalidationHelper().publish("product", [product.id])
+            transaction.on_commit(lambda: SlugHelper().set(Product, slug, product.id))
 
         return CreateProduct(success=True, product=product)
 
@@ -203,6 +271,8 @@ class DeleteProductBatch(graphene.relay.ClientIDMutation):
             "not_found": [],
         }
 
+        deleted_ids = []
+        deleted_slugs = []
         for id in idList:
             try:
                 _, product_id = from_global_id(id)
@@ -210,13 +280,20 @@ class DeleteProductBatch(graphene.relay.ClientIDMutation):
                 warnings["error"].append(id)
 
             try:
-                product = Product.objects.only("id").get(pk=product_id)
+                product = Product.objects.only("id", "slug").get(pk=product_id)
                 product.delete()
+                deleted_ids.append(product.id)
+                deleted_slugs.append(product.slug)
 
                 warnings["done"].append(id)
             except Product.DoesNotExist:
                 warnings["not_found"].append(id)
 
+        if deleted_ids:
+            transaction.on_commit(lambda: ProductPageHelper().delete(deleted_ids))
+            InvalidationHelper().publish("product", deleted_ids)
+            InvalidationHelper().publish("product_slug", deleted_slugs)
+
         return DeleteProductBatch(success=True, warnings=warnings)
 
 
@@ -279,23 +356,9 @@ class UpdateProduct(graphene.relay.ClientIDMutation):
                 "The priceSaleAmount must be a positive number or zero!"
             )
 
-        if placeId:
-            try:
-                _, place_id = from_global_id(placeId)
-                ProductPlace.objects.only("id").get(id=place_id)
-            except:
-                raise Exception("Can not find this productPlace!")
-        else:
-            place_id = None
-
-        if supplierId:
-            try:
-                _, supplier_id = from_global_id(supplierId)
-                ProductSupplier.objects.only("id").get(id=supplier_id)
-            except:
-                raise Exception("Can not find this productSupplier!")
-        else:
-            supplier_id = None
+        place_id, supplier_id, collection_ids, collection_id = resolve_references(
+            placeId, supplierId, collectionIds, collectionId
+        )
 
         try:
             _, product_id = from_global_id(id)
@@ -306,26 +369,6 @@ class UpdateProduct(graphene.relay.ClientIDMutation):
             schema_name=connection.schema_name
         )
 
-        collection_id = None
-        if collectionId:
-            if collectionId not in collectionIds:
-                raise ValidationError("The collectionId must in collectionIds!")
-            try:
-                _, collection_id = from_global_id(collectionId)
-            except:
-                raise Exception("Can not find this collection!")
-
-        collections = []
-        if collectionIds:
-            for collectionId in collectionIds:
-                try:
-                    _, _id = from_global_id(collectionId)
-
-                    collection = Collection.objects.only("id").get(pk=_id)
-                    collections.append(collection)
-                except:
-                    raise Exception("Can not find some collection!")
-
         if (
             Product.objects.exclude(pk=product_id)
             .filter(organization_id=organization.id, slug=slug)
@@ -337,6 +380,7 @@ class UpdateProduct(graphene.relay.ClientIDMutation):
                 product = Product.objects.get(
                     organization_id=organization.id, pk=product_id
                 )
+                previous_slug = product.slug
                 product.place_id = place_id
                 product.supplier_id = supplier_id
                 product.slug = slug
@@ -347,17 +391,7 @@ class UpdateProduct(graphene.relay.ClientIDMutation):
                 product.published_at = publishedAt
                 product.save()
 
-                for translation in translations:
-                    ProductTrans.objects.update_or_create(
-                        product=product,
-                        language_code=translation["language_code"],
-                        defaults={
-                            "name": translation["name"],
-                            "description": translation["description"],
-                            "summary": translation["summary"],
-                            "content": translation["content"],
-                        },
-                    )
+                TransHelper().upsert("product", product.id, translations)
 
                 variant = Variant.objects.get(
                     product=product,
@@ -369,19 +403,15 @@ class UpdateProduct(graphene.relay.ClientIDMutation):
                 variant.is_published = isPublished
                 variant.save()
 
-                collectionproduct_set_collections = product.collectionproduct_set.all()
-                for collection in collectionproduct_set_collections:
-                    collection.delete(force_policy=HARD_DELETE)
-                if collections:
-                    for collection in collections:
-                        product.collections.add(collection)
-                    if collection_id:
-                        CollectionProduct.objects.filter(product=product).update(
-                            is_primary=False
-                        )
-                        CollectionProduct.objects.filter(
-                            collection_id=collection_id, product=product
-                        ).update(is_primary=True)
+                sync_collections(product, collection_ids, collection_id)
+
+                transaction.on_commit(lambda: ProductPageHelper().rebuild([product.id]))
+                InvalidationHelper().publish("product", [product.id])
+                if previous_slug != slug:
+                    InvalidationHelper().publish("product_slug", [previous_slug])
+                transaction.on_commit(
+                    lambda: SlugHelper().set(Product, slug, product.id)
+                )
             except Product.DoesNotExist:
                 raise Exception("Can not find this product!")
             except Variant.DoesNotExist:
@@ -390,9 +420,134 @@ class UpdateProduct(graphene.relay.ClientIDMutation):
         return UpdateProduct(success=True, product=product)
 
 
+class DuplicateProduct(graphene.relay.ClientIDMutation):
+    class Input:
+        id = graphene.ID(required=True)
+        newSlug = graphene.String(required=True)
+        runInBackground = graphene.Boolean()
+
+    success = graphene.Boolean()
+    product = graphene.Field(ProductNode)
+    productId = graphene.ID()
+    inBackground = graphene.Boolean()
+    job = graphene.Field(ProductDuplicateJobType)
+
+    @classmethod
+    @strip_input
+    @transaction.atomic
+    def mutate_and_get_payload(cls, root, info: ResolveInfo, **input):
+        id = input["id"]
+        newSlug = input["newSlug"]
+        runInBackground = (
+            input["runInBackground"] if "runInBackground" in input else None
+        )
+
+        if (
+            not newSlug
+            or re.search(r"\W", newSlug.replace("-", ""))
+            or any(str in newSlug for str in ["\\"])
+        ):
+            raise ValidationError("The slug is invalid!")
+
+        try:
+            _, product_id = from_global_id(id)
+        except:
+            raise Exception("Bad Request!")
+
+        organization = Organization.objects.only("id").get(
+            schema_name=connection.schema_name
+        )
+
+        if (
+            Product.objects.only("id")
+            .filter(organization_id=organization.id, slug=newSlug)
+            .exists()
+        ):
+            raise ValidationError("The slug is already in use!")
+
+        try:
+            product = Product.objects.get(
+                organization_id=organization.id, pk=product_id
+            )
+        except Product.DoesNotExist:
+            raise Exception("Can not find this product!")
+
+        duplicate_helper = DuplicateHelper()
+        if runInBackground is None:
+            runInBackground = duplicate_helper.should_run_in_background(product.id)
+
+        if runInBackground:
+            job = duplicate_helper.duplicate_in_background(product, newSlug)
+
+            return DuplicateProduct(
+                success=True,
+                productId=to_global_id(ProductNode._meta.name, job.new_product_id),
+                inBackground=True,
+                job=job,
+            )
+
+        copy = duplicate_helper.duplicate(product, newSlug)
+
+        return DuplicateProduct(
+            success=True,
+            product=copy,
+            productId=to_global_id(ProductNode._meta.name, copy.id),
+            inBackground=False,
+        )
+
+
+class ReorderProduct(graphene.relay.ClientIDMutation):
+    class Input:
+        id = graphene.ID(required=True)
+        afterId = graphene.ID()
+
+    success = graphene.Boolean()
+    product = graphene.Field(ProductNode)
+
+    @classmethod
+    @strip_input
+    @transaction.atomic
+    def mutate_and_get_payload(cls, root, info: ResolveInfo, **input):
+        id = input["id"]
+        afterId = input["afterId"] if "afterId" in input else None
+
+        try:
+            _, product_id = from_global_id(id)
+            after_id = from_global_id(afterId)[1] if afterId else None
+        except:
+            raise Exception("Bad Request!")
+
+        if after_id == product_id:
+            raise ValidationError("The afterId must not be the id!")
+
+        organization = Organization.objects.only("id").get(
+            schema_name=connection.schema_name
+        )
+
+        products = {
+            str(product.id): product
+            for product in Product.objects.filter(
+                organization_id=organization.id,
+                pk__in=[product_id, after_id] if after_id else [product_id],
+            )
+        }
+        product = products.get(product_id)
+        if product is None or (after_id and after_id not in products):
+            raise Exception("Can not find this product!")
+
+        changed_ids = SortKeyHelper().move(
+            product, products[after_id] if after_id else None
+        )
+        InvalidationHelper().publish("product", changed_ids)
+
+        return ReorderProduct(success=True, product=product)
+
+
 class ProductMutation(graphene.ObjectType):
     product_create = CreateProduct.Field()
     product_delete_batch = DeleteProductBatch.Field()
+    product_duplicate = DuplicateProduct.Field()
+    product_reorder = ReorderProduct.Field()
     product_update = UpdateProduct.Field()
 
 
@@ -404,3 +559,76 @@ class ProductQuery(graphene.ObjectType):
         page_number=graphene.Int(),
         page_size=graphene.Int(),
     )
+    product_stats = graphene.List(
+        ProductStatType,
+        product_id=graphene.ID(required=True),
+        variant_id=graphene.ID(),
+        from_date=graphene.DateTime(name="from", required=True),
+        to_date=graphene.DateTime(name="to", required=True),
+        granularity=graphene.String(default_value="day"),
+    )
+    product_duplicate_job = graphene.Field(
+        ProductDuplicateJobType, product_id=graphene.ID(required=True)
+    )
+    top_products = graphene.List(
+        ProductStatTotalType,
+        from_date=graphene.DateTime(name="from", required=True),
+        to_date=graphene.DateTime(name="to", required=True),
+        order_by=graphene.String(default_value="count_access"),
+        first=graphene.Int(default_value=10),
+    )
+
+    @staticmethod
+    @login_required
+    def resolve_product_stats(
+        root,
+        info: ResolveInfo,
+        product_id,
+        from_date,
+        to_date,
+        granularity,
+        variant_id=None,
+    ):
+        if granularity not in ("hour", "day"):
+            raise ValidationError("The granularity is invalid!")
+
+        try:
+            _, product_id = from_global_id(product_id)
+            variant_id = from_global_id(variant_id)[1] if variant_id else None
+        except:
+            raise Exception("Bad Request!")
+
+        return StatHelper().get_stats(
+            product_id, from_date, to_date, granularity, variant_id
+        )
+
+    @staticmethod
+    @login_required
+    def resolve_product_duplicate_job(root, info: ResolveInfo, product_id):
+        try:
+            _, product_id = from_global_id(product_id)
+        except:
+            raise Exception("Bad Request!")
+
+        organization = Organization.objects.only("id").get(
+            schema_name=connection.schema_name
+        )
+
+        try:
+            return ProductDuplicateJob.objects.get(
+                product__organization_id=organization.id, new_product_id=product_id
+            )
+        except (ProductDuplicateJob.DoesNotExist, ValidationError):
+            raise Exception("Can not find this job!")
+
+    @staticmethod
+    @login_required
+    def resolve_top_products(
+        root, info: ResolveInfo, from_date, to_date, order_by, first
+    ):
+        if order_by not in StatHelper.fields:
+            raise ValidationError("The orderBy is invalid!")
+
+        return attach_products(
+            StatHelper().get_top(from_date, to_date, order_by, min(first, 100))
+        )
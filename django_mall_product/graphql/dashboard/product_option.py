@@ -13,7 +13,11 @@ from django_mall_product.graphql.dashboard.types.product_option import (
     ProductOptionNode,
     ProductOptionTransInput,
 )
-from django_mall_product.models import Product, ProductOption, ProductOptionTrans
+from django_mall_product.helpers.invalidation_helper import InvalidationHelper
+from django_mall_product.helpers.product_page_helper import ProductPageHelper
+from django_mall_product.helpers.sort_key_helper import SortKeyHelper
+from django_mall_product.helpers.trans_helper import TransHelper
+from django_mall_product.models import Product, ProductOption
 
 
 class CreateProductOption(graphene.relay.ClientIDMutation):
@@ -60,11 +64,10 @@ class CreateProductOption(graphene.relay.ClientIDMutation):
                 product=product,
                 sort_key=sortKey,
             )
-            for translation in translations:
-                product_option.translations.create(
-                    language_code=translation["language_code"],
-                    name=translation["name"],
-                )
+            TransHelper().upsert("product_option", product_option.id, translations)
+
+            transaction.on_commit(lambda: ProductPageHelper().rebuild([product.id]))
+            InvalidationHelper().publish("product", [product.id])
 
         return CreateProductOption(success=True, product_option=product_option)
 
@@ -90,6 +93,7 @@ class DeleteProductOptionBatch(graphene.relay.ClientIDMutation):
             "not_found": [],
         }
 
+        product_ids = set()
         for id in idList:
             try:
                 _, product_option_id = from_global_id(id)
@@ -97,15 +101,20 @@ class DeleteProductOptionBatch(graphene.relay.ClientIDMutation):
                 warnings["error"].append(id)
 
             try:
-                product_option = ProductOption.objects.only("id").get(
+                product_option = ProductOption.objects.only("id", "product_id").get(
                     pk=product_option_id
                 )
                 product_option.delete()
+                product_ids.add(product_option.product_id)
 
                 warnings["done"].append(id)
             except ProductOption.DoesNotExist:
                 warnings["not_found"].append(id)
 
+        if product_ids:
+            transaction.on_commit(lambda: ProductPageHelper().rebuild(product_ids))
+            InvalidationHelper().publish("product", product_ids)
+
         return DeleteProductOptionBatch(success=True, warnings=warnings)
 
 
@@ -147,24 +156,77 @@ class UpdateProductOption(graphene.relay.ClientIDMutation):
             product_option.sort_key = sortKey
             product_option.save()
 
-            for translation in translations:
-                ProductOptionTrans.objects.update_or_create(
-                    product_option=product_option,
-                    language_code=translation["language_code"],
-                    defaults={
-                        "name": translation["name"],
-                    },
-                )
+            TransHelper().upsert("product_option", product_option.id, translations)
+
+            transaction.on_commit(
+                lambda: ProductPageHelper().rebuild([product_option.product_id])
+            )
+            InvalidationHelper().publish("product", [product_option.product_id])
         except ProductOption.DoesNotExist:
             raise Exception("Can not find this productOption!")
 
         return UpdateProductOption(success=True, product_option=product_option)
 
 
+class ReorderProductOption(graphene.relay.ClientIDMutation):
+    class Input:
+        id = graphene.ID(required=True)
+        afterId = graphene.ID()
+
+    success = graphene.Boolean()
+    product_option = graphene.Field(ProductOptionNode)
+
+    @classmethod
+    @strip_input
+    @transaction.atomic
+    def mutate_and_get_payload(cls, root, info: ResolveInfo, **input):
+        id = input["id"]
+        afterId = input["afterId"] if "afterId" in input else None
+
+        try:
+            _, product_option_id = from_global_id(id)
+            after_id = from_global_id(afterId)[1] if afterId else None
+        except:
+            raise Exception("Bad Request!")
+
+        if after_id == product_option_id:
+            raise ValidationError("The afterId must not be the id!")
+
+        product_options = {
+            str(product_option.id): product_option
+            for product_option in ProductOption.objects.filter(
+                pk__in=(
+                    [product_option_id, after_id] if after_id else [product_option_id]
+                )
+            )
+        }
+        product_option = product_options.get(product_option_id)
+        if product_option is None or (
+            after_id
+            and (
+                after_id not in product_options
+                or product_options[after_id].product_id != product_option.product_id
+            )
+        ):
+            raise Exception("Can not find this productOption!")
+
+        SortKeyHelper().move(
+            product_option, product_options[after_id] if after_id else None
+        )
+
+        transaction.on_commit(
+            lambda: ProductPageHelper().rebuild([product_option.product_id])
+        )
+        InvalidationHelper().publish("product", [product_option.product_id])
+
+        return ReorderProductOption(success=True, product_option=product_option)
+
+
 class ProductOptionMutation(graphene.ObjectType):
     product_option_create = CreateProductOption.Field()
     product_option_delete_batch = DeleteProductOptionBatch.Field()
     product_option_update = UpdateProductOption.Field()
+    product_option_reorder = ReorderProductOption.Field()
 
 
 class ProductOptionQuery(graphene.ObjectType):
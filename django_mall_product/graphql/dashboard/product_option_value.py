@@ -13,11 +13,11 @@ from django_mall_product.graphql.dashboard.types.product_option_value import (
     ProductOptionValueNode,
     ProductOptionValueTransInput,
 )
-from django_mall_product.models import (
-    ProductOption,
-    ProductOptionValue,
-    ProductOptionValueTrans,
-)
+from django_mall_product.helpers.invalidation_helper import InvalidationHelper
+from django_mall_product.helpers.product_page_helper import ProductPageHelper
+from django_mall_product.helpers.sort_key_helper import SortKeyHelper
+from django_mall_product.helpers.trans_helper import TransHelper
+from django_mall_product.models import ProductOption, ProductOptionValue
 
 
 class CreateProductOptionValue(graphene.relay.ClientIDMutation):
@@ -64,11 +64,14 @@ class CreateProductOptionValue(graphene.relay.ClientIDMutation):
                 product_option=product_option,
                 sort_key=sortKey,
             )
-            for translation in translations:
-                product_option_value.translations.create(
-                    language_code=translation["language_code"],
-                    name=translation["name"],
-                )
+            TransHelper().upsert(
+                "product_option_value", product_option_value.id, translations
+            )
+
+            transaction.on_commit(
+                lambda: ProductPageHelper().rebuild([product_option.product_id])
+            )
+            InvalidationHelper().publish("product", [product_option.product_id])
 
         return CreateProductOptionValue(
             success=True, product_option_value=product_option_value
@@ -96,6 +99,7 @@ class DeleteProductOptionValueBatch(graphene.relay.ClientIDMutation):
             "not_found": [],
         }
 
+        product_ids = set()
         for id in idList:
             try:
                 _, product_option_id = from_global_id(id)
@@ -103,15 +107,22 @@ class DeleteProductOptionValueBatch(graphene.relay.ClientIDMutation):
                 warnings["error"].append(id)
 
             try:
-                product_option_value = ProductOptionValue.objects.only("id").get(
-                    pk=product_option_id
+                product_option_value = (
+                    ProductOptionValue.objects.select_related("product_option")
+                    .only("id", "product_option__product_id")
+                    .get(pk=product_option_id)
                 )
                 product_option_value.delete()
+                product_ids.add(product_option_value.product_option.product_id)
 
                 warnings["done"].append(id)
             except ProductOptionValue.DoesNotExist:
                 warnings["not_found"].append(id)
 
+        if product_ids:
+            transaction.on_commit(lambda: ProductPageHelper().rebuild(product_ids))
+            InvalidationHelper().publish("product", product_ids)
+
         return DeleteProductOptionValueBatch(success=True, warnings=warnings)
 
 
@@ -153,14 +164,17 @@ class UpdateProductOptionValue(graphene.relay.ClientIDMutation):
             product_option_value.sort_key = sortKey
             product_option_value.save()
 
-            for translation in translations:
-                ProductOptionValueTrans.objects.update_or_create(
-                    product_option_value=product_option_value,
-                    language_code=translation["language_code"],
-                    defaults={
-                        "name": translation["name"],
-                    },
-                )
+            TransHelper().upsert(
+                "product_option_value", product_option_value.id, translations
+            )
+
+            product_id = (
+                ProductOption.objects.filter(pk=product_option_value.product_option_id)
+                .values_list("product_id", flat=True)
+                .first()
+            )
+            transaction.on_commit(lambda: ProductPageHelper().rebuild([product_id]))
+            InvalidationHelper().publish("product", [product_id])
         except ProductOptionValue.DoesNotExist:
             raise Exception("Can not find this productOptionValue!")
 
@@ -169,10 +183,72 @@ class UpdateProductOptionValue(graphene.relay.ClientIDMutation):
         )
 
 
+class ReorderProductOptionValue(graphene.relay.ClientIDMutation):
+    class Input:
+        id = graphene.ID(required=True)
+        afterId = graphene.ID()
+
+    success = graphene.Boolean()
+    product_option_value = graphene.Field(ProductOptionValueNode)
+
+    @classmethod
+    @strip_input
+    @transaction.atomic
+    def mutate_and_get_payload(cls, root, info: ResolveInfo, **input):
+        id = input["id"]
+        afterId = input["afterId"] if "afterId" in input else None
+
+        try:
+            _, product_option_value_id = from_global_id(id)
+            after_id = from_global_id(afterId)[1] if afterId else None
+        except:
+            raise Exception("Bad Request!")
+
+        if after_id == product_option_value_id:
+            raise ValidationError("The afterId must not be the id!")
+
+        product_option_values = {
+            str(product_option_value.id): product_option_value
+            for product_option_value in ProductOptionValue.objects.select_related(
+                "product_option"
+            ).filter(
+                pk__in=(
+                    [product_option_value_id, after_id]
+                    if after_id
+                    else [product_option_value_id]
+                )
+            )
+        }
+        product_option_value = product_option_values.get(product_option_value_id)
+        if product_option_value is None or (
+            after_id
+            and (
+                after_id not in product_option_values
+                or product_option_values[after_id].product_option_id
+                != product_option_value.product_option_id
+            )
+        ):
+            raise Exception("Can not find this productOptionValue!")
+
+        SortKeyHelper().move(
+            product_option_value,
+            product_option_values[after_id] if after_id else None,
+        )
+
+        product_id = product_option_value.product_option.product_id
+        transaction.on_commit(lambda: ProductPageHelper().rebuild([product_id]))
+        InvalidationHelper().publish("product", [product_id])
+
+        return ReorderProductOptionValue(
+            success=True, product_option_value=product_option_value
+        )
+
+
 class ProductOptionValueMutation(graphene.ObjectType):
     product_option_value_create = CreateProductOptionValue.Field()
     product_option_value_delete_batch = DeleteProductOptionValueBatch.Field()
     product_option_value_update = UpdateProductOptionValue.Field()
+    product_option_value_reorder = ReorderProductOptionValue.Field()
 
 
 class ProductOptionValueQuery(graphene.ObjectType):
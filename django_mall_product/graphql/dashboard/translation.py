@@ -0,0 +1,58 @@
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from graphene import ResolveInfo
+from graphql_jwt.decorators import login_required
+import graphene
+
+from django_app_core.types import TaskWarningType
+from django_mall_product.helpers.invalidation_helper import InvalidationHelper
+from django_mall_product.helpers.product_page_helper import ProductPageHelper
+from django_mall_product.helpers.trans_helper import TranslationImportHelper
+
+
+class ImportTranslations(graphene.relay.ClientIDMutation):
+    class Input:
+        content = graphene.String(required=True)
+        format = graphene.String()
+        chunkSize = graphene.Int()
+
+    success = graphene.Boolean()
+    count = graphene.Int()
+    warnings = graphene.Field(TaskWarningType)
+
+    @classmethod
+    @login_required
+    @transaction.atomic
+    def mutate_and_get_payload(cls, root, info: ResolveInfo, **input):
+        content = input["content"]
+        format = input["format"] if "format" in input else "csv"
+        chunkSize = input["chunkSize"] if "chunkSize" in input else 1000
+
+        if format not in ("csv", "xliff"):
+            raise ValidationError("The format is invalid!")
+        if chunkSize < 1:
+            raise ValidationError("The chunkSize must be a positive number!")
+
+        result = TranslationImportHelper(chunk_size=chunkSize).import_content(
+            content, format
+        )
+
+        product_ids = result["product_ids"]
+        if product_ids:
+            transaction.on_commit(lambda: ProductPageHelper().rebuild(product_ids))
+            InvalidationHelper().publish("product", product_ids)
+
+        warnings = {
+            "done": [],
+            "error": result["error"],
+            "in_protected": [],
+            "in_use": [],
+            "not_found": result["not_found"],
+        }
+
+        return ImportTranslations(success=True, count=result["done"], warnings=warnings)
+
+
+class TranslationMutation(graphene.ObjectType):
+    translations_import = ImportTranslations.Field()
@@ -14,7 +14,12 @@ import graphene
 
 from django_app_core.relay.connection import ExtendedConnection
 from django_app_core.types import TransTypeInput
-from django_mall_product.models import Product, ProductTrans
+from django_mall_product.helpers.visitor_helper import VisitorHelper
+from django_mall_product.models import (
+    Product,
+    ProductTrans,
+    prefetch_selected_option_values,
+)
 
 
 class ProductType(DjangoObjectType):
@@ -121,6 +126,10 @@ class ProductNode(DjangoObjectType):
 
     translation = graphene.Field(ProductTransType)
     translations = DjangoListField(ProductTransType)
+    unique_viewers = graphene.Int(
+        from_date=graphene.Date(name="from"),
+        to_date=graphene.Date(name="to"),
+    )
 
     @classmethod
     @login_required
@@ -128,7 +137,7 @@ class ProductNode(DjangoObjectType):
         return queryset.prefetch_related(
             "translations",
             "variant_set",
-            "variant_set__selected_option_values",
+            prefetch_selected_option_values("variant_set__selected_option_values"),
             "productoption_set__translations",
             "productoption_set__productoptionvalue_set",
             "productoption_set__productoptionvalue_set__translations",
@@ -152,6 +161,12 @@ class ProductNode(DjangoObjectType):
     def resolve_translations(root: Product, info: ResolveInfo):
         return root.translations
 
+    @staticmethod
+    def resolve_unique_viewers(
+        root: Product, info: ResolveInfo, from_date=None, to_date=None
+    ):
+        return VisitorHelper().count(root.id, from_date, to_date)
+
 
 class ProductConnection(graphene.relay.Connection):
     class Meta:
@@ -0,0 +1,25 @@
+from graphene import ResolveInfo
+from graphene_django import DjangoObjectType
+from graphql_relay import to_global_id
+import graphene
+
+from django_mall_product.graphql.dashboard.types.product import ProductNode
+from django_mall_product.models import ProductDuplicateJob
+
+
+class ProductDuplicateJobType(DjangoObjectType):
+    class Meta:
+        model = ProductDuplicateJob
+        fields = (
+            "slug",
+            "status",
+            "error",
+            "created_at",
+            "updated_at",
+        )
+
+    product_id = graphene.ID()
+
+    @staticmethod
+    def resolve_product_id(root, info: ResolveInfo):
+        return to_global_id(ProductNode._meta.name, root.new_product_id)
@@ -0,0 +1,43 @@
+from graphene import ResolveInfo
+from graphene_django import DjangoObjectType
+import graphene
+
+from django_mall_product.graphql.dashboard.types.product import ProductNode
+from django_mall_product.models import Product, ProductStat
+
+
+class ProductStatType(DjangoObjectType):
+    class Meta:
+        model = ProductStat
+        fields = (
+            "granularity",
+            "period_start",
+            "count_access",
+            "count_add_to_cart",
+        )
+
+
+class ProductStatTotalType(graphene.ObjectType):
+    product = graphene.Field(ProductNode)
+    count_access = graphene.Int()
+    count_add_to_cart = graphene.Int()
+
+    @staticmethod
+    def resolve_product(root, info: ResolveInfo):
+        return root["product"]
+
+    @staticmethod
+    def resolve_count_access(root, info: ResolveInfo):
+        return root["total_count_access"]
+
+    @staticmethod
+    def resolve_count_add_to_cart(root, info: ResolveInfo):
+        return root["total_count_add_to_cart"]
+
+
+def attach_products(rows):
+    products = Product.objects.in_bulk([row["product_id"] for row in rows])
+    for row in rows:
+        row["product"] = products.get(row["product_id"])
+
+    return rows
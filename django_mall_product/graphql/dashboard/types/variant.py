@@ -3,16 +3,16 @@ from django_prices.models import MoneyField
 from graphene import ResolveInfo
 from graphene_django import DjangoObjectType
 from graphene_django.converter import convert_django_field
-from graphene_django.filter import DjangoFilterConnectionField
 import graphene
 import graphene_django_optimizer as gql_optimizer
 
 from django_app_core.relay.connection import ExtendedConnection
 from django_app_core.types import Money
+from django_mall_product.graphql.fields import PrefetchedConnectionField
 from django_mall_product.graphql.dashboard.types.product_option_value import (
     ProductOptionValueNode,
 )
-from django_mall_product.models import Variant, VariantOptionValue
+from django_mall_product.models import Variant, prefetch_selected_option_values
 
 
 class VariantType(DjangoObjectType):
@@ -66,14 +66,14 @@ class VariantNode(gql_optimizer.OptimizedDjangoObjectType):
         interfaces = (graphene.relay.Node,)
         connection_class = ExtendedConnection
 
-    selected_option_values = DjangoFilterConnectionField(
+    selected_option_values = PrefetchedConnectionField(
         ProductOptionValueNode, orderBy=graphene.List(of_type=graphene.String)
     )
 
     @classmethod
     def get_queryset(cls, queryset, info: ResolveInfo):
         return queryset.select_related("product").prefetch_related(
-            "selected_option_values"
+            prefetch_selected_option_values()
         )
 
     @classmethod
@@ -87,10 +87,5 @@ class VariantNode(gql_optimizer.OptimizedDjangoObjectType):
 
     @gql_optimizer.resolver_hints(select_related=("selected_option_values",))
     @staticmethod
-    def resolve_selected_option_values(root: Variant, info: ResolveInfo):
-        idList = (
-            VariantOptionValue.objects.filter(variant=root)
-            .filter(deleted__isnull=True)
-            .values_list("product_option_value_id", flat=True)
-        )
-        return root.selected_option_values.filter(id__in=idList)
+    def resolve_selected_option_values(root: Variant, info: ResolveInfo, **kwargs):
+        return root.get_selected_option_values()
@@ -11,6 +11,10 @@ from django_app_core.decorators import strip_input
 from django_app_core.relay.connection import DjangoFilterConnectionField
 from django_app_core.types import TaskWarningType
 from django_mall_product.graphql.dashboard.types.variant import VariantNode
+from django_mall_product.helpers.inventory_helper import InventoryHelper
+from django_mall_product.helpers.invalidation_helper import InvalidationHelper
+from django_mall_product.helpers.product_page_helper import ProductPageHelper
+from django_mall_product.helpers.reference_helper import ReferenceHelper
 from django_mall_product.models import (
     Product,
     ProductOption,
@@ -20,6 +24,37 @@ from django_mall_product.models import (
 )
 
 
+def resolve_option_values(productId, optionValues):
+    references = (
+        ReferenceHelper()
+        .add("productId", productId, Product, type_name="ProductNode")
+        .add_many(
+            "optionValues",
+            optionValues,
+            ProductOptionValue,
+            type_name="ProductOptionValueNode",
+            fields=("product_option_id",),
+        )
+        .resolve()
+    )
+
+    product = references["productId"]
+    if product is None:
+        raise Exception("Bad Request!")
+
+    option_ids = set(
+        ProductOption.objects.filter(product_id=product.id).values_list("id", flat=True)
+    )
+    if len(optionValues) != len(option_ids):
+        raise ValidationError("The length of the optionValues is invalid!")
+
+    values = references["optionValues"]
+    if {value.product_option_id for value in values} != option_ids:
+        raise ValidationError("The optionValues is invalid!")
+
+    return product.id, [value.id for value in values]
+
+
 class CreateVariant(graphene.relay.ClientIDMutation):
     class Input:
         productId = graphene.ID(required=True)
@@ -54,30 +89,7 @@ class CreateVariant(graphene.relay.ClientIDMutation):
                 "The priceSaleAmount must be a positive number or zero!"
             )
 
-        try:
-            _, product_id = from_global_id(productId)
-
-            Product.objects.only("id").get(pk=product_id)
-        except:
-            raise Exception("Bad Request!")
-
-        options = ProductOption.objects.only("id").filter(product_id=product_id)
-        if len(optionValues) != len(options):
-            raise ValidationError("The length of the optionValues is invalid!")
-
-        valueList = []
-        for optionValueId in optionValues:
-            _, option_value_id = from_global_id(optionValueId)
-
-            product_option_value = ProductOptionValue.objects.filter(
-                pk=option_value_id
-            ).first()
-            if (
-                not product_option_value
-                or product_option_value.product_option_id in valueList
-            ):
-                raise ValidationError("The optionValues is invalid!")
-            valueList.append(option_value_id)
+        product_id, valueList = resolve_option_values(productId, optionValues)
 
         if (
             Variant.objects.filter(product_id=product_id, sku=sku)
@@ -97,10 +109,17 @@ class CreateVariant(graphene.relay.ClientIDMutation):
             variant.is_primary = False
             variant.save()
 
-            for product_option_value_id in valueList:
-                VariantOptionValue.objects.create(
-                    variant=variant, product_option_value_id=product_option_value_id
-                )
+            VariantOptionValue.objects.bulk_create(
+                [
+                    VariantOptionValue(
+                        variant=variant, product_option_value_id=product_option_value_id
+                    )
+                    for product_option_value_id in valueList
+                ]
+            )
+
+            transaction.on_commit(lambda: ProductPageHelper().rebuild([product_id]))
+            InvalidationHelper().publish("product", [product_id])
 
         return CreateVariant(success=True, variant=variant)
 
@@ -126,6 +145,8 @@ class DeleteVariantBatch(graphene.relay.ClientIDMutation):
             "not_found": [],
         }
 
+        product_ids = set()
+        deleted_slugs = []
         for id in idList:
             try:
                 _, variant_id = from_global_id(id)
@@ -133,15 +154,24 @@ class DeleteVariantBatch(graphene.relay.ClientIDMutation):
                 warnings["error"].append(id)
 
             try:
-                variant = Variant.objects.only("is_primary").get(pk=variant_id)
+                variant = Variant.objects.only("is_primary", "product_id", "slug").get(
+                    pk=variant_id
+                )
                 if variant.is_primary:
                     warnings["in_protected"].append(id)
                 variant.delete()
+                product_ids.add(variant.product_id)
+                deleted_slugs.append(variant.slug)
 
                 warnings["done"].append(id)
             except Variant.DoesNotExist:
                 warnings["not_found"].append(id)
 
+        if product_ids:
+            transaction.on_commit(lambda: ProductPageHelper().rebuild(product_ids))
+            InvalidationHelper().publish("product", product_ids)
+            InvalidationHelper().publish("variant_slug", deleted_slugs)
+
         return DeleteVariantBatch(success=True, warnings=warnings)
 
 
@@ -181,29 +211,10 @@ class UpdateVariant(graphene.relay.ClientIDMutation):
 
         try:
             _, variant_id = from_global_id(id)
-            _, product_id = from_global_id(productId)
-
-            Product.objects.only("id").get(pk=product_id)
         except:
             raise Exception("Bad Request!")
 
-        options = ProductOption.objects.filter(product_id=product_id)
-        if len(optionValues) != len(options):
-            raise ValidationError("The length of the optionValues is invalid!")
-
-        valueList = []
-        for optionValueId in optionValues:
-            _, option_value_id = from_global_id(optionValueId)
-
-            product_option_value = ProductOptionValue.objects.filter(
-                pk=option_value_id
-            ).first()
-            if (
-                not product_option_value
-                or product_option_value.product_option_id in valueList
-            ):
-                raise ValidationError("The optionValues is invalid!")
-            valueList.append(option_value_id)
+        product_id, valueList = resolve_option_values(productId, optionValues)
 
         if (
             Variant.objects.exclude(pk=variant_id)
@@ -228,20 +239,68 @@ class UpdateVariant(graphene.relay.ClientIDMutation):
                 VariantOptionValue.objects.filter(variant=variant).exclude(
                     product_option_value_id__in=valueList
                 ).delete()
-                for product_option_value_id in valueList:
-                    VariantOptionValue.objects.get_or_create(
-                        variant=variant, product_option_value_id=product_option_value_id
+                existing = set(
+                    VariantOptionValue.objects.filter(variant=variant).values_list(
+                        "product_option_value_id", flat=True
                     )
+                )
+                VariantOptionValue.objects.bulk_create(
+                    [
+                        VariantOptionValue(
+                            variant=variant,
+                            product_option_value_id=product_option_value_id,
+                        )
+                        for product_option_value_id in valueList
+                        if product_option_value_id not in existing
+                    ]
+                )
+
+                transaction.on_commit(lambda: ProductPageHelper().rebuild([product_id]))
+                InvalidationHelper().publish("product", [product_id])
             except Variant.DoesNotExist:
                 raise Exception("Can not find this variant!")
 
         return UpdateVariant(success=True, variant=variant)
 
 
+class UpdateVariantStock(graphene.relay.ClientIDMutation):
+    class Input:
+        id = graphene.ID(required=True)
+        warehouse = graphene.String()
+        quantityOnHand = graphene.Int(required=True)
+
+    success = graphene.Boolean()
+    variant = graphene.Field(VariantNode)
+
+    @classmethod
+    @strip_input
+    @transaction.atomic
+    def mutate_and_get_payload(cls, root, info: ResolveInfo, **input):
+        id = input["id"]
+        warehouse = input["warehouse"] if "warehouse" in input else None
+        quantityOnHand = input["quantityOnHand"]
+
+        if quantityOnHand < 0:
+            raise ValidationError(
+                "The quantityOnHand must be a positive number or zero!"
+            )
+
+        try:
+            _, variant_id = from_global_id(id)
+            variant = Variant.objects.get(pk=variant_id)
+        except:
+            raise Exception("Can not find this variant!")
+
+        InventoryHelper().set_on_hand(variant.id, quantityOnHand, warehouse)
+
+        return UpdateVariantStock(success=True, variant=variant)
+
+
 class VariantMutation(graphene.ObjectType):
     variant_create = CreateVariant.Field()
     variant_delete_batch = DeleteVariantBatch.Field()
     variant_update = UpdateVariant.Field()
+    variant_stock_update = UpdateVariantStock.Field()
 
 
 class VariantQuery(graphene.ObjectType):
@@ -0,0 +1,34 @@
+from graphene_django.filter import DjangoFilterConnectionField
+
+PAGINATION_ARGS = ("first", "last", "before", "after", "offset")
+
+
+def get_prefetched(instance, name):
+    if name in getattr(instance, "_prefetched_objects_cache", {}):
+        return list(getattr(instance, name).all())
+
+    return None
+
+
+class PrefetchedConnectionField(DjangoFilterConnectionField):
+    # A resolver may return a list of already prefetched nodes. Without filter
+    # or ordering arguments the list is paged as is, so the prefetch is kept.
+    @classmethod
+    def resolve_queryset(
+        cls, connection, iterable, info, args, filtering_args, filterset_class
+    ):
+        if isinstance(iterable, list):
+            if all(
+                value is None
+                for name, value in args.items()
+                if name not in PAGINATION_ARGS
+            ):
+                return iterable
+
+            iterable = connection._meta.node._meta.model.objects.filter(
+                pk__in=[instance.pk for instance in iterable]
+            )
+
+        return super().resolve_queryset(
+            connection, iterable, info, args, filtering_args, filterset_class
+        )
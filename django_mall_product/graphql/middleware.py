@@ -1,4 +1,58 @@
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.db.models import Manager, QuerySet
+
 from graphene import ResolveInfo
+from graphql import get_named_type, is_leaf_type, print_ast
+from graphql.language import OperationType
+from graphql_relay import from_global_id
+
+from django_mall_product.helpers.invalidation_helper import InvalidationHelper
+from django_mall_product.routers import is_reading_from_replica, read_from_replica
+
+PRIMARY_PINNED_UNTIL_SESSION_KEY = "product_primary_pinned_until"
+
+executor = None
+executor_lock = threading.Lock()
+
+
+def get_executor():
+    global executor
+
+    if executor is None:
+        with executor_lock:
+            if executor is None:
+                executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, "PRODUCT_ASYNC_ORM_WORKERS", 8),
+                    thread_name_prefix="product-orm",
+                )
+
+    return executor
+
+
+def run_in_executor(fn):
+    # Each worker thread has its own connection, so the tenant and replica
+    # choice of the calling request are captured here and applied there.
+    tenant = getattr(connection, "tenant", None)
+    replica = is_reading_from_replica()
+
+    def run():
+        close_old_connections()
+        try:
+            if tenant is not None:
+                connection.set_tenant(tenant)
+
+            with read_from_replica(replica):
+                return fn()
+        finally:
+            close_old_connections()
+
+    return asyncio.get_running_loop().run_in_executor(get_executor(), run)
 
 
 class DashboardLoaders:
@@ -8,14 +62,125 @@ class DashboardLoaders:
 
 class WebsiteLoaders:
     def __init__(self):
-        pass
+        from django_mall_product.graphql.storefront.loaders import (
+            ProductLoader,
+            ProductOptionLoader,
+            ProductOptionValueLoader,
+            VariantLoader,
+        )
+
+        self.loader_classes = {
+            "product": ProductLoader,
+            "product_option": ProductOptionLoader,
+            "product_option_value": ProductOptionValueLoader,
+            "variant": VariantLoader,
+        }
+        self.loaders = {}
+
+    def get(self, name, info: ResolveInfo):
+        # Fields with the same selection share a loader, so aliases are still
+        # batched while each queryset is projected from a matching selection.
+        key = (
+            name,
+            tuple(
+                print_ast(field_node.selection_set) if field_node.selection_set else ""
+                for field_node in info.field_nodes
+            ),
+        )
+        if key not in self.loaders:
+            self.loaders[key] = self.loader_classes[name](info)
+
+        return self.loaders[key]
 
 
 class LoaderMiddleware:
     def resolve(self, next, root, info: ResolveInfo, **args):
-        if info.context.path.startswith("/dashboard/"):
-            info.context.loaders = DashboardLoaders()
-        elif info.context.path.startswith("/storefront/"):
-            info.context.loaders = WebsiteLoaders()
+        if getattr(info.context, "loaders", None) is None:
+            if info.context.path.startswith("/dashboard/"):
+                info.context.loaders = DashboardLoaders()
+            elif info.context.path.startswith("/storefront/"):
+                info.context.loaders = WebsiteLoaders()
 
         return next(root, info, **args)
+
+
+def should_read_from_replica(request):
+    session = getattr(request, "session", None)
+
+    return request.path.startswith("/storefront/") and (
+        session is None
+        or session.get(PRIMARY_PINNED_UNTIL_SESSION_KEY, 0) < time.time()
+    )
+
+
+class DatabaseRouterMiddleware:
+    def resolve(self, next, root, info: ResolveInfo, **args):
+        request = info.context
+        session = getattr(request, "session", None)
+
+        if info.operation.operation == OperationType.MUTATION:
+            if session is not None and info.path.prev is None:
+                session[PRIMARY_PINNED_UNTIL_SESSION_KEY] = time.time() + getattr(
+                    settings, "PRODUCT_REPLICA_STICKY_SECONDS", 5
+                )
+            with read_from_replica(False):
+                return next(root, info, **args)
+
+        with read_from_replica(should_read_from_replica(request)):
+            return next(root, info, **args)
+
+
+class InvalidationMiddleware:
+    def resolve(self, next, root, info: ResolveInfo, **args):
+        if info.path.prev is None:
+            InvalidationHelper().poll()
+
+        return next(root, info, **args)
+
+
+class AsyncORMMiddleware:
+    node_loaders = {
+        "ProductNode": "product",
+        "ProductOptionNode": "product_option",
+        "ProductOptionValueNode": "product_option_value",
+        "VariantNode": "variant",
+    }
+
+    def resolve(self, next, root, info: ResolveInfo, **args):
+        return_type = get_named_type(info.return_type)
+
+        if root is None and "id" in args and return_type.name in self.node_loaders:
+            loader = info.context.loaders.get(self.node_loaders[return_type.name], info)
+            return self.load_node(loader, return_type.name, args["id"])
+        if root is not None and is_leaf_type(return_type):
+            return next(root, info, **args)
+
+        return self.resolve_in_thread(next, root, info, **args)
+
+    @staticmethod
+    async def load_node(loader, type_name, id):
+        try:
+            _type, pk = from_global_id(id)
+        except:
+            raise Exception("Bad Request!")
+        if _type != type_name:
+            raise Exception("Bad Request!")
+
+        node = await loader.load(pk)
+        if node is None:
+            raise Exception("Bad Request!")
+
+        return node
+
+    @staticmethod
+    def resolve_in_thread(next, root, info: ResolveInfo, **args):
+        def resolve():
+            result = next(root, info, **args)
+            if isinstance(result, Manager):
+                result = result.all()
+            if isinstance(result, QuerySet):
+                result = list(result)
+
+            return result
+
+        return run_in_executor(resolve)
@@ -0,0 +1,112 @@
+from collections import OrderedDict
+from functools import lru_cache
+import threading
+import time
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from graphql import GraphQLError, get_operation_ast, parse, print_ast
+import graphene
+
+
+@lru_cache(maxsize=64)
+def normalize_introspection_query(query, operation_name):
+    try:
+        document = parse(query)
+    except GraphQLError:
+        return None
+
+    operation = get_operation_ast(document, operation_name)
+    if operation is None or not all(
+        getattr(selection, "name", None) is not None
+        and selection.name.value == "__schema"
+        for selection in operation.selection_set.selections
+    ):
+        return None
+
+    return print_ast(document)
+
+
+class SchemaBuilder:
+    def __init__(self, name, queries=(), mutations=()):
+        self.name = name
+        self.queries = list(queries)
+        self.mutations = list(mutations)
+        self.lock = threading.Lock()
+        self.schema = None
+        self.introspections = OrderedDict()
+        self.introspections_lock = threading.Lock()
+        self.max_introspections = getattr(
+            settings, "PRODUCT_SCHEMA_INTROSPECTION_CACHE_SIZE", 16
+        )
+        self.timings = {}
+
+    def add_query(self, path):
+        self.queries.append(path)
+
+    def add_mutation(self, path):
+        self.mutations.append(path)
+
+    def compose(self, name, paths):
+        if not paths:
+            return None
+
+        return type(
+            name,
+            tuple(import_string(path) for path in paths) + (graphene.ObjectType,),
+            {},
+        )
+
+    def build(self):
+        started_at = time.perf_counter()
+        query = self.compose("Query", self.queries)
+        mutation = self.compose("Mutation", self.mutations)
+        imported_at = time.perf_counter()
+
+        schema = graphene.Schema(query=query, mutation=mutation)
+        built_at = time.perf_counter()
+
+        self.timings = {
+            "import": imported_at - started_at,
+            "build": built_at - imported_at,
+        }
+
+        return schema
+
+    def get_schema(self):
+        if self.schema is None:
+            with self.lock:
+                if self.schema is None:
+                    self.schema = self.build()
+
+        return self.schema
+
+    def introspect(self, query, operation_name=None):
+        key = normalize_introspection_query(query, operation_name)
+        if key is None:
+            return None
+
+        with self.introspections_lock:
+            introspection = self.introspections.get(key)
+            if introspection is not None:
+                self.introspections.move_to_end(key)
+                return introspection
+
+        result = self.get_schema().execute(query, operation_name=operation_name)
+        if result.errors:
+            return None
+
+        introspection = {"data": result.data}
+        with self.introspections_lock:
+            self.introspections[key] = introspection
+            while len(self.introspections) > self.max_introspections:
+                self.introspections.popitem(last=False)
+
+        return introspection
+
+    def reset(self):
+        with self.lock:
+            self.schema = None
+            self.introspections = OrderedDict()
+            self.timings = {}
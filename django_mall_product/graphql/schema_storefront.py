@@ -1,19 +1,24 @@
-import graphene
+from django_mall_product.graphql.schema_builder import SchemaBuilder
 
-from django_mall_product.graphql.website.product import ProductQuery
+builder = SchemaBuilder(
+    "storefront",
+    queries=[
+        "django_mall_product.graphql.storefront.product.ProductQuery",
+        "django_mall_product.graphql.storefront.product_option.ProductOptionQuery",
+        "django_mall_product.graphql.storefront.product_option_value.ProductOptionValueQuery",
+        "django_mall_product.graphql.storefront.variant.VariantQuery",
+    ],
+    mutations=[
+        "django_mall_product.graphql.storefront.product.ProductMutation",
+        "django_mall_product.graphql.storefront.product_option.ProductOptionMutation",
+        "django_mall_product.graphql.storefront.product_option_value.ProductOptionValueMutation",
+        "django_mall_product.graphql.storefront.variant.VariantMutation",
+    ],
+)
 
 
-class Mutation(
-    graphene.ObjectType,
-):
-    pass
+def __getattr__(name):
+    if name == "schema":
+        return builder.get_schema()
 
-
-class Query(
-    ProductQuery,
-    graphene.ObjectType,
-):
-    pass
-
-
-schema = graphene.Schema(mutation=Mutation, query=Query)
+    raise AttributeError(name)
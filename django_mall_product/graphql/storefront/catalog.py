@@ -0,0 +1,87 @@
+from django.conf import settings
+
+from graphene import ResolveInfo
+from graphql_relay import from_global_id
+
+from django_mall_product.helpers.catalog_helper import CatalogHelper
+
+
+def get_page(page_number, page_size):
+    page_number = max(page_number or 1, 1)
+    page_size = min(
+        page_size or getattr(settings, "PRODUCT_CATALOG_PAGE_SIZE", 20),
+        getattr(settings, "PRODUCT_CATALOG_MAX_PAGE_SIZE", 100),
+    )
+    if page_size < 1:
+        raise Exception("The pageSize is invalid!")
+
+    return page_number, page_size
+
+
+def resolve_catalog(
+    node,
+    filterset_class,
+    query,
+    info: ResolveInfo,
+    orderBy=None,
+    page_number=None,
+    page_size=None,
+    row_mode=None,
+    **filters
+):
+    page_number, page_size = get_page(page_number, page_size)
+    offset = (page_number - 1) * page_size
+    model = node._meta.model
+
+    ids = None
+    engine = CatalogHelper().get_engine()
+    if engine is not None:
+        try:
+            engine_filters = dict(filters)
+            if filters.get("option_values"):
+                engine_filters["option_values"] = [
+                    from_global_id(_id)[1] for _id in filters["option_values"]
+                ]
+        except:
+            raise Exception("Bad Request!")
+
+        ids = query(engine, engine_filters, orderBy)
+
+    if ids is not None:
+        page_ids = ids[offset : offset + page_size]
+        instances = {
+            str(instance.pk): instance
+            for instance in node.get_queryset(
+                model.objects.filter(pk__in=page_ids), info
+            )
+        }
+
+        return {
+            "total_count": len(ids),
+            "page_number": page_number,
+            "page_size": page_size,
+            "engine": "memory",
+            "results": [instances[id] for id in page_ids if id in instances],
+        }
+
+    data = {key: value for key, value in filters.items() if value is not None}
+    if orderBy:
+        data["order_by"] = ",".join(orderBy)
+
+    filterset = filterset_class(
+        data=data,
+        queryset=node.get_queryset(model.objects.all(), info),
+        request=info.context,
+    )
+    if not filterset.is_valid():
+        raise Exception("Bad Request!")
+
+    queryset = filterset.qs
+
+    return {
+        "total_count": queryset.count(),
+        "page_number": page_number,
+        "page_size": page_size,
+        "engine": "sql",
+        "results": list(queryset[offset : offset + page_size]),
+    }
@@ -0,0 +1,58 @@
+from aiodataloader import DataLoader
+
+from django_mall_product.graphql.middleware import run_in_executor
+from django_mall_product.graphql.storefront.types.product import ProductNode
+from django_mall_product.graphql.storefront.types.product_option import (
+    ProductOptionNode,
+)
+from django_mall_product.graphql.storefront.types.product_option_value import (
+    ProductOptionValueNode,
+)
+from django_mall_product.graphql.storefront.types.variant import VariantNode
+
+
+class NodeLoader(DataLoader):
+    node = None
+
+    def __init__(self, info=None, **kwargs):
+        super().__init__(**kwargs)
+        self.info = info
+
+    def get_queryset(self, keys):
+        return self.node.get_queryset(
+            self.node._meta.model.objects.filter(pk__in=keys), self.info
+        )
+
+    def is_visible(self, instance):
+        return True
+
+    def fetch(self, keys):
+        instances = {
+            str(instance.pk): instance
+            for instance in self.get_queryset(keys)
+            if self.is_visible(instance)
+        }
+
+        return [instances.get(str(key)) for key in keys]
+
+    async def batch_load_fn(self, keys):
+        return await run_in_executor(lambda: self.fetch(keys))
+
+
+class ProductLoader(NodeLoader):
+    node = ProductNode
+
+
+class ProductOptionLoader(NodeLoader):
+    node = ProductOptionNode
+
+
+class ProductOptionValueLoader(NodeLoader):
+    node = ProductOptionValueNode
+
+
+class VariantLoader(NodeLoader):
+    node = VariantNode
+
+    def is_visible(self, instance):
+        return instance.product.is_visible
@@ -4,15 +4,28 @@ from graphene import ResolveInfo
 from graphql_relay import from_global_id
 import graphene
 
-from django_app_core.relay.connection import DjangoFilterConnectionField
 from django_app_organization.models import Organization
-from django_mall_product.graphql.storefront.types.product import ProductNode
+from django_mall_product.graphql.storefront.catalog import resolve_catalog
+from django_mall_product.graphql.storefront.types.catalog import ProductCatalogType
+from django_mall_product.graphql.storefront.types.facet import CountedConnectionField
+from django_mall_product.graphql.storefront.types.product import (
+    ProductFilter,
+    ProductNode,
+)
+from django_mall_product.helpers.collection_helper import CollectionHelper
+from django_mall_product.helpers.node_helper import NodeHelper
+from django_mall_product.helpers.product_page_helper import ProductPageHelper
+from django_mall_product.helpers.slug_helper import SlugHelper
+from django_mall_product.helpers.stat_helper import StatHelper
+from django_mall_product.helpers.visitor_helper import VisitorHelper
 from django_mall_product.models import Product
 
 
 class IncrementProductCountAccess(graphene.relay.ClientIDMutation):
     class Input:
         id = graphene.ID(required=True)
+        variantId = graphene.ID()
+        visitorKey = graphene.String()
 
     success = graphene.Boolean()
     product = graphene.Field(ProductNode)
@@ -21,9 +34,16 @@ class IncrementProductCountAccess(graphene.relay.ClientIDMutation):
     @transaction.atomic
     def mutate_and_get_payload(cls, root, info: ResolveInfo, **input):
         id = input["id"]
+        variantId = input["variantId"] if "variantId" in input else None
+        visitorKey = input["visitorKey"] if "visitorKey" in input else None
+
+        if not visitorKey:
+            session = getattr(info.context, "session", None)
+            visitorKey = session.session_key if session is not None else None
 
         try:
             _, product_id = from_global_id(id)
+            variant_id = from_global_id(variantId)[1] if variantId else None
         except:
             raise Exception("Bad Request!")
 
@@ -35,8 +55,9 @@ class IncrementProductCountAccess(graphene.relay.ClientIDMutation):
             product = Product.objects.get(
                 organization_id=organization.id, pk=product_id
             )
-            product.count_access += 1
-            product.save()
+            StatHelper().record(product.id, "count_access", variant_id)
+            if visitorKey:
+                VisitorHelper().record(product.id, visitorKey)
         except Product.DoesNotExist:
             raise Exception("Can not find this product!")
 
@@ -46,6 +67,7 @@ class IncrementProductCountAccess(graphene.relay.ClientIDMutation):
 class IncrementProductCountAddToCart(graphene.relay.ClientIDMutation):
     class Input:
         id = graphene.ID(required=True)
+        variantId = graphene.ID()
 
     success = graphene.Boolean()
     product = graphene.Field(ProductNode)
@@ -54,9 +76,11 @@ class IncrementProductCountAddToCart(graphene.relay.ClientIDMutation):
     @transaction.atomic
     def mutate_and_get_payload(cls, root, info: ResolveInfo, **input):
         id = input["id"]
+        variantId = input["variantId"] if "variantId" in input else None
 
         try:
             _, product_id = from_global_id(id)
+            variant_id = from_global_id(variantId)[1] if variantId else None
         except:
             raise Exception("Bad Request!")
 
@@ -68,8 +92,7 @@ class IncrementProductCountAddToCart(graphene.relay.ClientIDMutation):
             product = Product.objects.get(
                 organization_id=organization.id, pk=product_id
             )
-            product.count_add_to_cart += 1
-            product.save()
+            StatHelper().record(product.id, "count_add_to_cart", variant_id)
         except Product.DoesNotExist:
             raise Exception("Can not find this product!")
 
@@ -83,9 +106,91 @@ class ProductMutation(graphene.ObjectType):
 
 class ProductQuery(graphene.ObjectType):
     product = graphene.relay.Node.Field(ProductNode)
-    products = DjangoFilterConnectionField(
+    products = CountedConnectionField(
+        ProductNode,
+        orderBy=graphene.List(of_type=graphene.String),
+        page_number=graphene.Int(),
+        page_size=graphene.Int(),
+        count_mode=graphene.String(),
+        row_mode=graphene.Boolean(),
+    )
+    collection_products = CountedConnectionField(
         ProductNode,
+        collection_id=graphene.ID(required=True),
         orderBy=graphene.List(of_type=graphene.String),
         page_number=graphene.Int(),
         page_size=graphene.Int(),
+        count_mode=graphene.String(),
+        row_mode=graphene.Boolean(),
+    )
+    catalog_products = graphene.Field(
+        ProductCatalogType,
+        slug=graphene.String(),
+        name=graphene.String(),
+        language_code=graphene.String(),
+        summary=graphene.String(),
+        content=graphene.String(),
+        collection_in=graphene.List(graphene.ID),
+        collection_not_in=graphene.List(graphene.ID),
+        option_values=graphene.List(graphene.ID),
+        created_at_gt=graphene.DateTime(),
+        created_at_gte=graphene.DateTime(),
+        created_at_lt=graphene.DateTime(),
+        created_at_lte=graphene.DateTime(),
+        updated_at_gt=graphene.DateTime(),
+        updated_at_gte=graphene.DateTime(),
+        updated_at_lt=graphene.DateTime(),
+        updated_at_lte=graphene.DateTime(),
+        orderBy=graphene.List(of_type=graphene.String),
+        page_number=graphene.Int(),
+        page_size=graphene.Int(),
+        row_mode=graphene.Boolean(),
+    )
+    product_by_slug = graphene.Field(ProductNode, slug=graphene.String(required=True))
+    products_by_ids = graphene.List(
+        ProductNode, ids=graphene.List(graphene.NonNull(graphene.ID), required=True)
+    )
+    product_page = graphene.Field(
+        graphene.JSONString,
+        slug=graphene.String(required=True),
+        language_code=graphene.String(required=True),
     )
+
+    @staticmethod
+    def resolve_collection_products(root, info: ResolveInfo, collection_id, **kwargs):
+        try:
+            _, collection_id = from_global_id(collection_id)
+        except:
+            raise Exception("Bad Request!")
+
+        return CollectionHelper().get_collection_products(
+            Product.objects.all(), collection_id
+        )
+
+    @staticmethod
+    def resolve_catalog_products(root, info: ResolveInfo, **kwargs):
+        return resolve_catalog(
+            ProductNode,
+            ProductFilter,
+            lambda engine, filters, order_by: engine.query_products(filters, order_by),
+            info,
+            **kwargs
+        )
+
+    @staticmethod
+    def resolve_product_by_slug(root, info: ResolveInfo, slug):
+        product_id = SlugHelper().get_product_id(slug)
+        if product_id is None:
+            return None
+
+        return ProductNode.get_queryset(
+            Product.objects.filter(pk=product_id), info
+        ).first()
+
+    @staticmethod
+    def resolve_products_by_ids(root, info: ResolveInfo, ids):
+        return NodeHelper(ProductNode).get_nodes(ids, info)
+
+    @staticmethod
+    def resolve_product_page(root, info: ResolveInfo, slug, language_code):
+        return ProductPageHelper().get_payload(slug, language_code)
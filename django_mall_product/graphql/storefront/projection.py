@@ -0,0 +1,231 @@
+from django.db.models import Prefetch
+
+from graphene.utils.str_converters import to_snake_case
+from graphql.execution.values import get_argument_values
+from graphql.language import FieldNode, FragmentSpreadNode, InlineFragmentNode
+
+from django_mall_product.models import (
+    Product,
+    ProductOption,
+    ProductOptionTrans,
+    ProductOptionValue,
+    ProductOptionValueTrans,
+    ProductTrans,
+    Variant,
+    prefetch_selected_option_values,
+)
+
+
+def collect_selections(selection_set, fragments, tree):
+    for selection in selection_set.selections:
+        if isinstance(selection, FieldNode):
+            subtree = tree.setdefault(to_snake_case(selection.name.value), {})
+            if selection.selection_set:
+                collect_selections(selection.selection_set, fragments, subtree)
+        elif isinstance(selection, InlineFragmentNode):
+            collect_selections(selection.selection_set, fragments, tree)
+        elif isinstance(selection, FragmentSpreadNode):
+            fragment = fragments.get(selection.name.value)
+            if fragment is not None:
+                collect_selections(fragment.selection_set, fragments, tree)
+
+    return tree
+
+
+def unwrap_connections(tree):
+    if "edges" in tree:
+        tree = tree["edges"].get("node", {})
+    elif "results" in tree:
+        tree = tree["results"]
+
+    return {name: unwrap_connections(subtree) for name, subtree in tree.items()}
+
+
+def get_selections(info):
+    if info is None:
+        return None
+
+    tree = {}
+    for field_node in info.field_nodes:
+        if field_node.selection_set:
+            collect_selections(field_node.selection_set, info.fragments, tree)
+
+    return unwrap_connections(tree) or None
+
+
+def get_argument(info, name):
+    if info is None:
+        return None
+
+    field = info.parent_type.fields.get(info.field_name)
+    if field is None:
+        return None
+
+    return get_argument_values(field, info.field_nodes[0], info.variable_values).get(
+        name
+    )
+
+
+class Relation:
+    def __init__(self, lookup, projection, factory=Prefetch):
+        self.lookup = lookup
+        self.projection = projection
+        self.factory = factory
+
+
+class Projection:
+    def __init__(
+        self,
+        model,
+        columns=(),
+        hints=None,
+        relations=None,
+        select_related=(),
+        default=None,
+    ):
+        self.model = model
+        self.columns = columns
+        self.hints = hints or {}
+        self.relations = relations or {}
+        self.select_related = select_related
+        self.default = default
+
+    def get_concrete_fields(self):
+        return {field.name: field.attname for field in self.model._meta.concrete_fields}
+
+    def plan(self, tree):
+        fields = self.get_concrete_fields()
+        columns = {self.model._meta.pk.attname}
+        columns.update(self.columns)
+        columns.update(path.split("__")[0] for path in self.select_related)
+
+        relations = {}
+        for name, subtree in tree.items():
+            columns.update(self.hints.get(name, ()))
+            if name in self.relations:
+                relation = self.relations[name]
+                merged = relations.setdefault(relation.lookup, (relation, {}))[1]
+                merged.update(subtree)
+            elif name in fields:
+                columns.add(fields[name])
+
+        attnames = set(fields.values()) | set(fields.keys())
+        columns = {column for column in columns if column in attnames}
+
+        prefetches = [
+            relation.factory(
+                lookup,
+                queryset=relation.projection.apply(
+                    relation.projection.model.objects.all(), subtree
+                ),
+            )
+            for lookup, (relation, subtree) in relations.items()
+        ]
+
+        return sorted(columns), prefetches
+
+    def apply(self, queryset, tree):
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+
+        if tree is None:
+            return self.default(queryset) if self.default else queryset
+
+        columns, prefetches = self.plan(tree)
+
+        return queryset.only(*columns).prefetch_related(*prefetches)
+
+    def project(self, queryset, info):
+        return self.apply(queryset, get_selections(info))
+
+
+product_trans_projection = Projection(
+    ProductTrans, columns=("product_id", "language_code")
+)
+product_option_trans_projection = Projection(
+    ProductOptionTrans, columns=("product_option_id", "language_code")
+)
+product_option_value_trans_projection = Projection(
+    ProductOptionValueTrans, columns=("product_option_value_id", "language_code")
+)
+
+product_option_value_relations = {
+    "translations": Relation("translations", product_option_value_trans_projection),
+}
+product_option_value_projection = Projection(
+    ProductOptionValue,
+    columns=("product_option_id",),
+    relations=product_option_value_relations,
+)
+product_option_value_node_projection = Projection(
+    ProductOptionValue,
+    relations=product_option_value_relations,
+    select_related=(
+        "product_option__product",
+        "product_option__product__organization",
+    ),
+)
+
+product_option_relations = {
+    "translations": Relation("translations", product_option_trans_projection),
+    "productoptionvalue_set": Relation(
+        "productoptionvalue_set", product_option_value_projection
+    ),
+}
+product_option_projection = Projection(
+    ProductOption,
+    columns=("product_id",),
+    relations=product_option_relations,
+)
+product_option_node_projection = Projection(
+    ProductOption,
+    relations=product_option_relations,
+    select_related=("product", "product__organization"),
+    default=lambda queryset: queryset.prefetch_related(
+        "translations",
+        "productoptionvalue_set",
+        "productoptionvalue_set__translations",
+    ),
+)
+
+variant_projection = Projection(
+    Variant,
+    columns=("is_published", "published_at"),
+    hints={
+        "price": ("currency", "price_amount"),
+        "price_sale": ("currency", "price_sale_amount"),
+    },
+    relations={
+        "selected_option_values": Relation(
+            "selected_option_values",
+            product_option_value_projection,
+            factory=prefetch_selected_option_values,
+        ),
+    },
+    select_related=("product",),
+    default=lambda queryset: queryset.prefetch_related(
+        prefetch_selected_option_values()
+    ),
+)
+
+product_projection = Projection(
+    Product,
+    columns=("is_published", "published_at", "can_search"),
+    hints={
+        "translation": ("language_code",),
+    },
+    relations={
+        "translation": Relation("translations", product_trans_projection),
+        "translations": Relation("translations", product_trans_projection),
+        "variant_set": Relation("variant_set", variant_projection),
+        "productoption_set": Relation("productoption_set", product_option_projection),
+    },
+    default=lambda queryset: queryset.prefetch_related(
+        "translations",
+        "variant_set",
+        prefetch_selected_option_values("variant_set__selected_option_values"),
+        "productoption_set__translations",
+        "productoption_set__productoptionvalue_set",
+        "productoption_set__productoptionvalue_set__translations",
+    ),
+)
@@ -0,0 +1,185 @@
+import datetime
+
+from django.db.models.query import ValuesIterable
+from django.utils import timezone
+
+from prices import Money
+
+from django_mall_product.graphql.storefront.projection import get_argument
+from django_mall_product.models import ProductTrans
+
+
+def is_visible(is_published, published_at):
+    if not is_published:
+        return False
+    if published_at is None:
+        return True
+
+    if isinstance(published_at, datetime.datetime):
+        return published_at <= timezone.now()
+
+    return published_at <= datetime.date.today()
+
+
+class Record:
+    __slots__ = ()
+    columns = ()
+    scalars = ()
+    relations = {}
+
+    @classmethod
+    def from_row(cls, row):
+        record = cls.__new__(cls)
+        for name in cls.__slots__:
+            setattr(record, name, row.get(name))
+
+        return record
+
+    @property
+    def pk(self):
+        return self.id
+
+
+class ProductTransRecord(Record):
+    __slots__ = ("id", "product_id", "language_code", "name")
+    scalars = ("id", "language_code", "name")
+
+
+class ProductRecord(Record):
+    __slots__ = (
+        "id",
+        "slug",
+        "serial",
+        "sort_key",
+        "count_access",
+        "count_add_to_cart",
+        "is_published",
+        "published_at",
+        "created_at",
+        "updated_at",
+        "translations",
+    )
+    scalars = (
+        "id",
+        "slug",
+        "serial",
+        "sort_key",
+        "count_access",
+        "count_add_to_cart",
+        "created_at",
+        "updated_at",
+    )
+    relations = {"translations": ProductTransRecord}
+
+    @property
+    def is_visible(self):
+        return is_visible(self.is_published, self.published_at)
+
+    @classmethod
+    def prefetch(cls, records, tree):
+        if "translations" not in tree:
+            return
+
+        translations = {}
+        for row in (
+            ProductTrans.objects.filter(
+                product_id__in=[record.id for record in records]
+            )
+            .order_by("language_code")
+            .values(*ProductTransRecord.__slots__)
+        ):
+            translations.setdefault(row["product_id"], []).append(
+                ProductTransRecord.from_row(row)
+            )
+
+        for record in records:
+            record.translations = translations.get(record.id, [])
+
+
+class VariantRecord(Record):
+    __slots__ = (
+        "id",
+        "product_id",
+        "slug",
+        "is_primary",
+        "is_published",
+        "published_at",
+        "currency",
+        "price_amount",
+        "price_sale_amount",
+        "created_at",
+        "updated_at",
+    )
+    scalars = (
+        "id",
+        "slug",
+        "is_primary",
+        "price",
+        "price_sale",
+        "created_at",
+        "updated_at",
+    )
+
+    @property
+    def is_visible(self):
+        return is_visible(self.is_published, self.published_at)
+
+    @property
+    def price(self):
+        if self.price_amount is None:
+            return None
+
+        return Money(self.price_amount, self.currency)
+
+    @property
+    def price_sale(self):
+        if self.price_sale_amount is None:
+            return None
+
+        return Money(self.price_sale_amount, self.currency)
+
+    @classmethod
+    def prefetch(cls, records, tree):
+        pass
+
+
+def record_iterable(record_class, tree):
+    class RecordIterable(ValuesIterable):
+        def __iter__(self):
+            records = [record_class.from_row(row) for row in super().__iter__()]
+            record_class.prefetch(records, tree)
+
+            return iter(records)
+
+    return RecordIterable
+
+
+def supports_records(record_class, tree):
+    if tree is None:
+        return False
+
+    for name, subtree in tree.items():
+        if name in record_class.relations:
+            if not supports_records(record_class.relations[name], subtree):
+                return False
+        elif not (
+            name in record_class.scalars
+            or name.startswith("__")
+            or (name == "is_visible" and hasattr(record_class, "is_visible"))
+        ):
+            return False
+
+    return True
+
+
+def with_records(queryset, info, record_class, tree):
+    if not get_argument(info, "row_mode") or not supports_records(record_class, tree):
+        return None
+
+    columns = [
+        name for name in record_class.__slots__ if name not in record_class.relations
+    ]
+    queryset = queryset.values(*columns)
+    queryset._iterable_class = record_iterable(record_class, tree)
+
+    return queryset
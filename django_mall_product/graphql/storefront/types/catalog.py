@@ -0,0 +1,20 @@
+import graphene
+
+from django_mall_product.graphql.storefront.types.product import ProductNode
+from django_mall_product.graphql.storefront.types.variant import VariantNode
+
+
+class ProductCatalogType(graphene.ObjectType):
+    total_count = graphene.Int()
+    page_number = graphene.Int()
+    page_size = graphene.Int()
+    engine = graphene.String()
+    results = graphene.List(ProductNode)
+
+
+class VariantCatalogType(graphene.ObjectType):
+    total_count = graphene.Int()
+    page_number = graphene.Int()
+    page_size = graphene.Int()
+    engine = graphene.String()
+    results = graphene.List(VariantNode)
@@ -0,0 +1,169 @@
+from functools import partial
+
+from django.db.models import QuerySet
+
+from graphene import ResolveInfo
+from graphene.relay.connection import connection_adapter, page_info_adapter
+from graphql_relay import (
+    connection_from_array_slice,
+    cursor_to_offset,
+    get_offset_with_default,
+    offset_to_cursor,
+    to_global_id,
+)
+import graphene
+
+from django_app_core.relay.connection import (
+    DjangoFilterConnectionField,
+    ExtendedConnection,
+)
+from django_mall_product.helpers.count_helper import CountHelper
+from django_mall_product.helpers.facet_helper import FacetHelper
+from django_mall_product.models import Product
+
+
+class FacetValueType(graphene.ObjectType):
+    name = graphene.String()
+    count = graphene.Int()
+    ids = graphene.List(graphene.ID)
+
+    @staticmethod
+    def resolve_ids(root, info: ResolveInfo):
+        return [to_global_id("ProductOptionValueNode", id) for id in root["ids"]]
+
+
+class OptionFacetType(graphene.ObjectType):
+    name = graphene.String()
+    values = graphene.List(FacetValueType)
+
+
+class PriceBucketType(graphene.ObjectType):
+    min = graphene.Float()
+    max = graphene.Float()
+    count = graphene.Int()
+
+
+class FacetsType(graphene.ObjectType):
+    options = graphene.List(OptionFacetType)
+    prices = graphene.List(PriceBucketType)
+
+
+class FacetedConnection(ExtendedConnection):
+    class Meta:
+        abstract = True
+
+    facets = graphene.Field(
+        FacetsType,
+        language_code=graphene.String(required=True),
+        price_boundaries=graphene.List(graphene.Float),
+    )
+
+    total_count = graphene.Int()
+    total_count_is_exact = graphene.Boolean()
+    total_count_display = graphene.String()
+
+    def get_count_result(self):
+        if getattr(self, "count_result", None) is None:
+            mode = getattr(self.iterable, "count_mode", None)
+            if mode in (None, "exact"):
+                self.count_result = getattr(self, "length", None), True, "exact"
+            else:
+                self.count_result = CountHelper().count(self.iterable, mode)
+
+        return self.count_result
+
+    def resolve_total_count(self, info: ResolveInfo):
+        return self.get_count_result()[0]
+
+    def resolve_total_count_is_exact(self, info: ResolveInfo):
+        return self.get_count_result()[1]
+
+    def resolve_total_count_display(self, info: ResolveInfo):
+        value, is_exact, mode = self.get_count_result()
+        if value is None:
+            return None
+        if is_exact:
+            return "{:,}".format(value)
+        if mode == "capped":
+            return "{:,}+".format(value)
+
+        return "~{:,}".format(value)
+
+    def resolve_facets(self, info: ResolveInfo, language_code, price_boundaries=None):
+        if isinstance(self.iterable, QuerySet):
+            result_ids = self.iterable.order_by().values_list("pk", flat=True)
+        else:
+            result_ids = [instance.pk for instance in self.iterable]
+
+        return (
+            FacetHelper()
+            .get_index()
+            .count(
+                result_ids,
+                language_code,
+                price_boundaries,
+                level=(
+                    "product" if self._meta.node._meta.model is Product else "variant"
+                ),
+            )
+        )
+
+
+class CountedConnectionField(DjangoFilterConnectionField):
+    # With a countMode the exact length comes from CountHelper's cache, and
+    # the estimated and capped modes page forward by fetching one extra row
+    # instead of counting.
+    @classmethod
+    def resolve_connection(cls, connection, args, iterable, max_limit=None):
+        mode = getattr(iterable, "count_mode", None)
+        if mode is None:
+            return super().resolve_connection(connection, args, iterable, max_limit)
+
+        page_number = args.pop("page_number", None)
+        page_size = args.pop("page_size", None)
+        offset = args.pop("offset", None)
+        if page_size:
+            args["first"] = page_size
+            offset = (max(page_number or 1, 1) - 1) * page_size
+        after = args.get("after")
+        if offset:
+            if after:
+                offset += cursor_to_offset(after) + 1
+            args["after"] = offset_to_cursor(offset - 1)
+
+        if (
+            max_limit is not None
+            and args.get("first") is None
+            and args.get("last") is None
+        ):
+            args["first"] = max_limit
+
+        slice_start = get_offset_with_default(args.get("after"), -1) + 1
+        first = args.get("first")
+        if (
+            mode == "exact"
+            or first is None
+            or args.get("last") is not None
+            or args.get("before")
+        ):
+            array_length = CountHelper().count(iterable, "exact")[0]
+            slice_start = min(slice_start, array_length)
+            array_slice = iterable[slice_start:]
+        else:
+            array_slice = list(iterable[slice_start : slice_start + first + 1])
+            array_length = slice_start + len(array_slice)
+
+        connection = connection_from_array_slice(
+            array_slice,
+            args,
+            slice_start=slice_start,
+            array_length=array_length,
+            array_slice_length=array_length - slice_start,
+            connection_type=partial(connection_adapter, connection),
+            edge_type=connection.Edge,
+            page_info_type=page_info_adapter,
+        )
+        connection.iterable = iterable
+        connection.length = array_length
+
+        return connection
@@ -0,0 +1,61 @@
+from graphene import ResolveInfo
+from graphql_relay import to_global_id
+from prices import Money as PricesMoney
+import graphene
+
+from django_app_core.types import Money
+
+
+def to_money(amount, currency):
+    if amount is None or currency is None:
+        return None
+
+    return PricesMoney(amount, currency)
+
+
+class PriceQuoteItemInput(graphene.InputObjectType):
+    variant_id = graphene.ID(required=True)
+    quantity = graphene.Int(required=True)
+
+
+class PriceQuoteLineType(graphene.ObjectType):
+    variant_id = graphene.ID()
+    quantity = graphene.Int()
+    price = graphene.Field(Money)
+    price_sale = graphene.Field(Money)
+    unit_price = graphene.Field(Money)
+    total = graphene.Field(Money)
+    is_available = graphene.Boolean()
+
+    @staticmethod
+    def resolve_variant_id(root, info: ResolveInfo):
+        return to_global_id("VariantNode", root["variant_id"])
+
+    @staticmethod
+    def resolve_price(root, info: ResolveInfo):
+        return to_money(root["price_amount"], root["currency"])
+
+    @staticmethod
+    def resolve_price_sale(root, info: ResolveInfo):
+        return to_money(root["price_sale_amount"], root["currency"])
+
+    @staticmethod
+    def resolve_unit_price(root, info: ResolveInfo):
+        return to_money(root["unit_amount"], root["currency"])
+
+    @staticmethod
+    def resolve_total(root, info: ResolveInfo):
+        return to_money(root["total_amount"], root["currency"])
+
+
+class PriceQuoteType(graphene.ObjectType):
+    lines = graphene.List(PriceQuoteLineType)
+    total = graphene.Field(Money)
+    is_available = graphene.Boolean()
+    quoted_at = graphene.DateTime()
+    expires_at = graphene.DateTime()
+    token = graphene.String()
+
+    @staticmethod
+    def resolve_total(root, info: ResolveInfo):
+        return to_money(root["total_amount"], root["currency"])
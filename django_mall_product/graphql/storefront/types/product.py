@@ -1,6 +1,6 @@
 import datetime
 
-from django.db.models import Q
+from django.db.models import F, Q
 
 from django_filters import (
     CharFilter,
@@ -10,9 +10,28 @@ from django_filters import (
 )
 from graphene import ResolveInfo
 from graphene_django import DjangoListField, DjangoObjectType
+from graphene_django.filter import GlobalIDMultipleChoiceFilter
+from graphql_relay import from_global_id
 import graphene
 
-from django_app_core.relay.connection import ExtendedConnection
+from django_mall_product.graphql.fields import PrefetchedConnectionField, get_prefetched
+from django_mall_product.graphql.storefront.projection import (
+    get_argument,
+    get_selections,
+    product_projection,
+)
+from django_mall_product.graphql.storefront.records import (
+    ProductRecord,
+    ProductTransRecord,
+    with_records,
+)
+from django_mall_product.graphql.storefront.types.facet import FacetedConnection
+from django_mall_product.graphql.storefront.types.product_option import (
+    ProductOptionNode,
+)
+from django_mall_product.helpers.collection_helper import CollectionHelper
+from django_mall_product.helpers.count_helper import with_count_mode
+from django_mall_product.helpers.facet_helper import FacetHelper
 from django_mall_product.models import Product, ProductTrans
 
 
@@ -32,6 +51,17 @@ class ProductTransType(DjangoObjectType):
             "content",
         )
 
+    @classmethod
+    def is_type_of(cls, root, info: ResolveInfo):
+        if isinstance(root, ProductTransRecord):
+            return True
+
+        return super().is_type_of(root, info)
+
+
+def get_collection_ids(value):
+    return [from_global_id(_id)[1] for _id in value]
+
 
 class ProductFilter(FilterSet):
     language_code = CharFilter(
@@ -41,6 +71,9 @@ class ProductFilter(FilterSet):
     summary = CharFilter(field_name="translations__summary", lookup_expr="icontains")
     content = CharFilter(field_name="translations__content", lookup_expr="icontains")
     slug = CharFilter(field_name="slug", lookup_expr="exact")
+    collection_in = GlobalIDMultipleChoiceFilter(method="filter_collection_in")
+    collection_not_in = GlobalIDMultipleChoiceFilter(method="filter_collection_not_in")
+    option_values = GlobalIDMultipleChoiceFilter(method="filter_option_values")
     created_at_gt = DateTimeFilter(field_name="created_at", lookup_expr="gt")
     created_at_gte = DateTimeFilter(field_name="created_at", lookup_expr="gte")
     created_at_lt = DateTimeFilter(field_name="created_at", lookup_expr="lt")
@@ -54,15 +87,47 @@ class ProductFilter(FilterSet):
         model = Product
         fields = []
 
+    def filter_collection_in(self, queryset, name, value):
+        return CollectionHelper().in_collections(queryset, get_collection_ids(value))
+
+    def filter_collection_not_in(self, queryset, name, value):
+        return CollectionHelper().not_in_collections(
+            queryset, get_collection_ids(value)
+        )
+
+    def filter_order_by(self, queryset, name, value):
+        order_fields = []
+
+        for field in value:
+            field = self.filters["order_by"].get_ordering_value(field)
+
+            if field == "-popularity__score":
+                order_fields.append(F("popularity__score").desc(nulls_last=True))
+            elif field == "popularity__score":
+                order_fields.append(F("popularity__score").asc(nulls_first=True))
+            else:
+                order_fields.append(field)
+
+        return queryset.order_by(*order_fields)
+
+    def filter_option_values(self, queryset, name, value):
+        return queryset.filter(
+            pk__in=FacetHelper()
+            .get_index()
+            .match([from_global_id(_id)[1] for _id in value], level="product")
+        )
+
     order_by = OrderingFilter(
         fields=(
             ("translations__name", "name"),
             "sort_key",
             "count_access",
             "count_add_to_cart",
+            ("popularity__score", "trending"),
             "created_at",
             "updated_at",
-        )
+        ),
+        method="filter_order_by",
     )
 
 
@@ -78,26 +143,42 @@ class ProductNode(DjangoObjectType):
         )
         filterset_class = ProductFilter
         interfaces = (graphene.relay.Node,)
-        connection_class = ExtendedConnection
+        connection_class = FacetedConnection
 
     translation = graphene.Field(ProductTransType)
     translations = DjangoListField(ProductTransType)
     is_visible = graphene.Boolean()
+    variant_set = PrefetchedConnectionField(
+        "django_mall_product.graphql.storefront.types.variant.VariantNode",
+        required=True,
+    )
+    productoption_set = PrefetchedConnectionField(ProductOptionNode, required=True)
 
     @classmethod
     def get_queryset(cls, queryset, info: ResolveInfo):
-        return queryset.prefetch_related(
-            "translations",
-            "variant_set",
-            "variant_set__selected_option_values",
-            "productoption_set__translations",
-            "productoption_set__productoptionvalue_set",
-            "productoption_set__productoptionvalue_set__translations",
-        ).filter(
+        count_mode = get_argument(info, "count_mode")
+        if count_mode:
+            queryset = with_count_mode(queryset, count_mode)
+
+        records = with_records(queryset, info, ProductRecord, get_selections(info))
+        queryset = (
+            records
+            if records is not None
+            else product_projection.project(queryset, info)
+        )
+
+        return queryset.filter(
             Q(published_at__lte=datetime.date.today()) | Q(published_at__isnull=True),
             is_published=True,
         )
 
+    @classmethod
+    def is_type_of(cls, root, info: ResolveInfo):
+        if isinstance(root, ProductRecord):
+            return True
+
+        return super().is_type_of(root, info)
+
     @classmethod
     def get_node(cls, info: ResolveInfo, id):
         try:
@@ -113,7 +194,14 @@ class ProductNode(DjangoObjectType):
 
     @staticmethod
     def resolve_translation(root: Product, info: ResolveInfo):
-        return root.translations.filter(language_code=root.language_code).first()
+        return next(
+            (
+                translation
+                for translation in root.translations.all()
+                if translation.language_code == root.language_code
+            ),
+            None,
+        )
 
     @staticmethod
     def resolve_translations(root: Product, info: ResolveInfo):
@@ -123,6 +211,24 @@ class ProductNode(DjangoObjectType):
     def resolve_is_visible(root: Product, info: ResolveInfo):
         return root.is_visible
 
+    @staticmethod
+    def resolve_variant_set(root: Product, info: ResolveInfo, **kwargs):
+        variants = get_prefetched(root, "variant_set")
+        if variants is None:
+            return root.variant_set.all()
+
+        return [variant for variant in variants if variant.is_visible]
+
+    @staticmethod
+    def resolve_productoption_set(root: Product, info: ResolveInfo, **kwargs):
+        product_options = get_prefetched(root, "productoption_set")
+        if product_options is None:
+            return root.productoption_set.all()
+        if not (root.is_visible and root.can_search):
+            return []
+
+        return product_options
+
 
 class ProductConnection(graphene.relay.Connection):
     class Meta:
@@ -9,6 +9,13 @@ import graphene
 import graphene_django_optimizer as gql_optimizer
 
 from django_app_core.relay.connection import ExtendedConnection
+from django_mall_product.graphql.fields import PrefetchedConnectionField, get_prefetched
+from django_mall_product.graphql.storefront.projection import (
+    product_option_node_projection,
+)
+from django_mall_product.graphql.storefront.types.product_option_value import (
+    ProductOptionValueNode,
+)
 from django_mall_product.models import ProductOption, ProductOptionTrans
 
 
@@ -54,22 +61,17 @@ class ProductOptionNode(gql_optimizer.OptimizedDjangoObjectType):
         connection_class = ExtendedConnection
 
     translations = DjangoListField(ProductOptionTransType)
+    productoptionvalue_set = PrefetchedConnectionField(
+        ProductOptionValueNode, required=True
+    )
 
     @classmethod
     def get_queryset(cls, queryset, info: ResolveInfo):
-        return (
-            queryset.select_related("product", "product__organization")
-            .prefetch_related(
-                "translations",
-                "productoptionvalue_set",
-                "productoptionvalue_set__translations",
-            )
-            .filter(
-                Q(product__published_at__lte=datetime.date.today())
-                | Q(product__published_at__isnull=True),
-                product__is_published=True,
-                product__can_search=True,
-            )
+        return product_option_node_projection.project(queryset, info).filter(
+            Q(product__published_at__lte=datetime.date.today())
+            | Q(product__published_at__isnull=True),
+            product__is_published=True,
+            product__can_search=True,
         )
 
     @classmethod
@@ -95,3 +97,15 @@ class ProductOptionNode(gql_optimizer.OptimizedDjangoObjectType):
     @staticmethod
     def resolve_translations(root: ProductOption, info: ResolveInfo):
         return root.translations
+
+    @staticmethod
+    def resolve_productoptionvalue_set(
+        root: ProductOption, info: ResolveInfo, **kwargs
+    ):
+        product_option_values = get_prefetched(root, "productoptionvalue_set")
+        if product_option_values is None:
+            return root.productoptionvalue_set.all()
+        if not (root.product.is_visible and root.product.can_search):
+            return []
+
+        return product_option_values
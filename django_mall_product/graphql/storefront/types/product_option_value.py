@@ -9,6 +9,9 @@ import graphene
 import graphene_django_optimizer as gql_optimizer
 
 from django_app_core.relay.connection import ExtendedConnection
+from django_mall_product.graphql.storefront.projection import (
+    product_option_value_node_projection,
+)
 from django_mall_product.models import ProductOptionValue, ProductOptionValueTrans
 
 
@@ -57,9 +60,7 @@ class ProductOptionValueNode(gql_optimizer.OptimizedDjangoObjectType):
 
     @classmethod
     def get_queryset(cls, queryset, info: ResolveInfo):
-        return queryset.select_related(
-            "product_option__product", "product_option__product__organization"
-        ).filter(
+        return product_option_value_node_projection.project(queryset, info).filter(
             Q(product_option__product__published_at__lte=datetime.date.today())
             | Q(product_option__product__published_at__isnull=True),
             product_option__product__is_published=True,
@@ -1,23 +1,37 @@
 import datetime
 
-from django.db.models import Q
+from django.db.models import F, Q
 
 from django_filters import BooleanFilter, CharFilter, FilterSet, OrderingFilter
 from django_prices.models import MoneyField
 from graphene import ResolveInfo
 from graphene_django import DjangoObjectType
 from graphene_django.converter import convert_django_field
-from graphene_django.filter import DjangoFilterConnectionField
+from graphene_django.filter import GlobalIDMultipleChoiceFilter
 from graphql_relay import from_global_id
 import graphene
 import graphene_django_optimizer as gql_optimizer
 
-from django_app_core.relay.connection import ExtendedConnection
 from django_app_core.types import Money
+from django_mall_product.graphql.fields import PrefetchedConnectionField
+from django_mall_product.graphql.storefront.projection import (
+    get_argument,
+    get_selections,
+    variant_projection,
+)
+from django_mall_product.graphql.storefront.records import (
+    VariantRecord,
+    with_records,
+)
+from django_mall_product.graphql.storefront.types.facet import FacetedConnection
+from django_mall_product.graphql.storefront.types.product import get_collection_ids
 from django_mall_product.graphql.storefront.types.product_option_value import (
     ProductOptionValueNode,
 )
-from django_mall_product.models import Variant, VariantOptionValue
+from django_mall_product.helpers.collection_helper import CollectionHelper
+from django_mall_product.helpers.count_helper import with_count_mode
+from django_mall_product.helpers.facet_helper import FacetHelper
+from django_mall_product.models import Variant
 
 
 class VariantType(DjangoObjectType):
@@ -35,39 +49,48 @@ class VariantFilter(FilterSet):
     slug = CharFilter(field_name="slug", lookup_expr="exact")
     name = CharFilter(field_name="product__translations__name", lookup_expr="icontains")
     is_primary = BooleanFilter(field_name="is_primary")
+    collection_in = GlobalIDMultipleChoiceFilter(method="filter_collection_in")
+    collection_not_in = GlobalIDMultipleChoiceFilter(method="filter_collection_not_in")
+    option_values = GlobalIDMultipleChoiceFilter(method="filter_option_values")
 
     class Meta:
         model = Variant
         fields = []
 
     def filter_collection_in(self, queryset, name, value):
-        idList = []
-        for _id in value:
-            _, collection_id = from_global_id(_id)
-            idList.append(collection_id)
-        return (
-            queryset.filter(product__collections__in=idList)
-            .filter(
-                Q(product__collections__published_at__lte=datetime.date.today())
-                | Q(product__collections__published_at__isnull=True),
-                product__collections__is_published=True,
-            )
-            .distinct()
+        return CollectionHelper().in_collections(
+            queryset, get_collection_ids(value), product_ref="product_id"
         )
 
     def filter_collection_not_in(self, queryset, name, value):
-        idList = []
-        for _id in value:
-            _, collection_id = from_global_id(_id)
-            idList.append(collection_id)
-        return (
-            queryset.exclude(product__collections__in=idList)
-            .filter(
-                Q(product__collections__published_at__lte=datetime.date.today())
-                | Q(product__collections__published_at__isnull=True),
-                product__collections__is_published=True,
-            )
-            .distinct()
+        return CollectionHelper().not_in_collections(
+            queryset, get_collection_ids(value), product_ref="product_id"
+        )
+
+    def filter_order_by(self, queryset, name, value):
+        order_fields = []
+
+        for field in value:
+            field = self.filters["order_by"].get_ordering_value(field)
+
+            if field == "-product__popularity__score":
+                order_fields.append(
+                    F("product__popularity__score").desc(nulls_last=True)
+                )
+            elif field == "product__popularity__score":
+                order_fields.append(
+                    F("product__popularity__score").asc(nulls_first=True)
+                )
+            else:
+                order_fields.append(field)
+
+        return queryset.order_by(*order_fields)
+
+    def filter_option_values(self, queryset, name, value):
+        return queryset.filter(
+            pk__in=FacetHelper()
+            .get_index()
+            .match([from_global_id(_id)[1] for _id in value])
         )
 
     order_by = OrderingFilter(
@@ -75,10 +98,12 @@ class VariantFilter(FilterSet):
             ("product__sort_key", "sort_key"),
             ("product__count_access", "count_access"),
             ("product__count_add_to_cart", "count_add_to_cart"),
+            ("product__popularity__score", "trending"),
             "price_sale_amount",
             "created_at",
             "updated_at",
-        )
+        ),
+        method="filter_order_by",
     )
 
 
@@ -102,24 +127,37 @@ class VariantNode(gql_optimizer.OptimizedDjangoObjectType):
         )
         filterset_class = VariantFilter
         interfaces = (graphene.relay.Node,)
-        connection_class = ExtendedConnection
+        connection_class = FacetedConnection
 
-    selected_option_values = DjangoFilterConnectionField(
+    selected_option_values = PrefetchedConnectionField(
         ProductOptionValueNode, orderBy=graphene.List(of_type=graphene.String)
     )
 
     @classmethod
     def get_queryset(cls, queryset, info: ResolveInfo):
-        return (
-            queryset.select_related("product")
-            .prefetch_related("selected_option_values")
-            .filter(
-                Q(published_at__lte=datetime.date.today())
-                | Q(published_at__isnull=True),
-                is_published=True,
-            )
+        count_mode = get_argument(info, "count_mode")
+        if count_mode:
+            queryset = with_count_mode(queryset, count_mode)
+
+        records = with_records(queryset, info, VariantRecord, get_selections(info))
+        queryset = (
+            records
+            if records is not None
+            else variant_projection.project(queryset, info)
+        )
+
+        return queryset.filter(
+            Q(published_at__lte=datetime.date.today()) | Q(published_at__isnull=True),
+            is_published=True,
         )
 
+    @classmethod
+    def is_type_of(cls, root, info: ResolveInfo):
+        if isinstance(root, VariantRecord):
+            return True
+
+        return super().is_type_of(root, info)
+
     @classmethod
     def get_node(cls, info: ResolveInfo, id):
         try:
@@ -134,10 +172,11 @@ class VariantNode(gql_optimizer.OptimizedDjangoObjectType):
 
     @gql_optimizer.resolver_hints(select_related=("selected_option_values",))
     @staticmethod
-    def resolve_selected_option_values(root: Variant, info: ResolveInfo):
-        idList = (
-            VariantOptionValue.objects.filter(variant=root)
-            .filter(deleted__isnull=True)
-            .values_list("product_option_value_id", flat=True)
-        )
-        return root.selected_option_values.filter(id__in=idList)
+    def resolve_selected_option_values(root: Variant, info: ResolveInfo, **kwargs):
+        values = root.get_selected_option_values()
+        if isinstance(values, list) and not (
+            root.product.is_visible and root.product.can_search
+        ):
+            return []
+
+        return values
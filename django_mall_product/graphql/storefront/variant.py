@@ -1,18 +1,175 @@
+import uuid
+
+from graphene import ResolveInfo
+from graphql_relay import from_global_id
 import graphene
 
-from django_app_core.relay.connection import DjangoFilterConnectionField
-from django_mall_product.graphql.storefront.types.variant import VariantNode
+from django_mall_product.graphql.storefront.catalog import resolve_catalog
+from django_mall_product.graphql.storefront.types.catalog import VariantCatalogType
+from django_mall_product.graphql.storefront.types.facet import CountedConnectionField
+from django_mall_product.graphql.storefront.types.price_quote import (
+    PriceQuoteItemInput,
+    PriceQuoteType,
+)
+from django_mall_product.graphql.storefront.types.variant import (
+    VariantFilter,
+    VariantNode,
+)
+from django_mall_product.helpers.inventory_helper import InventoryHelper
+from django_mall_product.helpers.node_helper import NodeHelper
+from django_mall_product.helpers.price_quote_helper import PriceQuoteHelper
+from django_mall_product.helpers.slug_helper import SlugHelper
+from django_mall_product.models import Variant
+
+
+class ReserveVariantItemInput(graphene.InputObjectType):
+    variant_id = graphene.ID(required=True)
+    quantity = graphene.Int(required=True)
+    warehouse = graphene.String()
+
+
+class ReserveVariants(graphene.relay.ClientIDMutation):
+    class Input:
+        items = graphene.List(graphene.NonNull(ReserveVariantItemInput), required=True)
+
+    success = graphene.Boolean()
+    reservation_key = graphene.String()
+    expires_at = graphene.DateTime()
+
+    @classmethod
+    def mutate_and_get_payload(cls, root, info: ResolveInfo, **input):
+        items = input["items"]
+
+        reserve_items = []
+        for item in items:
+            try:
+                _, variant_id = from_global_id(item.variant_id)
+                variant_id = str(Variant._meta.pk.to_python(variant_id))
+            except:
+                raise Exception("Bad Request!")
+            if item.quantity < 1:
+                raise Exception("The quantity is invalid!")
+            reserve_items.append((variant_id, item.quantity, item.warehouse))
+
+        if not reserve_items:
+            raise Exception("Bad Request!")
+
+        key, expires_at = InventoryHelper().reserve(reserve_items)
+
+        return ReserveVariants(
+            success=True, reservation_key=str(key), expires_at=expires_at
+        )
+
+
+class ReleaseVariantReservation(graphene.relay.ClientIDMutation):
+    class Input:
+        reservationKey = graphene.String(required=True)
+
+    success = graphene.Boolean()
+
+    @classmethod
+    def mutate_and_get_payload(cls, root, info: ResolveInfo, **input):
+        reservationKey = input["reservationKey"]
+
+        try:
+            key = uuid.UUID(reservationKey)
+        except:
+            raise Exception("Bad Request!")
+
+        InventoryHelper().release(key)
+
+        return ReleaseVariantReservation(success=True)
 
 
 class VariantMutation(graphene.ObjectType):
-    pass
+    variants_reserve = ReserveVariants.Field()
+    variant_reservation_release = ReleaseVariantReservation.Field()
 
 
 class VariantQuery(graphene.ObjectType):
     variant = graphene.relay.Node.Field(VariantNode)
-    variants = DjangoFilterConnectionField(
+    variants = CountedConnectionField(
         VariantNode,
         orderBy=graphene.List(of_type=graphene.String),
         page_number=graphene.Int(),
         page_size=graphene.Int(),
+        count_mode=graphene.String(),
+        row_mode=graphene.Boolean(),
+    )
+    catalog_variants = graphene.Field(
+        VariantCatalogType,
+        slug=graphene.String(),
+        name=graphene.String(),
+        is_primary=graphene.Boolean(),
+        collection_in=graphene.List(graphene.ID),
+        collection_not_in=graphene.List(graphene.ID),
+        option_values=graphene.List(graphene.ID),
+        orderBy=graphene.List(of_type=graphene.String),
+        page_number=graphene.Int(),
+        page_size=graphene.Int(),
+        row_mode=graphene.Boolean(),
+    )
+    variant_by_slug = graphene.Field(
+        VariantNode,
+        slug=graphene.String(required=True),
+        product_slug=graphene.String(),
+    )
+    price_quote = graphene.Field(
+        PriceQuoteType,
+        items=graphene.List(graphene.NonNull(PriceQuoteItemInput), required=True),
+    )
+    variants_by_ids = graphene.List(
+        VariantNode, ids=graphene.List(graphene.NonNull(graphene.ID), required=True)
     )
+
+    @staticmethod
+    def resolve_catalog_variants(root, info: ResolveInfo, **kwargs):
+        return resolve_catalog(
+            VariantNode,
+            VariantFilter,
+            lambda engine, filters, order_by: engine.query_variants(filters, order_by),
+            info,
+            **kwargs
+        )
+
+    @staticmethod
+    def resolve_variant_by_slug(root, info: ResolveInfo, slug, product_slug=None):
+        slug_helper = SlugHelper()
+        product_id = None
+        if product_slug:
+            product_id = slug_helper.get_product_id(product_slug)
+            if product_id is None:
+                return None
+
+        variant_id = slug_helper.get_variant_id(slug, product_id)
+        if variant_id is None:
+            return None
+
+        variant = VariantNode.get_queryset(
+            Variant.objects.filter(pk=variant_id), info
+        ).first()
+        if variant is None or not variant.product.is_visible:
+            return None
+
+        return variant
+
+    @staticmethod
+    def resolve_variants_by_ids(root, info: ResolveInfo, ids):
+        return NodeHelper(
+            VariantNode, is_visible=lambda variant: variant.product.is_visible
+        ).get_nodes(ids, info)
+
+    @staticmethod
+    def resolve_price_quote(root, info: ResolveInfo, items):
+        quote_items = []
+        for item in items:
+            try:
+                _, variant_id = from_global_id(item.variant_id)
+                variant_id = str(Variant._meta.pk.to_python(variant_id))
+            except:
+                raise Exception("Bad Request!")
+            if item.quantity < 1:
+                raise Exception("The quantity is invalid!")
+            quote_items.append((variant_id, item.quantity))
+
+        return PriceQuoteHelper().quote(quote_items)
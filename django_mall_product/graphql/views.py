@@ -0,0 +1,83 @@
+import json
+
+from django.http import HttpResponseNotAllowed, JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+
+from django_mall_product.graphql.coalescing import Coalescer
+from django_mall_product.graphql.middleware import (
+    AsyncORMMiddleware,
+    DatabaseRouterMiddleware,
+    WebsiteLoaders,
+    run_in_executor,
+    should_read_from_replica,
+)
+from django_mall_product.helpers.invalidation_helper import InvalidationHelper
+from django_mall_product.routers import read_from_replica
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncStorefrontGraphQLView(View):
+    schema = None
+    coalescer = Coalescer()
+
+    async def post(self, request, *args, **kwargs):
+        try:
+            data = json.loads(request.body or "{}")
+        except ValueError:
+            return JsonResponse(
+                {"errors": [{"message": "Bad Request!"}]},
+                status=400,
+            )
+
+        response, status = await self.coalescer.execute(
+            request, data, lambda: self.execute(request, data)
+        )
+
+        return JsonResponse(response, status=status)
+
+    async def execute(self, request, data):
+        builder = self.get_builder()
+        if builder is not None:
+            response = builder.introspect(
+                data.get("query") or "", data.get("operationName")
+            )
+            if response is not None:
+                return response, 200
+
+        request.loaders = WebsiteLoaders()
+
+        await run_in_executor(InvalidationHelper().poll)
+
+        with read_from_replica(should_read_from_replica(request)):
+            result = await self.get_schema().execute_async(
+                data.get("query"),
+                variable_values=data.get("variables"),
+                operation_name=data.get("operationName"),
+                context_value=request,
+                middleware=[DatabaseRouterMiddleware(), AsyncORMMiddleware()],
+            )
+
+        response = {"data": result.data}
+        if result.errors:
+            response["errors"] = [error.formatted for error in result.errors]
+
+        return response, 200 if result.data is not None else 400
+
+    async def get(self, request, *args, **kwargs):
+        return HttpResponseNotAllowed(["POST"])
+
+    def get_builder(self):
+        if self.schema is None:
+            from django_mall_product.graphql.schema_storefront import builder
+
+            return builder
+
+        return None
+
+    def get_schema(self):
+        if self.schema is None:
+            return self.get_builder().get_schema()
+
+        return self.schema
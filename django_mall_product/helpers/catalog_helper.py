@@ -0,0 +1,489 @@
+import datetime
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from django_mall_product.helpers.facet_helper import FacetHelper
+from django_mall_product.models import Product, ProductTrans, Variant
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def to_timestamp(value):
+    return value.timestamp() if value is not None else float("nan")
+
+
+def to_float(value):
+    return float(value) if value is not None else float("nan")
+
+
+class StringTable:
+    def __init__(self):
+        self.values = []
+        self.lower_values = []
+        self.codes = {}
+
+    def intern(self, value):
+        if value is None:
+            return -1
+
+        value = str(value)
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+            self.lower_values.append(value.lower())
+
+        return code
+
+    def get(self, value):
+        return self.codes.get(str(value), -1)
+
+    def get_many(self, values):
+        return numpy.array(
+            [self.codes[str(value)] for value in values if str(value) in self.codes],
+            dtype=numpy.int64,
+        )
+
+    def contains(self, text):
+        text = text.lower()
+
+        return numpy.array(
+            [code for code, value in enumerate(self.lower_values) if text in value],
+            dtype=numpy.int64,
+        )
+
+    def get_ranks(self):
+        ranks = numpy.full(len(self.values) + 1, numpy.nan)
+        order = sorted(range(len(self.values)), key=self.values.__getitem__)
+        ranks[order] = numpy.arange(len(order), dtype=numpy.float64)
+
+        return ranks
+
+
+class ColumnSet:
+    def __init__(self, columns):
+        self.columns = columns
+
+    def __len__(self):
+        return len(self.columns["id"])
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def get(self, name, default=None):
+        return self.columns.get(name, default)
+
+    def take(self, mask):
+        return ColumnSet({name: column[mask] for name, column in self.columns.items()})
+
+    def concat(self, other):
+        columns = {}
+        for name in set(self.columns) | set(other.columns):
+            columns[name] = numpy.concatenate(
+                [
+                    self.columns.get(
+                        name, numpy.full(len(self), -1, dtype=numpy.int64)
+                    ),
+                    other.columns.get(
+                        name, numpy.full(len(other), -1, dtype=numpy.int64)
+                    ),
+                ]
+            )
+
+        return ColumnSet(columns)
+
+
+class CatalogEngine:
+    product_filters = {
+        "slug",
+        "name",
+        "language_code",
+        "option_values",
+        "created_at_gt",
+        "created_at_gte",
+        "created_at_lt",
+        "created_at_lte",
+        "updated_at_gt",
+        "updated_at_gte",
+        "updated_at_lt",
+        "updated_at_lte",
+    }
+    product_orderings = {
+        "sort_key": ("sort_key", False),
+        "count_access": ("count_access", False),
+        "count_add_to_cart": ("count_add_to_cart", False),
+        "trending": ("popularity", True),
+        "created_at": ("created_at", False),
+        "updated_at": ("updated_at", False),
+    }
+    variant_filters = {"slug", "name", "is_primary", "option_values"}
+    variant_orderings = {
+        "sort_key": ("product_sort_key", False),
+        "count_access": ("product_count_access", False),
+        "count_add_to_cart": ("product_count_add_to_cart", False),
+        "trending": ("product_popularity", True),
+        "price_sale_amount": ("price_sale", False),
+        "created_at": ("created_at", False),
+        "updated_at": ("updated_at", False),
+    }
+
+    def __init__(self):
+        self.built_at = time.monotonic()
+        self.ids = StringTable()
+        self.strings = StringTable()
+        self.products = self.load_products()
+        self.variants = self.load_variants()
+        self.ranks = self.strings.get_ranks()
+
+    def load_products(self, product_ids=None):
+        queryset = Product.objects.order_by()
+        translations = ProductTrans.objects.order_by()
+        if product_ids is not None:
+            queryset = queryset.filter(pk__in=product_ids)
+            translations = translations.filter(product_id__in=product_ids)
+
+        rows = list(
+            queryset.values_list(
+                "id",
+                "slug",
+                "serial",
+                "sort_key",
+                "is_published",
+                "published_at",
+                "count_access",
+                "count_add_to_cart",
+                "created_at",
+                "updated_at",
+                "popularity__score",
+            )
+        )
+
+        positions = {str(row[0]): position for position, row in enumerate(rows)}
+        names = {}
+        for product_id, language_code, name in translations.values_list(
+            "product_id", "language_code", "name"
+        ):
+            position = positions.get(str(product_id))
+            if position is None:
+                continue
+            column = names.setdefault(
+                "name:" + language_code, numpy.full(len(rows), -1, dtype=numpy.int64)
+            )
+            column[position] = self.strings.intern(name)
+
+        columns = {
+            "id": numpy.array(
+                [self.ids.intern(row[0]) for row in rows], dtype=numpy.int64
+            ),
+            "slug": numpy.array(
+                [self.strings.intern(row[1]) for row in rows], dtype=numpy.int64
+            ),
+            "serial": numpy.array(
+                [self.strings.intern(row[2]) for row in rows], dtype=numpy.int64
+            ),
+            "sort_key": numpy.array([to_float(row[3]) for row in rows]),
+            "is_published": numpy.array([bool(row[4]) for row in rows], dtype=bool),
+            "published_at": numpy.array([to_timestamp(row[5]) for row in rows]),
+            "count_access": numpy.array([to_float(row[6]) for row in rows]),
+            "count_add_to_cart": numpy.array([to_float(row[7]) for row in rows]),
+            "created_at": numpy.array([to_timestamp(row[8]) for row in rows]),
+            "updated_at": numpy.array([to_timestamp(row[9]) for row in rows]),
+            "popularity": numpy.array([to_float(row[10]) for row in rows]),
+        }
+        columns.update(names)
+
+        return ColumnSet(columns)
+
+    def load_variants(self, product_ids=None):
+        queryset = Variant.objects.order_by()
+        if product_ids is not None:
+            queryset = queryset.filter(product_id__in=product_ids)
+
+        rows = list(
+            queryset.values_list(
+                "id",
+                "product_id",
+                "slug",
+                "sku",
+                "is_primary",
+                "is_published",
+                "published_at",
+                "price_sale_amount",
+                "created_at",
+                "updated_at",
+            )
+        )
+
+        return ColumnSet(
+            {
+                "id": numpy.array(
+                    [self.ids.intern(row[0]) for row in rows], dtype=numpy.int64
+                ),
+                "product": numpy.array(
+                    [self.ids.intern(row[1]) for row in rows], dtype=numpy.int64
+                ),
+                "slug": numpy.array(
+                    [self.strings.intern(row[2]) for row in rows], dtype=numpy.int64
+                ),
+                "sku": numpy.array(
+                    [self.strings.intern(row[3]) for row in rows], dtype=numpy.int64
+                ),
+                "is_primary": numpy.array([bool(row[4]) for row in rows], dtype=bool),
+                "is_published": numpy.array([bool(row[5]) for row in rows], dtype=bool),
+                "published_at": numpy.array([to_timestamp(row[6]) for row in rows]),
+                "price_sale": numpy.array([to_float(row[7]) for row in rows]),
+                "created_at": numpy.array([to_timestamp(row[8]) for row in rows]),
+                "updated_at": numpy.array([to_timestamp(row[9]) for row in rows]),
+            }
+        )
+
+    def refresh(self, product_ids):
+        product_ids = [str(product_id) for product_id in product_ids]
+        codes = self.ids.get_many(product_ids)
+
+        self.products = self.products.take(
+            ~numpy.isin(self.products["id"], codes)
+        ).concat(self.load_products(product_ids))
+        self.variants = self.variants.take(
+            ~numpy.isin(self.variants["product"], codes)
+        ).concat(self.load_variants(product_ids))
+        self.ranks = self.strings.get_ranks()
+
+    def get_today(self):
+        today = datetime.datetime.combine(datetime.date.today(), datetime.time.min)
+        if settings.USE_TZ:
+            today = timezone.make_aware(today)
+
+        return today.timestamp()
+
+    def is_visible(self, columns):
+        published_at = columns["published_at"]
+
+        return columns["is_published"] & (
+            numpy.isnan(published_at) | (published_at <= self.get_today())
+        )
+
+    def by_product(self, name):
+        values = numpy.full(len(self.ids.values) + 1, numpy.nan)
+        values[self.products["id"]] = self.products[name].astype(numpy.float64)
+
+        return values[self.variants["product"]]
+
+    def match_names(self, columns, name):
+        codes = self.strings.contains(name)
+        mask = numpy.zeros(len(columns), dtype=bool)
+        for column_name, column in columns.columns.items():
+            if column_name.startswith("name:"):
+                mask |= numpy.isin(column, codes)
+
+        return mask
+
+    def match_dates(self, columns, filters):
+        mask = numpy.ones(len(columns), dtype=bool)
+        for key, value in filters.items():
+            field, _, lookup = key.rpartition("_")
+            if field not in ("created_at", "updated_at") or value is None:
+                continue
+
+            column = columns[field]
+            timestamp = value.timestamp()
+            if lookup == "gt":
+                mask &= column > timestamp
+            elif lookup == "gte":
+                mask &= column >= timestamp
+            elif lookup == "lt":
+                mask &= column < timestamp
+            elif lookup == "lte":
+                mask &= column <= timestamp
+
+        return mask
+
+    def sort(self, columns, keys, order_by, default_keys):
+        sort_keys = [columns["id"]]
+        fields = []
+        for field in order_by or []:
+            descending = field.startswith("-")
+            name, popularity = keys[field.lstrip("-")]
+            fields.append((columns[name], descending, popularity))
+        for name in default_keys:
+            fields.append((columns[name], False, False))
+
+        for values, descending, popularity in reversed(fields):
+            values = values.astype(numpy.float64)
+            nulls = numpy.isnan(values)
+            values = numpy.where(nulls, 0, -values if descending else values)
+            nulls_first = descending != popularity
+            sort_keys.append(values)
+            sort_keys.append(~nulls if nulls_first else nulls)
+
+        return numpy.lexsort(sort_keys)
+
+    def supports(self, filters, order_by, supported_filters, orderings):
+        return all(
+            value in (None, "", []) or key in supported_filters
+            for key, value in filters.items()
+        ) and all(field.lstrip("-") in orderings for field in order_by or [])
+
+    def query_products(self, filters, order_by=None):
+        if not self.supports(
+            filters, order_by, self.product_filters, self.product_orderings
+        ):
+            return None
+
+        products = self.products
+        mask = self.is_visible(products) & self.match_dates(products, filters)
+
+        if filters.get("slug"):
+            mask &= products["slug"] == self.strings.get(filters["slug"])
+        if filters.get("language_code"):
+            mask &= (
+                products.get(
+                    "name:" + filters["language_code"],
+                    numpy.full(len(products), -1, dtype=numpy.int64),
+                )
+                >= 0
+            )
+        if filters.get("name"):
+            mask &= self.match_names(products, filters["name"])
+        if filters.get("option_values"):
+            mask &= numpy.isin(
+                products["id"],
+                self.ids.get_many(
+                    FacetHelper()
+                    .get_index()
+                    .match(filters["option_values"], level="product")
+                ),
+            )
+
+        matched = products.take(mask)
+        sorted_columns = dict(matched.columns)
+        sorted_columns["serial"] = self.ranks[matched["serial"]]
+        order = self.sort(
+            ColumnSet(sorted_columns),
+            self.product_orderings,
+            order_by,
+            () if order_by else ("sort_key", "serial"),
+        )
+
+        return [self.ids.values[code] for code in matched["id"][order]]
+
+    def query_variants(self, filters, order_by=None):
+        if not self.supports(
+            filters, order_by, self.variant_filters, self.variant_orderings
+        ):
+            return None
+
+        variants = self.variants
+        visible_products = numpy.zeros(len(self.ids.values) + 1, dtype=bool)
+        visible_products[self.products["id"][self.is_visible(self.products)]] = True
+        mask = self.is_visible(variants) & visible_products[variants["product"]]
+
+        if filters.get("slug"):
+            mask &= variants["slug"] == self.strings.get(filters["slug"])
+        if filters.get("is_primary") is not None:
+            mask &= variants["is_primary"] == bool(filters["is_primary"])
+        if filters.get("name"):
+            matched_products = self.products["id"][
+                self.match_names(self.products, filters["name"])
+            ]
+            mask &= numpy.isin(variants["product"], matched_products)
+        if filters.get("option_values"):
+            mask &= numpy.isin(
+                variants["id"],
+                self.ids.get_many(
+                    FacetHelper().get_index().match(filters["option_values"])
+                ),
+            )
+
+        columns = dict(variants.columns)
+        columns["sku"] = self.ranks[variants["sku"]]
+        for name in ("sort_key", "count_access", "count_add_to_cart", "popularity"):
+            columns["product_" + name] = self.by_product(name)
+        matched = ColumnSet(columns).take(mask)
+
+        order = self.sort(
+            matched,
+            self.variant_orderings,
+            order_by,
+            () if order_by else ("sku",),
+        )
+
+        return [self.ids.values[code] for code in matched["id"][order]]
+
+
+class CatalogHelper:
+    _engines = {}
+    _pending = {}
+    _skipped = {}
+    _locks = {}
+    _lock = threading.Lock()
+
+    def is_enabled(self):
+        return numpy is not None and getattr(settings, "PRODUCT_CATALOG_ENGINE", False)
+
+    def get_lock(self, key):
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def get_engine(self):
+        if not self.is_enabled():
+            return None
+
+        key = getattr(connection, "schema_name", "public")
+        timeout = getattr(settings, "PRODUCT_CATALOG_REBUILD_INTERVAL", 300)
+
+        # Builds hold a per-tenant lock, so one tenant's build never blocks
+        # another; the class lock only guards the shared dicts.
+        with self.get_lock(key):
+            engine = self._engines.get(key)
+            if engine is None or time.monotonic() - engine.built_at > timeout:
+                if time.monotonic() < self._skipped.get(key, 0):
+                    return None
+                if Variant.objects.count() > getattr(
+                    settings, "PRODUCT_CATALOG_MAX_VARIANTS", 20000
+                ):
+                    with self._lock:
+                        self._skipped[key] = time.monotonic() + timeout
+                    return None
+
+                with self._lock:
+                    # Refreshes arriving during the build are kept and
+                    # applied to the new engine below.
+                    self._pending[key] = set()
+                engine = CatalogEngine()
+                with self._lock:
+                    self._engines[key] = engine
+
+            with self._lock:
+                product_ids = self._pending.pop(key, None)
+            if product_ids:
+                engine.refresh(product_ids)
+
+        return engine
+
+    @classmethod
+    def refresh(cls, product_ids, schema_name=None):
+        key = schema_name or getattr(connection, "schema_name", "public")
+        with cls._lock:
+            if key in cls._engines or key in cls._pending:
+                cls._pending.setdefault(key, set()).update(
+                    str(product_id) for product_id in product_ids
+                )
+
+    @classmethod
+    def clear(cls, schema_name=None):
+        with cls._lock:
+            if schema_name is None:
+                cls._engines.clear()
+                cls._pending.clear()
+            else:
+                cls._engines.pop(schema_name, None)
+                cls._pending.pop(schema_name, None)
@@ -0,0 +1,58 @@
+import datetime
+
+from django.db.models import Exists, OuterRef, Q, Subquery
+
+from django_mall_product import models
+
+
+class CollectionHelper:
+    def __init__(self):
+        self.collection_model = getattr(models, "Collection", None)
+        self.membership_model = getattr(models, "CollectionProduct", None)
+
+    @property
+    def is_installed(self):
+        return self.collection_model is not None and self.membership_model is not None
+
+    def get_memberships(self, collection_ids, product_ref="pk", published=False):
+        queryset = self.membership_model.objects.filter(
+            collection_id__in=collection_ids, product_id=OuterRef(product_ref)
+        )
+        if published:
+            queryset = queryset.filter(
+                Q(collection__published_at__lte=datetime.date.today())
+                | Q(collection__published_at__isnull=True),
+                collection__is_published=True,
+            )
+
+        return queryset
+
+    def in_collections(self, queryset, collection_ids, product_ref="pk"):
+        if not self.is_installed:
+            return queryset.none()
+
+        return queryset.filter(
+            Exists(self.get_memberships(collection_ids, product_ref, published=True))
+        )
+
+    def not_in_collections(self, queryset, collection_ids, product_ref="pk"):
+        if not self.is_installed:
+            return queryset
+
+        return queryset.filter(
+            ~Exists(self.get_memberships(collection_ids, product_ref))
+        )
+
+    def get_collection_products(self, queryset, collection_id):
+        if not self.is_installed:
+            return queryset.none()
+
+        return (
+            self.in_collections(queryset, [collection_id])
+            .annotate(
+                collection_joined_at=Subquery(
+                    self.get_memberships([collection_id]).values("created_at")[:1]
+                )
+            )
+            .order_by("collection_joined_at")
+        )
@@ -0,0 +1,114 @@
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet
+from django.db import connection, connections
+
+
+class CountedQuerySetMixin:
+    count_mode = None
+
+    def _clone(self):
+        clone = super()._clone()
+        clone.count_mode = self.count_mode
+
+        return clone
+
+
+counted_classes = {}
+
+
+def with_count_mode(queryset, mode):
+    if mode not in CountHelper.modes:
+        raise Exception("The countMode is invalid!")
+
+    cls = queryset.__class__
+    if not issubclass(cls, CountedQuerySetMixin):
+        if cls not in counted_classes:
+            counted_classes[cls] = type(
+                "Counted" + cls.__name__, (CountedQuerySetMixin, cls), {}
+            )
+        queryset = queryset._chain()
+        queryset.__class__ = counted_classes[cls]
+
+    queryset.count_mode = mode
+
+    return queryset
+
+
+class CountHelper:
+    modes = ("exact", "estimated", "capped")
+
+    def __init__(self):
+        self.cache = caches[getattr(settings, "PRODUCT_COUNT_CACHE", "default")]
+        self.timeout = getattr(settings, "PRODUCT_COUNT_CACHE_TIMEOUT", 300)
+        self.cap = getattr(settings, "PRODUCT_COUNT_CAP", 10000)
+
+    def get_version_key(self):
+        return "product:count:version:{}".format(
+            getattr(connection, "schema_name", "public")
+        )
+
+    def get_version(self):
+        key = self.get_version_key()
+        version = self.cache.get(key)
+        if version is None:
+            self.cache.add(key, int(time.time() * 1000), None)
+            version = self.cache.get(key)
+
+        return version
+
+    def invalidate(self):
+        try:
+            self.cache.incr(self.get_version_key())
+        except ValueError:
+            self.cache.add(self.get_version_key(), int(time.time() * 1000), None)
+
+    def get_cache_key(self, sql, params):
+        digest = hashlib.sha1(
+            "{}|{}".format(sql, repr(params)).encode("utf-8")
+        ).hexdigest()
+
+        return "product:count:{}:{}:{}".format(
+            getattr(connection, "schema_name", "public"), self.get_version(), digest
+        )
+
+    def count(self, queryset, mode):
+        queryset = queryset.order_by()
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            return 0, True, mode
+
+        if mode == "estimated":
+            return self.estimate(queryset, sql, params) + (mode,)
+        if mode == "capped":
+            value = queryset.values("pk")[: self.cap + 1].count()
+            if value > self.cap:
+                return self.cap, False, mode
+            return value, True, mode
+
+        key = self.get_cache_key(sql, params)
+        value = self.cache.get(key)
+        if value is None:
+            value = queryset.count()
+            self.cache.set(key, value, self.timeout)
+
+        return value, True, mode
+
+    def estimate(self, queryset, sql, params):
+        db = connections[queryset.db]
+        if db.vendor != "postgresql":
+            return queryset.count(), True
+
+        with db.cursor() as cursor:
+            cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+            plan = cursor.fetchone()[0]
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        return int(plan[0]["Plan"]["Plan Rows"]), False
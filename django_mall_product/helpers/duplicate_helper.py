@@ -0,0 +1,235 @@
+import datetime
+import logging
+import threading
+import uuid
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from django_mall_product.helpers.collection_helper import CollectionHelper
+from django_mall_product.helpers.invalidation_helper import InvalidationHelper
+from django_mall_product.helpers.product_page_helper import ProductPageHelper
+from django_mall_product.helpers.slug_helper import SlugHelper
+from django_mall_product.models import (
+    Product,
+    ProductDuplicateJob,
+    ProductOption,
+    ProductOptionTrans,
+    ProductOptionValue,
+    ProductOptionValueTrans,
+    ProductTrans,
+    Variant,
+    VariantOptionValue,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def clone(instance, **values):
+    model = instance.__class__
+    fields = {
+        field.attname: getattr(instance, field.attname)
+        for field in model._meta.concrete_fields
+        if not field.primary_key
+        and field.attname not in DuplicateHelper.skipped_fields
+        and not field.attname.startswith("deleted")
+    }
+    fields.update(values)
+
+    return model(**fields)
+
+
+class DuplicateHelper:
+    skipped_fields = ("created_at", "updated_at", "count_access", "count_add_to_cart")
+
+    def __init__(self):
+        self.batch_size = getattr(settings, "PRODUCT_DUPLICATE_BATCH_SIZE", 1000)
+        self.background_threshold = getattr(
+            settings, "PRODUCT_DUPLICATE_BACKGROUND_THRESHOLD", 500
+        )
+        self.job_timeout = getattr(settings, "PRODUCT_DUPLICATE_JOB_TIMEOUT", 3600)
+
+    def should_run_in_background(self, product_id):
+        return (
+            Variant.objects.filter(product_id=product_id).count()
+            > self.background_threshold
+        )
+
+    def bulk_create(self, model, objs):
+        if objs:
+            model.objects.bulk_create(objs, batch_size=self.batch_size)
+
+    def duplicate(self, product, slug, new_id=None):
+        copy = clone(product, slug=slug)
+        if new_id is not None:
+            copy.id = new_id
+
+        options = {}
+        for option in ProductOption.objects.filter(product=product):
+            options[option.id] = clone(option, product_id=copy.id)
+
+        values = {}
+        for value in ProductOptionValue.objects.filter(
+            product_option_id__in=list(options)
+        ):
+            values[value.id] = clone(
+                value, product_option_id=options[value.product_option_id].id
+            )
+
+        variants = {}
+        for variant in Variant.objects.filter(product=product):
+            variants[variant.id] = clone(
+                variant,
+                product_id=copy.id,
+                slug=str(uuid.uuid4()).replace("-", ""),
+            )
+
+        copy.save(force_insert=True)
+        self.bulk_create(
+            ProductTrans,
+            [
+                clone(translation, product_id=copy.id)
+                for translation in ProductTrans.objects.filter(product=product)
+            ],
+        )
+        self.bulk_create(ProductOption, list(options.values()))
+        self.bulk_create(
+            ProductOptionTrans,
+            [
+                clone(
+                    translation,
+                    product_option_id=options[translation.product_option_id].id,
+                )
+                for translation in ProductOptionTrans.objects.filter(
+                    product_option_id__in=list(options)
+                )
+            ],
+        )
+        self.bulk_create(ProductOptionValue, list(values.values()))
+        self.bulk_create(
+            ProductOptionValueTrans,
+            [
+                clone(
+                    translation,
+                    product_option_value_id=values[
+                        translation.product_option_value_id
+                    ].id,
+                )
+                for translation in ProductOptionValueTrans.objects.filter(
+                    product_option_value_id__in=list(values)
+                )
+            ],
+        )
+        self.bulk_create(Variant, list(variants.values()))
+        self.bulk_create(
+            VariantOptionValue,
+            [
+                clone(
+                    link,
+                    variant_id=variants[link.variant_id].id,
+                    product_option_value_id=values[link.product_option_value_id].id,
+                )
+                for link in VariantOptionValue.objects.filter(
+                    variant_id__in=list(variants),
+                    product_option_value_id__in=list(values),
+                )
+            ],
+        )
+        collection_helper = CollectionHelper()
+        if collection_helper.is_installed:
+            self.bulk_create(
+                collection_helper.membership_model,
+                [
+                    clone(membership, product_id=copy.id)
+                    for membership in collection_helper.membership_model.objects.filter(
+                        product=product
+                    )
+                ],
+            )
+
+        transaction.on_commit(lambda: ProductPageHelper().rebuild([copy.id]))
+        InvalidationHelper().publish("product", [copy.id])
+        transaction.on_commit(lambda: SlugHelper().set(Product, slug, copy.id))
+
+        return copy
+
+    def duplicate_in_background(self, product, slug):
+        job = ProductDuplicateJob.objects.create(
+            product=product, new_product_id=uuid.uuid4(), slug=slug
+        )
+        tenant = getattr(connection, "tenant", None)
+
+        transaction.on_commit(
+            lambda: threading.Thread(
+                target=self.run_in_thread, args=(job.id, tenant)
+            ).start()
+        )
+
+        return job
+
+    def run_in_thread(self, job_id, tenant):
+        try:
+            if tenant is not None:
+                connection.set_tenant(tenant)
+            self.run_job(job_id)
+        finally:
+            connection.close()
+
+    def get_runnable_jobs(self):
+        stale_before = timezone.now() - datetime.timedelta(seconds=self.job_timeout)
+
+        return ProductDuplicateJob.objects.filter(
+            Q(status="pending") | Q(status="running", updated_at__lt=stale_before)
+        )
+
+    def claim_job(self, job_id):
+        return (
+            self.get_runnable_jobs()
+            .filter(pk=job_id)
+            .update(status="running", updated_at=timezone.now())
+            == 1
+        )
+
+    def finish_job(self, job_id, status, error=None):
+        ProductDuplicateJob.objects.filter(pk=job_id).update(
+            status=status, error=error, updated_at=timezone.now()
+        )
+
+    def run_job(self, job_id):
+        if not self.claim_job(job_id):
+            return False
+
+        job = ProductDuplicateJob.objects.get(pk=job_id)
+        if Product._base_manager.filter(pk=job.new_product_id).exists():
+            self.finish_job(job_id, "succeeded")
+            return True
+
+        try:
+            with transaction.atomic():
+                self.duplicate(
+                    Product.objects.get(pk=job.product_id),
+                    job.slug,
+                    job.new_product_id,
+                )
+        except Exception as error:
+            logger.exception(
+                "Duplicating product %s into %s failed.",
+                job.product_id,
+                job.new_product_id,
+            )
+            self.finish_job(job_id, "failed", str(error) or error.__class__.__name__)
+            return False
+
+        self.finish_job(job_id, "succeeded")
+
+        return True
+
+    def run_pending_jobs(self):
+        return sum(
+            self.run_job(job_id)
+            for job_id in self.get_runnable_jobs()
+            .order_by("created_at")
+            .values_list("id", flat=True)
+        )
@@ -0,0 +1,230 @@
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+
+from django_mall_product.models import (
+    ProductOptionTrans,
+    ProductOptionValueTrans,
+    Variant,
+    VariantOptionValue,
+)
+
+
+def to_bitmap(positions, size):
+    data = bytearray((size + 7) // 8)
+    for position in positions:
+        data[position >> 3] |= 1 << (position & 7)
+
+    return int.from_bytes(data, "little")
+
+
+def iter_bitmap(bitmap):
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    for index, byte in enumerate(data):
+        if byte:
+            for bit in range(8):
+                if byte >> bit & 1:
+                    yield (index << 3) + bit
+
+
+class FacetIndex:
+    def __init__(self):
+        self.built_at = time.monotonic()
+        self.translations = {}
+
+        variants = list(
+            Variant.objects.order_by().values_list(
+                "id", "product_id", "price_sale_amount"
+            )
+        )
+        self.variant_ids = [str(variant_id) for variant_id, _, _ in variants]
+        self.variant_positions = {
+            variant_id: position for position, variant_id in enumerate(self.variant_ids)
+        }
+        self.variant_prices = [price for _, _, price in variants]
+
+        self.product_ids = []
+        self.product_positions = {}
+        self.product_prices = []
+        self.variant_products = []
+        for _, product_id, price in variants:
+            product_id = str(product_id)
+            position = self.product_positions.get(product_id)
+            if position is None:
+                position = len(self.product_ids)
+                self.product_positions[product_id] = position
+                self.product_ids.append(product_id)
+                self.product_prices.append(price)
+            elif price is not None and (
+                self.product_prices[position] is None
+                or price < self.product_prices[position]
+            ):
+                self.product_prices[position] = price
+            self.variant_products.append(position)
+
+        variant_positions = {}
+        product_positions = {}
+        self.value_options = {}
+        for variant_id, value_id, option_id in (
+            VariantOptionValue.objects.order_by()
+            .filter(product_option_value__deleted__isnull=True)
+            .values_list(
+                "variant_id",
+                "product_option_value_id",
+                "product_option_value__product_option_id",
+            )
+        ):
+            position = self.variant_positions.get(str(variant_id))
+            if position is None:
+                continue
+            value_id = str(value_id)
+            self.value_options[value_id] = str(option_id)
+            variant_positions.setdefault(value_id, []).append(position)
+            product_positions.setdefault(value_id, []).append(
+                self.variant_products[position]
+            )
+
+        self.variant_bitmaps = {
+            value_id: to_bitmap(positions, len(self.variant_ids))
+            for value_id, positions in variant_positions.items()
+        }
+        self.product_bitmaps = {
+            value_id: to_bitmap(positions, len(self.product_ids))
+            for value_id, positions in product_positions.items()
+        }
+
+    def get_translations(self, language_code):
+        if language_code not in self.translations:
+            self.translations[language_code] = (
+                dict(
+                    (str(option_id), name)
+                    for option_id, name in ProductOptionTrans.objects.filter(
+                        language_code=language_code
+                    ).values_list("product_option_id", "name")
+                ),
+                dict(
+                    (str(value_id), name)
+                    for value_id, name in ProductOptionValueTrans.objects.filter(
+                        language_code=language_code
+                    ).values_list("product_option_value_id", "name")
+                ),
+            )
+
+        return self.translations[language_code]
+
+    def match(self, value_ids, level="variant"):
+        bitmaps = self.variant_bitmaps if level == "variant" else self.product_bitmaps
+        ids = self.variant_ids if level == "variant" else self.product_ids
+
+        options = {}
+        for value_id in value_ids:
+            option_id = self.value_options.get(str(value_id))
+            options[option_id] = options.get(option_id, 0) | bitmaps.get(
+                str(value_id), 0
+            )
+
+        result = None
+        for bitmap in options.values():
+            result = bitmap if result is None else result & bitmap
+
+        return [ids[position] for position in iter_bitmap(result or 0)]
+
+    def count(self, result_ids, language_code, price_boundaries=None, level="variant"):
+        if level == "variant":
+            positions_map, bitmaps = self.variant_positions, self.variant_bitmaps
+            prices, size = self.variant_prices, len(self.variant_ids)
+        else:
+            positions_map, bitmaps = self.product_positions, self.product_bitmaps
+            prices, size = self.product_prices, len(self.product_ids)
+
+        positions = [
+            positions_map[str(id)] for id in result_ids if str(id) in positions_map
+        ]
+        result = to_bitmap(positions, size)
+        option_names, value_names = self.get_translations(language_code)
+
+        merged = {}
+        for value_id, bitmap in bitmaps.items():
+            matched = bitmap & result
+            if not matched:
+                continue
+            key = (
+                option_names.get(self.value_options[value_id]),
+                value_names.get(value_id),
+            )
+            entry = merged.setdefault(key, [0, []])
+            entry[0] |= matched
+            entry[1].append(value_id)
+
+        groups = {}
+        for (option_name, value_name), (bitmap, value_ids) in merged.items():
+            groups.setdefault(option_name, []).append(
+                {"name": value_name, "count": bitmap.bit_count(), "ids": value_ids}
+            )
+        options = [
+            {"name": option_name, "values": values}
+            for option_name, values in groups.items()
+        ]
+
+        return {
+            "options": options,
+            "prices": self.count_prices(
+                [prices[position] for position in positions], price_boundaries
+            ),
+        }
+
+    @staticmethod
+    def count_prices(prices, boundaries=None):
+        prices = [price for price in prices if price is not None]
+        if not prices:
+            return []
+
+        if not boundaries:
+            buckets = getattr(settings, "PRODUCT_FACET_PRICE_BUCKETS", 5)
+            low, high = min(prices), max(prices)
+            step = (high - low) / buckets
+            if not step:
+                return [{"min": low, "max": high, "count": len(prices)}]
+            boundaries = [low + step * index for index in range(1, buckets)]
+        boundaries = sorted(boundaries)
+
+        counts = [0] * (len(boundaries) + 1)
+        for price in prices:
+            index = 0
+            while index < len(boundaries) and price >= boundaries[index]:
+                index += 1
+            counts[index] += 1
+
+        edges = [None, *boundaries, None]
+        return [
+            {"min": edges[index], "max": edges[index + 1], "count": count}
+            for index, count in enumerate(counts)
+        ]
+
+
+class FacetHelper:
+    _indexes = {}
+    _lock = threading.Lock()
+
+    def get_index(self):
+        key = getattr(connection, "schema_name", "public")
+        timeout = getattr(settings, "PRODUCT_FACET_INDEX_TIMEOUT", 60)
+
+        index = self._indexes.get(key)
+        if index is None or time.monotonic() - index.built_at > timeout:
+            with self._lock:
+                index = self._indexes.get(key)
+                if index is None or time.monotonic() - index.built_at > timeout:
+                    index = FacetIndex()
+                    self._indexes[key] = index
+
+        return index
+
+    @classmethod
+    def clear(cls, schema_name=None):
+        if schema_name is None:
+            cls._indexes.clear()
+        else:
+            cls._indexes.pop(schema_name, None)
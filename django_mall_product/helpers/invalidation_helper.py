@@ -0,0 +1,185 @@
+import datetime
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from django_mall_product.helpers.catalog_helper import CatalogHelper
+from django_mall_product.helpers.count_helper import CountHelper
+from django_mall_product.helpers.facet_helper import FacetHelper
+from django_mall_product.helpers.slug_helper import SlugHelper
+from django_mall_product.models import CacheInvalidation, Product, Variant
+
+
+class DatabaseTransport:
+    def __init__(self):
+        self.batch_size = getattr(settings, "PRODUCT_INVALIDATION_BATCH_SIZE", 1000)
+        self.lag = getattr(settings, "PRODUCT_INVALIDATION_POLL_LAG", 30)
+
+    def publish(self, messages):
+        CacheInvalidation.objects.bulk_create(
+            [CacheInvalidation(entity=entity, ids=ids) for entity, ids in messages]
+        )
+
+    def get_since(self):
+        return timezone.now() - datetime.timedelta(seconds=self.lag)
+
+    def get_cursor(self):
+        last_id = (
+            CacheInvalidation.objects.order_by("-id")
+            .values_list("id", flat=True)
+            .first()
+            or 0
+        )
+
+        return last_id, dict(
+            CacheInvalidation.objects.filter(
+                created_at__gte=self.get_since()
+            ).values_list("id", "created_at")
+        )
+
+    def poll(self, cursor):
+        # Ids are assigned before commit, so a row can become visible after a
+        # higher id was read. Re-read the lag window and skip the ids we saw.
+        last_id, seen = cursor
+        since = self.get_since()
+        rows = list(
+            CacheInvalidation.objects.filter(
+                Q(id__gt=last_id) | Q(created_at__gte=since)
+            )
+            .exclude(id__in=list(seen))
+            .order_by("id")
+            .values_list("id", "created_at", "entity", "ids")[: self.batch_size]
+        )
+
+        seen = {
+            id: created_at for id, created_at in seen.items() if created_at >= since
+        }
+        seen.update((id, created_at) for id, created_at, _, _ in rows)
+        if rows:
+            last_id = max(last_id, rows[-1][0])
+
+        return (last_id, seen), [(entity, ids) for _, _, entity, ids in rows]
+
+    def prune(self, before):
+        return CacheInvalidation.objects.filter(created_at__lt=before).delete()[0]
+
+
+class LocalTransport:
+    messages = {}
+    lock = threading.Lock()
+
+    def get_queue(self):
+        return self.messages.setdefault(
+            getattr(connection, "schema_name", "public"), []
+        )
+
+    def publish(self, messages):
+        with self.lock:
+            self.get_queue().extend(messages)
+
+    def get_cursor(self):
+        with self.lock:
+            return len(self.get_queue())
+
+    def poll(self, cursor):
+        with self.lock:
+            queue = self.get_queue()
+
+            return len(queue), queue[cursor:]
+
+    def prune(self, before):
+        return 0
+
+
+def clear_facets(ids):
+    FacetHelper.clear(getattr(connection, "schema_name", "public"))
+
+
+def refresh_catalog(ids):
+    CatalogHelper.refresh(ids)
+
+
+def invalidate_counts(ids):
+    CountHelper().invalidate()
+
+
+def delete_product_slugs(slugs):
+    SlugHelper().delete(Product, slugs)
+
+
+def delete_variant_slugs(slugs):
+    SlugHelper().delete(Variant, slugs)
+
+
+class InvalidationHelper:
+    subscribers = {
+        "product": [clear_facets, invalidate_counts, refresh_catalog],
+        "product_slug": [delete_product_slugs],
+        "variant_slug": [delete_variant_slugs],
+    }
+    cursors = {}
+    polled_at = {}
+    lock = threading.Lock()
+
+    def __init__(self):
+        self.transport = import_string(
+            getattr(
+                settings,
+                "PRODUCT_INVALIDATION_TRANSPORT",
+                "django_mall_product.helpers.invalidation_helper.DatabaseTransport",
+            )
+        )()
+        self.interval = getattr(settings, "PRODUCT_INVALIDATION_POLL_INTERVAL", 1)
+
+    @classmethod
+    def subscribe(cls, entity, callback):
+        cls.subscribers.setdefault(entity, []).append(callback)
+
+    def publish(self, entity, ids):
+        ids = [str(id) for id in ids if id is not None]
+        if not ids:
+            return
+
+        transaction.on_commit(lambda: self.transport.publish([(entity, ids)]))
+        transaction.on_commit(lambda: self.dispatch([(entity, ids)]))
+
+    def dispatch(self, messages):
+        for entity, ids in messages:
+            for callback in self.subscribers.get(entity, []):
+                callback(ids)
+
+    def poll(self):
+        schema_name = getattr(connection, "schema_name", "public")
+        now = time.monotonic()
+        if now - self.polled_at.get(schema_name, 0) < self.interval:
+            return 0
+
+        with self.lock:
+            if now - self.polled_at.get(schema_name, 0) < self.interval:
+                return 0
+            self.polled_at[schema_name] = now
+
+            cursor = self.cursors.get(schema_name)
+            if cursor is None:
+                self.cursors[schema_name] = self.transport.get_cursor()
+                return 0
+
+            cursor, messages = self.transport.poll(cursor)
+            self.cursors[schema_name] = cursor
+
+        self.dispatch(messages)
+
+        return len(messages)
+
+    def prune(self):
+        return self.transport.prune(
+            timezone.now()
+            - datetime.timedelta(
+                seconds=getattr(settings, "PRODUCT_INVALIDATION_RETENTION", 3600)
+            )
+        )
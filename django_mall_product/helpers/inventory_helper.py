@@ -0,0 +1,215 @@
+import datetime
+import uuid
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, PositiveIntegerField, Q, Value, When
+from django.utils import timezone
+
+from django_mall_product.models import StockReservation, VariantStock
+
+
+class InsufficientStockError(ValidationError):
+    def __init__(self, variant_ids):
+        super().__init__(
+            "The stock is insufficient! "
+            + ", ".join(str(variant_id) for variant_id in variant_ids)
+        )
+        self.variant_ids = variant_ids
+
+
+class InventoryHelper:
+    def __init__(self):
+        self.warehouse = getattr(settings, "PRODUCT_DEFAULT_WAREHOUSE", "default")
+        self.ttl = getattr(settings, "PRODUCT_RESERVATION_TTL", 900)
+        self.batch_size = getattr(settings, "PRODUCT_RESERVATION_SWEEP_BATCH_SIZE", 500)
+
+    def group(self, items):
+        grouped = {}
+        for variant_id, quantity, warehouse in items:
+            quantities = grouped.setdefault(warehouse or self.warehouse, {})
+            quantities[str(variant_id)] = quantities.get(str(variant_id), 0) + quantity
+
+        return grouped
+
+    def by_variant(self, quantities):
+        return Case(
+            *[
+                When(variant_id=variant_id, then=Value(quantity))
+                for variant_id, quantity in quantities.items()
+            ],
+            default=Value(0),
+            output_field=PositiveIntegerField(),
+        )
+
+    def get_available(self, variant_ids, warehouse=None):
+        return {
+            str(variant_id): available
+            for variant_id, available in VariantStock.objects.filter(
+                variant_id__in=variant_ids, warehouse=warehouse or self.warehouse
+            )
+            .annotate(available=F("quantity_on_hand") - F("quantity_reserved"))
+            .values_list("variant_id", "available")
+        }
+
+    @transaction.atomic
+    def set_on_hand(self, variant_id, quantity, warehouse=None):
+        warehouse = warehouse or self.warehouse
+
+        stock = (
+            VariantStock.objects.select_for_update()
+            .filter(variant_id=variant_id, warehouse=warehouse)
+            .first()
+        )
+        if stock is None:
+            try:
+                with transaction.atomic():
+                    VariantStock.objects.create(
+                        variant_id=variant_id,
+                        warehouse=warehouse,
+                        quantity_on_hand=quantity,
+                    )
+                return
+            except IntegrityError:
+                stock = VariantStock.objects.select_for_update().get(
+                    variant_id=variant_id, warehouse=warehouse
+                )
+
+        if quantity < stock.quantity_reserved:
+            raise ValidationError(
+                "The quantityOnHand must not be less than the reserved quantity! "
+                + str(stock.quantity_reserved)
+            )
+
+        stock.quantity_on_hand = quantity
+        stock.save(update_fields=["quantity_on_hand", "updated_at"])
+
+    def lock(self, quantities, warehouse):
+        # Rows are locked in variant order before the multi-row UPDATE so
+        # concurrent reservations of overlapping carts cannot deadlock.
+        return list(
+            VariantStock.objects.select_for_update()
+            .filter(variant_id__in=sorted(quantities), warehouse=warehouse)
+            .order_by("variant_id")
+            .values_list("pk", flat=True)
+        )
+
+    def reserve(self, items):
+        key = uuid.uuid4()
+        now = timezone.now()
+        expires_at = now + datetime.timedelta(seconds=self.ttl)
+        grouped = self.group(items)
+
+        try:
+            with transaction.atomic():
+                for warehouse, quantities in sorted(grouped.items()):
+                    self.lock(quantities, warehouse)
+
+                    condition = Q()
+                    for variant_id, quantity in quantities.items():
+                        condition |= Q(
+                            variant_id=variant_id,
+                            quantity_on_hand__gte=F("quantity_reserved") + quantity,
+                        )
+
+                    count = VariantStock.objects.filter(
+                        condition, warehouse=warehouse
+                    ).update(
+                        quantity_reserved=F("quantity_reserved")
+                        + self.by_variant(quantities),
+                        updated_at=now,
+                    )
+                    if count != len(quantities):
+                        raise InsufficientStockError([])
+
+                StockReservation.objects.bulk_create(
+                    [
+                        StockReservation(
+                            key=key,
+                            variant_id=variant_id,
+                            warehouse=warehouse,
+                            quantity=quantity,
+                            expires_at=expires_at,
+                        )
+                        for warehouse, quantities in grouped.items()
+                        for variant_id, quantity in quantities.items()
+                    ]
+                )
+        except InsufficientStockError:
+            variant_ids = []
+            for warehouse, quantities in grouped.items():
+                available = self.get_available(quantities.keys(), warehouse)
+                variant_ids.extend(
+                    variant_id
+                    for variant_id, quantity in quantities.items()
+                    if available.get(variant_id, 0) < quantity
+                )
+            raise InsufficientStockError(variant_ids)
+
+        return key, expires_at
+
+    def settle(self, reservations, consume=False):
+        if not reservations:
+            return 0
+
+        now = timezone.now()
+        grouped = self.group(
+            (reservation.variant_id, reservation.quantity, reservation.warehouse)
+            for reservation in reservations
+        )
+        for warehouse, quantities in sorted(grouped.items()):
+            self.lock(quantities, warehouse)
+            fields = {
+                "quantity_reserved": F("quantity_reserved")
+                - self.by_variant(quantities),
+                "updated_at": now,
+            }
+            if consume:
+                fields["quantity_on_hand"] = F("quantity_on_hand") - self.by_variant(
+                    quantities
+                )
+
+            VariantStock.objects.filter(
+                variant_id__in=quantities.keys(), warehouse=warehouse
+            ).update(**fields)
+
+        StockReservation.objects.filter(
+            pk__in=[reservation.pk for reservation in reservations]
+        ).delete()
+
+        return len(reservations)
+
+    @transaction.atomic
+    def release(self, key):
+        return self.settle(
+            list(StockReservation.objects.select_for_update().filter(key=key))
+        )
+
+    @transaction.atomic
+    def commit(self, key):
+        reservations = list(
+            StockReservation.objects.select_for_update().filter(
+                key=key, expires_at__gt=timezone.now()
+            )
+        )
+        if not reservations:
+            raise ValidationError("The reservation is expired!")
+
+        return self.settle(reservations, consume=True)
+
+    def sweep(self):
+        count = 0
+        while True:
+            with transaction.atomic():
+                reservations = list(
+                    StockReservation.objects.select_for_update(skip_locked=True)
+                    .filter(expires_at__lte=timezone.now())
+                    .order_by("expires_at")[: self.batch_size]
+                )
+                if not reservations:
+                    break
+
+                count += self.settle(reservations)
+
+        return count
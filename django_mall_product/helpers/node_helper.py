@@ -0,0 +1,40 @@
+from django.conf import settings
+from graphql_relay import from_global_id
+
+
+class NodeHelper:
+    def __init__(self, node, is_visible=None):
+        self.node = node
+        self.is_visible = is_visible or (lambda instance: True)
+        self.limit = getattr(settings, "PRODUCT_NODES_BY_IDS_LIMIT", 100)
+
+    def parse_id(self, id):
+        try:
+            _type, pk = from_global_id(id)
+            pk = str(self.node._meta.model._meta.pk.to_python(pk))
+        except Exception:
+            return None
+
+        if _type != self.node._meta.name:
+            return None
+
+        return pk
+
+    def get_nodes(self, ids, info):
+        if len(ids) > self.limit:
+            raise Exception("The length of the ids is invalid!")
+
+        pks = [self.parse_id(id) for id in ids]
+        keys = {pk for pk in pks if pk}
+        if not keys:
+            return [None] * len(pks)
+
+        instances = {
+            str(instance.pk): instance
+            for instance in self.node.get_queryset(
+                self.node._meta.model.objects.filter(pk__in=keys), info
+            )
+            if self.is_visible(instance)
+        }
+
+        return [instances.get(pk) if pk else None for pk in pks]
@@ -0,0 +1,58 @@
+import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from django_mall_product.models import ProductPopularity, ProductStat
+
+
+class PopularityHelper:
+    def __init__(self):
+        self.half_life = datetime.timedelta(
+            hours=getattr(settings, "PRODUCT_TRENDING_HALF_LIFE_HOURS", 72)
+        )
+        self.weights = getattr(
+            settings,
+            "PRODUCT_TRENDING_WEIGHTS",
+            {"count_access": 1.0, "count_add_to_cart": 5.0},
+        )
+        self.window = self.half_life * getattr(
+            settings, "PRODUCT_TRENDING_WINDOW_HALF_LIVES", 5
+        )
+
+    def compute(self, now=None):
+        now = now or timezone.now()
+        since = now - self.window
+
+        fields = list(self.weights)
+        rows = ProductStat.objects.filter(
+            granularity="hour", variant__isnull=True, period_start__gte=since
+        ).values_list("product_id", "period_start", *fields)
+
+        decay = {}
+        scores = {}
+        for product_id, period_start, *counts in rows.iterator():
+            if period_start not in decay:
+                decay[period_start] = 0.5 ** ((now - period_start) / self.half_life)
+            score = decay[period_start] * sum(
+                self.weights[field] * count for field, count in zip(fields, counts)
+            )
+            scores[product_id] = scores.get(product_id, 0.0) + score
+
+        with transaction.atomic():
+            ProductPopularity.objects.exclude(product_id__in=scores.keys()).update(
+                score=0
+            )
+            ProductPopularity.objects.bulk_create(
+                [
+                    ProductPopularity(product_id=product_id, score=score)
+                    for product_id, score in scores.items()
+                ],
+                batch_size=1000,
+                update_conflicts=True,
+                unique_fields=["product"],
+                update_fields=["score", "updated_at"],
+            )
+
+        return len(scores)
@@ -0,0 +1,149 @@
+from decimal import Decimal
+import datetime
+
+from django.conf import settings
+from django.core import signing
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+from django_mall_product.models import Variant
+
+
+class PriceQuoteHelper:
+    salt = "django_mall_product.price_quote"
+
+    def __init__(self):
+        self.max_age = getattr(settings, "PRODUCT_PRICE_QUOTE_MAX_AGE", 900)
+        self.exponent = Decimal(1).scaleb(-settings.DEFAULT_DECIMAL_PLACES)
+
+    def get_prices(self, variant_ids):
+        today = datetime.date.today()
+
+        return {
+            str(id): (currency, price_amount, price_sale_amount)
+            for id, currency, price_amount, price_sale_amount in Variant.objects.filter(
+                Q(published_at__lte=today) | Q(published_at__isnull=True),
+                Q(product__published_at__lte=today)
+                | Q(product__published_at__isnull=True),
+                pk__in=variant_ids,
+                is_published=True,
+                product__is_published=True,
+            ).values_list("id", "currency", "price_amount", "price_sale_amount")
+        }
+
+    def quote(self, items):
+        prices = self.get_prices({variant_id for variant_id, _ in items})
+
+        lines = []
+        currencies = set()
+        total = Decimal(0)
+        for variant_id, quantity in items:
+            currency, price_amount, price_sale_amount = prices.get(
+                variant_id, (None, None, None)
+            )
+            unit_amount = (
+                price_sale_amount if price_sale_amount is not None else price_amount
+            )
+            if unit_amount is None:
+                lines.append(
+                    {
+                        "variant_id": variant_id,
+                        "quantity": quantity,
+                        "currency": currency,
+                        "price_amount": price_amount,
+                        "price_sale_amount": price_sale_amount,
+                        "unit_amount": None,
+                        "total_amount": None,
+                        "is_available": False,
+                    }
+                )
+                continue
+
+            total_amount = (unit_amount * quantity).quantize(self.exponent)
+            currencies.add(currency)
+            total += total_amount
+            lines.append(
+                {
+                    "variant_id": variant_id,
+                    "quantity": quantity,
+                    "currency": currency,
+                    "price_amount": price_amount,
+                    "price_sale_amount": price_sale_amount,
+                    "unit_amount": unit_amount,
+                    "total_amount": total_amount,
+                    "is_available": True,
+                }
+            )
+
+        if len(currencies) > 1:
+            raise Exception("The currencies of the variants are inconsistent!")
+
+        currency = currencies.pop() if currencies else settings.DEFAULT_CURRENCY_CODE
+        quoted_at = timezone.now()
+
+        return {
+            "lines": lines,
+            "currency": currency,
+            "total_amount": total,
+            "is_available": all(line["is_available"] for line in lines),
+            "quoted_at": quoted_at,
+            "expires_at": quoted_at + datetime.timedelta(seconds=self.max_age),
+            "token": self.sign(lines, currency, total, quoted_at),
+        }
+
+    def sign(self, lines, currency, total, quoted_at):
+        return signing.dumps(
+            {
+                "schema": getattr(connection, "schema_name", "public"),
+                "lines": [
+                    [
+                        line["variant_id"],
+                        line["quantity"],
+                        (
+                            str(line["unit_amount"])
+                            if line["unit_amount"] is not None
+                            else None
+                        ),
+                        line["is_available"],
+                    ]
+                    for line in lines
+                ],
+                "currency": currency,
+                "total": str(total),
+                "is_available": all(line["is_available"] for line in lines),
+                "quoted_at": quoted_at.isoformat(),
+            },
+            salt=self.salt,
+            compress=True,
+        )
+
+    def load(self, token):
+        try:
+            payload = signing.loads(token, salt=self.salt, max_age=self.max_age)
+        except signing.SignatureExpired:
+            raise Exception("The price quote is expired!")
+        except signing.BadSignature:
+            raise Exception("The price quote is invalid!")
+
+        if payload["schema"] != getattr(connection, "schema_name", "public"):
+            raise Exception("The price quote is invalid!")
+        if not payload.get("is_available") or not all(
+            len(line) == 4 and line[3] for line in payload["lines"]
+        ):
+            raise Exception("The price quote has unavailable variants!")
+
+        return {
+            "lines": [
+                {
+                    "variant_id": variant_id,
+                    "quantity": quantity,
+                    "unit_amount": Decimal(unit_amount),
+                    "is_available": is_available,
+                }
+                for variant_id, quantity, unit_amount, is_available in payload["lines"]
+            ],
+            "currency": payload["currency"],
+            "total_amount": Decimal(payload["total"]),
+            "quoted_at": datetime.datetime.fromisoformat(payload["quoted_at"]),
+        }
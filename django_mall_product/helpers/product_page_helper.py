@@ -0,0 +1,194 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from graphql_relay import to_global_id
+
+from django_mall_product.models import (
+    Product,
+    ProductPage,
+    prefetch_selected_option_values,
+)
+from django_mall_product.routers import read_from_replica
+
+
+class ProductPageHelper:
+    def get_language_codes(self):
+        return [language_code for language_code, _ in settings.LANGUAGES]
+
+    def get_queryset(self, product_ids):
+        return Product.objects.filter(pk__in=product_ids).prefetch_related(
+            "translations",
+            "productoption_set__translations",
+            "productoption_set__productoptionvalue_set__translations",
+            "variant_set",
+            prefetch_selected_option_values("variant_set__selected_option_values"),
+        )
+
+    def rebuild(self, product_ids, language_codes=None):
+        product_ids = [str(product_id) for product_id in product_ids]
+        language_codes = language_codes or self.get_language_codes()
+
+        pages = []
+        found = set()
+        for product in self.get_queryset(product_ids):
+            found.add(str(product.id))
+            for language_code in language_codes:
+                pages.append(
+                    ProductPage(
+                        product=product,
+                        slug=product.slug,
+                        language_code=language_code,
+                        payload=self.build_payload(product, language_code),
+                    )
+                )
+
+        missing = set(product_ids) - found
+        if missing:
+            ProductPage.objects.filter(product_id__in=missing).delete()
+        if pages:
+            ProductPage.objects.bulk_create(
+                pages,
+                update_conflicts=True,
+                unique_fields=["product", "language_code"],
+                update_fields=["slug", "payload", "updated_at"],
+            )
+
+    def delete(self, product_ids):
+        ProductPage.objects.filter(product_id__in=product_ids).delete()
+
+    def get_page(self, slug, language_code):
+        return (
+            ProductPage.objects.filter(slug=slug, language_code=language_code)
+            .values_list("payload", flat=True)
+            .first()
+        )
+
+    def get_payload(self, slug, language_code):
+        if language_code not in self.get_language_codes():
+            raise ValidationError("The languageCode is invalid!")
+
+        payload = self.get_page(slug, language_code)
+        if payload is None:
+            # Build lazily on the primary, so the page just written is read
+            # back from where it was written.
+            with read_from_replica(False):
+                product_id = (
+                    Product.objects.filter(slug=slug)
+                    .values_list("id", flat=True)
+                    .first()
+                )
+                if product_id is None:
+                    return None
+
+                self.rebuild([product_id], [language_code])
+                payload = self.get_page(slug, language_code)
+            if payload is None:
+                return None
+
+        if not self.is_visible(payload):
+            return None
+
+        payload["availability"] = {
+            variant["id"]: self.is_visible(variant) for variant in payload["variants"]
+        }
+        payload["variants"] = [
+            variant
+            for variant in payload["variants"]
+            if payload["availability"][variant["id"]]
+        ]
+
+        return payload
+
+    def build_payload(self, product, language_code):
+        translation = self.get_translation(product, language_code)
+
+        options = []
+        for option in product.productoption_set.all():
+            option_translation = self.get_translation(option, language_code)
+
+            values = []
+            for value in option.productoptionvalue_set.all():
+                value_translation = self.get_translation(value, language_code)
+                values.append(
+                    {
+                        "id": to_global_id("ProductOptionValueNode", value.id),
+                        "name": value_translation.name if value_translation else None,
+                    }
+                )
+
+            options.append(
+                {
+                    "id": to_global_id("ProductOptionNode", option.id),
+                    "name": option_translation.name if option_translation else None,
+                    "values": values,
+                }
+            )
+
+        variants = []
+        matrix = {}
+        for variant in product.variant_set.all():
+            variant_id = to_global_id("VariantNode", variant.id)
+            option_value_ids = sorted(
+                to_global_id("ProductOptionValueNode", value.id)
+                for value in variant.get_selected_option_values()
+            )
+            variants.append(
+                {
+                    "id": variant_id,
+                    "slug": variant.slug,
+                    "optionValueIds": option_value_ids,
+                    "price": self.serialize_money(variant.price),
+                    "priceSale": self.serialize_money(variant.price_sale),
+                    "isPrimary": variant.is_primary,
+                    "isPublished": variant.is_published,
+                    "publishedAt": self.serialize_datetime(variant.published_at),
+                }
+            )
+            if option_value_ids:
+                matrix["|".join(option_value_ids)] = variant_id
+
+        return {
+            "id": to_global_id("ProductNode", product.id),
+            "slug": product.slug,
+            "serial": product.serial,
+            "languageCode": language_code,
+            "name": translation.name if translation else None,
+            "description": getattr(translation, "description", None),
+            "summary": getattr(translation, "summary", None),
+            "content": getattr(translation, "content", None),
+            "isPublished": product.is_published,
+            "publishedAt": self.serialize_datetime(product.published_at),
+            "options": options,
+            "variants": variants,
+            "matrix": matrix,
+        }
+
+    @staticmethod
+    def get_translation(instance, language_code):
+        for translation in instance.translations.all():
+            if translation.language_code == language_code:
+                return translation
+
+        return None
+
+    @staticmethod
+    def is_visible(data):
+        if not data["isPublished"]:
+            return False
+        if data["publishedAt"] is None:
+            return True
+
+        return parse_datetime(data["publishedAt"]) <= timezone.now()
+
+    @staticmethod
+    def serialize_money(money):
+        if money is None or money.amount is None:
+            return None
+
+        return {"amount": str(money.amount), "currency": money.currency}
+
+    @staticmethod
+    def serialize_datetime(value):
+        return value.isoformat() if value else None
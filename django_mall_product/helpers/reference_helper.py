@@ -0,0 +1,101 @@
+from graphql_relay import from_global_id
+
+
+class ReferenceLookupError(Exception):
+    def __init__(self, message, ids):
+        super().__init__(message)
+        self.ids = ids
+
+
+class InvalidReferenceError(ReferenceLookupError):
+    def __init__(self, ids):
+        super().__init__(
+            "The ids are invalid! " + format_ids(ids),
+            ids,
+        )
+
+
+class MissingReferenceError(ReferenceLookupError):
+    def __init__(self, ids):
+        super().__init__(
+            "Can not find some references! " + format_ids(ids),
+            ids,
+        )
+
+
+def format_ids(ids):
+    return "; ".join(
+        "{}: {}".format(name, ", ".join(values)) for name, values in ids.items()
+    )
+
+
+class ReferenceHelper:
+    def __init__(self):
+        self.references = []
+
+    def add(self, name, value, model, type_name=None, fields=("id",)):
+        self.references.append(
+            (name, [value] if value else [], model, type_name, fields, False)
+        )
+
+        return self
+
+    def add_many(self, name, values, model, type_name=None, fields=("id",)):
+        self.references.append(
+            (name, list(values or []), model, type_name, fields, True)
+        )
+
+        return self
+
+    def resolve(self):
+        invalid = {}
+        decoded = []
+        requests = {}
+        for name, values, model, type_name, fields, many in self.references:
+            pks = []
+            for value in values:
+                try:
+                    _type, pk = from_global_id(value)
+                    pk = str(model._meta.pk.to_python(pk))
+                except Exception:
+                    _type, pk = None, None
+                if not pk or (type_name and _type != type_name):
+                    invalid.setdefault(name, []).append(value)
+                    continue
+                pks.append(pk)
+
+            decoded.append((name, values, pks, model, many))
+            request = requests.setdefault(model, [set(), {"id"}])
+            request[0].update(pks)
+            request[1].update(fields)
+
+        if invalid:
+            raise InvalidReferenceError(invalid)
+
+        instances = {}
+        for model, (pks, fields) in requests.items():
+            if pks:
+                instances[model] = {
+                    str(instance.pk): instance
+                    for instance in model.objects.filter(pk__in=pks).only(*fields)
+                }
+            else:
+                instances[model] = {}
+
+        missing = {}
+        result = {}
+        for name, values, pks, model, many in decoded:
+            found = []
+            for value, pk in zip(values, pks):
+                instance = instances[model].get(pk)
+                if instance is None:
+                    missing.setdefault(name, []).append(value)
+                else:
+                    found.append(instance)
+
+            result[name] = found if many else (found[0] if found else None)
+
+        if missing:
+            raise MissingReferenceError(missing)
+
+        return result
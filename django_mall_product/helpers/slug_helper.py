@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+
+from django_mall_product.models import Product, Variant
+
+
+class SlugHelper:
+    scopes = {
+        Product: (),
+        Variant: ("product_id",),
+    }
+
+    def __init__(self):
+        self.cache = caches[getattr(settings, "PRODUCT_SLUG_CACHE", "default")]
+        self.timeout = getattr(settings, "PRODUCT_SLUG_CACHE_TIMEOUT", None)
+        self.miss_timeout = getattr(settings, "PRODUCT_SLUG_CACHE_MISS_TIMEOUT", 30)
+        self.max_rows = getattr(settings, "PRODUCT_SLUG_CACHE_MAX_ROWS", 10)
+
+    def get_cache_key(self, model, slug):
+        return "product:slugs:{}:{}:{}".format(
+            getattr(connection, "schema_name", "public"),
+            model._meta.model_name,
+            slug,
+        )
+
+    def get_rows(self, model, slug):
+        key = self.get_cache_key(model, slug)
+        rows = self.cache.get(key)
+        if rows is None:
+            rows = [
+                [str(value) for value in row]
+                for row in model.objects.filter(slug=slug)
+                .order_by("pk")
+                .values_list("id", *self.scopes[model])[: self.max_rows]
+            ]
+            self.cache.set(key, rows, self.timeout if rows else self.miss_timeout)
+
+        return rows
+
+    def get_id(self, model, slug, **scope):
+        if not slug:
+            return None
+
+        rows = self.get_rows(model, slug)
+        for index, name in enumerate(self.scopes[model], 1):
+            if scope.get(name) is not None:
+                rows = [row for row in rows if row[index] == str(scope[name])]
+
+        # Ambiguous slugs resolve to nothing rather than an arbitrary row.
+        if len(rows) != 1:
+            return None
+
+        return rows[0][0]
+
+    def get_product_id(self, slug):
+        return self.get_id(Product, slug)
+
+    def get_variant_id(self, slug, product_id=None):
+        return self.get_id(Variant, slug, product_id=product_id)
+
+    def set(self, model, slug, id):
+        key = self.get_cache_key(model, slug)
+        if self.scopes[model]:
+            self.cache.delete(key)
+        else:
+            self.cache.set(key, [[str(id)]], self.timeout)
+
+    def delete(self, model, slugs):
+        self.cache.delete_many([self.get_cache_key(model, slug) for slug in slugs])
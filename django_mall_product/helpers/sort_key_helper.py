@@ -0,0 +1,116 @@
+from django.conf import settings
+from django.db.models import F
+
+from django_mall_product.models import Product, ProductOption, ProductOptionValue
+
+
+class SortKeyHelper:
+    min_key = -2147483648
+    max_key = 2147483647
+    scopes = {
+        Product: None,
+        ProductOption: "product_id",
+        ProductOptionValue: "product_option_id",
+    }
+
+    def __init__(self):
+        self.gap = getattr(settings, "PRODUCT_SORT_KEY_GAP", 1024)
+        self.batch_size = getattr(settings, "PRODUCT_SORT_KEY_BATCH_SIZE", 1000)
+
+    def get_siblings(self, item):
+        model = item.__class__
+        scope = self.scopes[model]
+        if scope is None:
+            return model.objects.all()
+
+        return model.objects.filter(**{scope: getattr(item, scope)})
+
+    def order(self, queryset):
+        return queryset.order_by(
+            F("sort_key").asc(nulls_last=True),
+            *[
+                field
+                for field in queryset.model._meta.ordering
+                if field.lstrip("-") != "sort_key"
+            ],
+            "pk",
+        )
+
+    def rebalance(self, queryset):
+        items = list(self.order(queryset.select_for_update()).only("id", "sort_key"))
+
+        changed = []
+        for index, item in enumerate(items):
+            sort_key = (index + 1) * self.gap
+            if item.sort_key != sort_key:
+                item.sort_key = sort_key
+                changed.append(item)
+
+        if changed:
+            queryset.model.objects.bulk_update(
+                changed, ["sort_key"], batch_size=self.batch_size
+            )
+
+        return [item.id for item in changed]
+
+    def get_sort_key(self, siblings, after):
+        if after is None:
+            upper = (
+                siblings.filter(sort_key__isnull=False)
+                .order_by("sort_key")
+                .values_list("sort_key", flat=True)
+                .first()
+            )
+            if upper is None:
+                return self.gap
+            if upper - self.gap < self.min_key:
+                return None
+
+            return upper - self.gap
+
+        lower = siblings.filter(pk=after.pk).values_list("sort_key", flat=True).first()
+        if lower is None or siblings.filter(sort_key=lower).count() > 1:
+            return None
+
+        upper = (
+            siblings.filter(sort_key__gt=lower)
+            .order_by("sort_key")
+            .values_list("sort_key", flat=True)
+            .first()
+        )
+        if upper is None:
+            if lower + self.gap > self.max_key:
+                return None
+
+            return lower + self.gap
+        if upper - lower < 2:
+            return None
+
+        return (lower + upper) // 2
+
+    def move(self, item, after=None):
+        siblings = self.get_siblings(item).exclude(pk=item.pk)
+
+        changed = []
+        sort_key = self.get_sort_key(siblings, after)
+        if sort_key is None:
+            changed = self.rebalance(siblings)
+            sort_key = self.get_sort_key(siblings, after)
+
+        item.__class__.objects.filter(pk=item.pk).update(sort_key=sort_key)
+        item.sort_key = sort_key
+
+        return changed + [item.id]
+
+    def rebalance_all(self, model):
+        scope = self.scopes[model]
+        if scope is None:
+            return len(self.rebalance(model.objects.all()))
+
+        count = 0
+        for parent_id in (
+            model.objects.order_by().values_list(scope, flat=True).distinct()
+        ):
+            count += len(self.rebalance(model.objects.filter(**{scope: parent_id})))
+
+        return count
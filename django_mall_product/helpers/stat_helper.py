@@ -0,0 +1,214 @@
+import datetime
+import uuid
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connections, router, transaction
+from django.db.models import Case, Count, F, Q, Sum, Value, When
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+
+from django_mall_product.models import Product, ProductEvent, ProductStat, Variant
+
+
+class StatHelper:
+    fields = ("count_access", "count_add_to_cart")
+    truncs = (("hour", TruncHour), ("day", TruncDay))
+
+    def __init__(self):
+        self.batch_size = getattr(settings, "PRODUCT_EVENTS_FLUSH_BATCH_SIZE", 10000)
+
+    def record(self, product_id, kind, variant_id=None):
+        if variant_id is not None:
+            try:
+                if not Variant.objects.filter(
+                    pk=variant_id, product_id=product_id
+                ).exists():
+                    variant_id = None
+            except ValidationError:
+                variant_id = None
+
+        ProductEvent.objects.create(
+            product_id=product_id, variant_id=variant_id, kind=kind
+        )
+
+    def get_counts(self):
+        return {field: Count("id", filter=Q(kind=field)) for field in self.fields}
+
+    def flush(self):
+        count = 0
+        while True:
+            flushed = self.flush_batch()
+            if not flushed:
+                return count
+            count += flushed
+
+    @transaction.atomic
+    def flush_batch(self):
+        # Concurrent flushes skip each other's claimed rows, so every event is
+        # counted once and only the claimed batch is deleted.
+        ids = list(
+            ProductEvent.objects.select_for_update(skip_locked=True)
+            .order_by("id")
+            .values_list("id", flat=True)[: self.batch_size]
+        )
+        if not ids:
+            return 0
+        events = ProductEvent.objects.filter(id__in=ids)
+
+        product_ids = set(
+            Product._base_manager.filter(
+                pk__in=events.values("product_id")
+            ).values_list("id", flat=True)
+        )
+        variant_ids = set(
+            Variant._base_manager.filter(
+                pk__in=events.filter(variant_id__isnull=False).values("variant_id")
+            ).values_list("id", flat=True)
+        )
+
+        totals = {}
+        for granularity, trunc in self.truncs:
+            periods = events.annotate(period_start=trunc("created_at"))
+            rows = [
+                row
+                for row in periods.values("product_id", "period_start")
+                .annotate(**self.get_counts())
+                .order_by()
+                if row["product_id"] in product_ids
+            ]
+            if granularity == "day":
+                for row in rows:
+                    total = totals.setdefault(
+                        row["product_id"], dict.fromkeys(self.fields, 0)
+                    )
+                    for field in self.fields:
+                        total[field] += row[field]
+            for row in rows:
+                row["variant_id"] = None
+            rows += [
+                row
+                for row in periods.filter(variant_id__isnull=False)
+                .values("product_id", "variant_id", "period_start")
+                .annotate(**self.get_counts())
+                .order_by()
+                if row["product_id"] in product_ids and row["variant_id"] in variant_ids
+            ]
+            self.merge(granularity, rows)
+
+        if totals:
+            Product.objects.filter(pk__in=totals.keys()).update(
+                **{
+                    field: F(field)
+                    + Case(
+                        *[
+                            When(pk=product_id, then=Value(total[field]))
+                            for product_id, total in totals.items()
+                            if total[field]
+                        ],
+                        default=Value(0),
+                    )
+                    for field in self.fields
+                }
+            )
+
+        count = ProductEvent.objects.filter(id__in=ids).delete()[0]
+
+        retention = getattr(settings, "PRODUCT_STATS_HOURLY_RETENTION_DAYS", 30)
+        ProductStat.objects.filter(
+            granularity="hour",
+            period_start__lt=timezone.now() - datetime.timedelta(days=retention),
+        ).delete()
+
+        return count
+
+    def merge(self, granularity, rows):
+        # Rows are upserted with increments, so concurrent flushes add to the
+        # same period row instead of creating a duplicate or overwriting it.
+        # Product totals and variant rows match different partial unique
+        # constraints, so each group is its own statement.
+        for has_variant in (False, True):
+            group = [
+                row for row in rows if (row["variant_id"] is not None) == has_variant
+            ]
+            for start in range(0, len(group), 1000):
+                self.upsert(granularity, group[start : start + 1000], has_variant)
+
+    def upsert(self, granularity, rows, has_variant):
+        if not rows:
+            return
+
+        connection = connections[router.db_for_write(ProductStat)]
+        quote = connection.ops.quote_name
+        fields = [
+            ProductStat._meta.get_field(name)
+            for name in (
+                "id",
+                "product",
+                "variant",
+                "granularity",
+                "period_start",
+                *self.fields,
+            )
+        ]
+        conflict_fields = ["product_id", "granularity", "period_start"]
+        if has_variant:
+            conflict_fields.insert(1, "variant_id")
+
+        params = []
+        for row in rows:
+            values = {
+                "id": uuid.uuid4(),
+                "granularity": granularity,
+                **row,
+            }
+            params += [
+                field.get_db_prep_value(values[field.attname], connection)
+                for field in fields
+            ]
+
+        table = quote(ProductStat._meta.db_table)
+        placeholders = "({})".format(", ".join(["%s"] * len(fields)))
+        sql = (
+            "INSERT INTO {table} ({columns}) VALUES {values} "
+            "ON CONFLICT ({conflict}) WHERE {variant} {condition} "
+            "DO UPDATE SET {updates}"
+        ).format(
+            table=table,
+            columns=", ".join(quote(field.column) for field in fields),
+            values=", ".join([placeholders] * len(rows)),
+            conflict=", ".join(quote(name) for name in conflict_fields),
+            variant=quote("variant_id"),
+            condition="IS NOT NULL" if has_variant else "IS NULL",
+            updates=", ".join(
+                "{column} = {table}.{column} + EXCLUDED.{column}".format(
+                    table=table, column=quote(field)
+                )
+                for field in self.fields
+            ),
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+
+    def get_stats(self, product_id, from_date, to_date, granularity, variant_id=None):
+        return ProductStat.objects.filter(
+            product_id=product_id,
+            variant_id=variant_id,
+            granularity=granularity,
+            period_start__gte=from_date,
+            period_start__lt=to_date,
+        ).order_by("period_start")
+
+    def get_top(self, from_date, to_date, field, first=10):
+        return list(
+            ProductStat.objects.filter(
+                granularity="day",
+                variant__isnull=True,
+                period_start__gte=from_date,
+                period_start__lt=to_date,
+            )
+            .values("product_id")
+            .annotate(**{"total_" + field: Sum(field) for field in self.fields})
+            .order_by("-total_" + field)[:first]
+        )
@@ -0,0 +1,254 @@
+import csv
+import io
+import uuid
+
+from defusedxml import ElementTree as ET
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Count, F
+from graphql_relay import from_global_id
+
+from django_mall_product.models import (
+    Product,
+    ProductOption,
+    ProductOptionTrans,
+    ProductOptionValue,
+    ProductOptionValueTrans,
+    ProductTrans,
+)
+
+
+class TransHelper:
+    models = {
+        "product": (
+            Product,
+            ProductTrans,
+            ("name", "description", "summary", "content"),
+        ),
+        "product_option": (ProductOption, ProductOptionTrans, ("name",)),
+        "product_option_value": (
+            ProductOptionValue,
+            ProductOptionValueTrans,
+            ("name",),
+        ),
+    }
+
+    def upsert(self, label, parent_id, translations):
+        return self.upsert_many(
+            label,
+            [dict(translation, id=parent_id) for translation in translations],
+        )
+
+    def upsert_many(self, label, rows, fields=None):
+        _, trans_model, trans_fields = self.models[label]
+        if fields is None:
+            fields = trans_fields
+        fields = [field for field in fields if field in trans_fields]
+
+        translations = {}
+        for row in rows:
+            translation = translations.setdefault(
+                (str(row["id"]), row["language_code"]),
+                trans_model(
+                    **{
+                        label + "_id": row["id"],
+                        "language_code": row["language_code"],
+                    }
+                ),
+            )
+            for field in fields:
+                if field in row:
+                    setattr(translation, field, row[field])
+
+        return trans_model.objects.bulk_create(
+            list(translations.values()),
+            update_conflicts=True,
+            unique_fields=[label, "language_code"],
+            update_fields=[
+                *fields,
+                *self.get_restore_fields(trans_model),
+                "updated_at",
+            ],
+        )
+
+    @staticmethod
+    def get_restore_fields(trans_model):
+        # The unique constraint also covers soft-deleted rows, so a conflict
+        # may hit one of them; these fields bring it back to life.
+        names = {field.attname for field in trans_model._meta.concrete_fields}
+
+        return [name for name in ("deleted", "deleted_by_cascade") if name in names]
+
+
+def deduplicate_translations(apps, schema_editor=None):
+    # RunPython operation for the migration that adds the (language_code,
+    # parent) unique constraint. Keeps the live, most recently updated row.
+    for model_name, parent in (
+        ("ProductTrans", "product"),
+        ("ProductOptionTrans", "product_option"),
+        ("ProductOptionValueTrans", "product_option_value"),
+    ):
+        manager = apps.get_model("django_mall_product", model_name)._base_manager
+        names = {field.attname for field in manager.model._meta.concrete_fields}
+        ordering = [F("deleted").asc(nulls_first=True)] if "deleted" in names else []
+
+        duplicates = (
+            manager.filter(**{parent + "__isnull": False})
+            .values(parent, "language_code")
+            .annotate(count=Count("pk"))
+            .filter(count__gt=1)
+            .order_by()
+        )
+        for row in duplicates:
+            ids = list(
+                manager.filter(
+                    **{parent: row[parent], "language_code": row["language_code"]}
+                )
+                .order_by(*ordering, "-updated_at", "pk")
+                .values_list("pk", flat=True)
+            )
+            manager.filter(pk__in=ids[1:]).delete()
+
+
+class TranslationImportHelper:
+    type_names = {
+        "product": "ProductNode",
+        "product_option": "ProductOptionNode",
+        "product_option_value": "ProductOptionValueNode",
+    }
+
+    def __init__(self, chunk_size=1000):
+        self.chunk_size = chunk_size
+        self.trans_helper = TransHelper()
+        self.language_codes = {language_code for language_code, _ in settings.LANGUAGES}
+
+    def parse_id(self, label, value):
+        try:
+            return str(uuid.UUID(value))
+        except (TypeError, ValueError):
+            pass
+
+        try:
+            _type, pk = from_global_id(value)
+            pk = str(uuid.UUID(pk))
+        except Exception:
+            return None
+        if _type != self.type_names[label]:
+            return None
+
+        return pk
+
+    def parse_csv(self, content):
+        reader = csv.DictReader(io.StringIO(content))
+        try:
+            for row in reader:
+                label = row.pop("type", None)
+                id = row.pop("id", None)
+                if not label or not id or None in row:
+                    raise ValidationError(
+                        "The row {} is invalid!".format(reader.line_num)
+                    )
+                yield label, id, {
+                    key: value for key, value in row.items() if value not in ("", None)
+                }
+        except csv.Error:
+            raise ValidationError("The row {} is invalid!".format(reader.line_num))
+
+    def parse_xliff(self, content):
+        try:
+            root = ET.fromstring(content)
+        except Exception:
+            raise ValidationError("The content is invalid!")
+        namespace = root.tag[: root.tag.index("}") + 1] if "}" in root.tag else ""
+
+        number = 0
+        for file in root.iter(namespace + "file"):
+            language_code = file.get("target-language")
+            for unit in file.iter(namespace + "trans-unit"):
+                number += 1
+                parts = (unit.get("id") or "").split(":")
+                if len(parts) != 3 or not all(parts):
+                    raise ValidationError(
+                        "The trans-unit {} is invalid!".format(number)
+                    )
+                label, id, field = parts
+                target = unit.find(namespace + "target")
+                if target is not None:
+                    yield label, id, {
+                        "language_code": language_code,
+                        field: target.text or "",
+                    }
+
+    def import_content(self, content, format="csv"):
+        parser = self.parse_xliff if format == "xliff" else self.parse_csv
+
+        result = {"done": 0, "not_found": [], "error": [], "product_ids": set()}
+        chunk = []
+        for label, id, values in parser(content):
+            if (
+                label not in TransHelper.models
+                or values.get("language_code") not in self.language_codes
+            ):
+                result["error"].append(id)
+                continue
+            pk = self.parse_id(label, id)
+            if pk is None:
+                result["error"].append(id)
+                continue
+            chunk.append((label, pk, values))
+
+            if len(chunk) >= self.chunk_size:
+                self.import_chunk(chunk, result)
+                chunk = []
+        if chunk:
+            self.import_chunk(chunk, result)
+
+        return result
+
+    def import_chunk(self, chunk, result):
+        groups = {}
+        for label, id, values in chunk:
+            groups.setdefault(label, []).append(dict(values, id=id))
+
+        for label, rows in groups.items():
+            model = TransHelper.models[label][0]
+            product_field = {
+                "product": "id",
+                "product_option": "product_id",
+                "product_option_value": "product_option__product_id",
+            }[label]
+
+            found = set()
+            for id, product_id in model.objects.filter(
+                pk__in={row["id"] for row in rows}
+            ).values_list("id", product_field):
+                found.add(str(id))
+                result["product_ids"].add(product_id)
+
+            trans_model = TransHelper.models[label][1]
+            existing = {
+                (str(parent_id), language_code)
+                for parent_id, language_code in trans_model._base_manager.filter(
+                    **{label + "_id__in": found},
+                    language_code__in={row["language_code"] for row in rows},
+                ).values_list(label + "_id", "language_code")
+            }
+
+            by_fields = {}
+            for row in rows:
+                if row["id"] not in found:
+                    result["not_found"].append(row["id"])
+                    continue
+                if (
+                    not row.get("name")
+                    and (row["id"], row["language_code"]) not in existing
+                ):
+                    result["error"].append(row["id"])
+                    continue
+                fields = tuple(sorted(set(row) - {"id", "language_code"}))
+                by_fields.setdefault(fields, []).append(row)
+
+            for fields, field_rows in by_fields.items():
+                result["done"] += len(
+                    self.trans_helper.upsert_many(label, field_rows, fields)
+                )
@@ -0,0 +1,168 @@
+import hashlib
+import math
+
+from django.conf import settings
+from django.db import IntegrityError, connections, router, transaction
+from django.utils import timezone
+
+from django_mall_product.models import ProductVisitorSketch
+
+
+class HyperLogLog:
+    def __init__(self, precision, registers=None):
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(registers or self.size)
+
+    def get_position(self, key):
+        hash = int.from_bytes(
+            hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big"
+        )
+        index = hash >> (64 - self.precision)
+        remaining = hash & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remaining.bit_length() + 1
+
+        return index, rank
+
+    def add(self, key):
+        index, rank = self.get_position(key)
+
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+            return True
+
+        return False
+
+    def fold(self, registers):
+        # A sketch kept at a higher precision is reduced by moving the extra
+        # index bits back into the rank. Lower precisions cannot be expanded.
+        if len(registers) <= self.size:
+            return False
+        shift = (len(registers) // self.size).bit_length() - 1
+        if len(registers) != self.size << shift:
+            return False
+
+        for index, rank in enumerate(registers):
+            if not rank:
+                continue
+            low = index & ((1 << shift) - 1)
+            rank = shift - low.bit_length() + 1 if low else shift + rank
+            if rank > self.registers[index >> shift]:
+                self.registers[index >> shift] = rank
+
+        return True
+
+    def merge(self, registers):
+        if len(registers) != self.size:
+            return self.fold(registers)
+
+        for index, rank in enumerate(registers):
+            if rank > self.registers[index]:
+                self.registers[index] = rank
+
+        return True
+
+    def estimate(self):
+        alpha = 0.7213 / (1 + 1.079 / self.size)
+        estimate = (
+            alpha * self.size * self.size / sum(2.0**-rank for rank in self.registers)
+        )
+
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.size and zeros:
+            estimate = self.size * math.log(self.size / zeros)
+
+        return round(estimate)
+
+
+class VisitorHelper:
+    def __init__(self):
+        self.precision = getattr(settings, "PRODUCT_VISITOR_SKETCH_PRECISION", 11)
+
+    def record(self, product_id, visitor_key):
+        day = timezone.localdate()
+        index, rank = HyperLogLog(self.precision).get_position(visitor_key)
+
+        registers = (
+            ProductVisitorSketch.objects.filter(product_id=product_id, day=day)
+            .values_list("registers", flat=True)
+            .first()
+        )
+        if registers is not None and len(registers) == 1 << self.precision:
+            if registers[index] >= rank:
+                return
+            if self.set_register(product_id, day, index, rank):
+                return
+
+        self.record_locked(product_id, day, visitor_key)
+
+    def set_register(self, product_id, day, index, rank):
+        db = router.db_for_write(ProductVisitorSketch)
+        if connections[db].vendor != "postgresql":
+            return False
+
+        quote_name = connections[db].ops.quote_name
+        with connections[db].cursor() as cursor:
+            cursor.execute(
+                "UPDATE {} SET {registers} = set_byte({registers}, %s, %s) "
+                "WHERE {} = %s AND {} = %s AND length({registers}) = %s "
+                "AND get_byte({registers}, %s) < %s".format(
+                    quote_name(ProductVisitorSketch._meta.db_table),
+                    quote_name("product_id"),
+                    quote_name("day"),
+                    registers=quote_name("registers"),
+                ),
+                [index, rank, product_id, day, 1 << self.precision, index, rank],
+            )
+
+        return True
+
+    def record_locked(self, product_id, day, visitor_key):
+        with transaction.atomic():
+            sketch = (
+                ProductVisitorSketch.objects.select_for_update()
+                .filter(product_id=product_id, day=day)
+                .first()
+            )
+            if sketch is None:
+                hll = HyperLogLog(self.precision)
+                hll.add(visitor_key)
+                try:
+                    with transaction.atomic():
+                        ProductVisitorSketch.objects.create(
+                            product_id=product_id,
+                            day=day,
+                            registers=bytes(hll.registers),
+                        )
+                    return
+                except IntegrityError:
+                    sketch = ProductVisitorSketch.objects.select_for_update().get(
+                        product_id=product_id, day=day
+                    )
+
+            registers = bytes(sketch.registers)
+            if len(registers) == 1 << self.precision:
+                hll = HyperLogLog(self.precision, registers)
+                changed = hll.add(visitor_key)
+            else:
+                hll = HyperLogLog(self.precision)
+                hll.merge(registers)
+                hll.add(visitor_key)
+                changed = True
+
+            if changed:
+                sketch.registers = bytes(hll.registers)
+                sketch.save(update_fields=["registers"])
+
+    def count(self, product_id, from_date=None, to_date=None):
+        sketches = ProductVisitorSketch.objects.filter(product_id=product_id)
+        if from_date:
+            sketches = sketches.filter(day__gte=from_date)
+        if to_date:
+            sketches = sketches.filter(day__lte=to_date)
+
+        hll = HyperLogLog(self.precision)
+        for registers in sketches.values_list("registers", flat=True):
+            hll.merge(bytes(registers))
+
+        return hll.estimate()
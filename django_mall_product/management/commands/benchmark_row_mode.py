@@ -0,0 +1,76 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from django_mall_product.graphql.storefront.records import (
+    ProductRecord,
+    VariantRecord,
+    record_iterable,
+)
+from django_mall_product.models import Product, Variant
+
+
+class Command(BaseCommand):
+    help = "Compare model instances with row records on storefront list reads."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def measure(self, queryset, fields, repeat):
+        timings = []
+        for _ in range(repeat):
+            started_at = time.perf_counter()
+            for row in queryset.all():
+                for field in fields:
+                    getattr(row, field)
+            timings.append(time.perf_counter() - started_at)
+
+        return min(timings)
+
+    def records(self, queryset, record_class):
+        queryset = queryset.values(
+            *[
+                name
+                for name in record_class.__slots__
+                if name not in record_class.relations
+            ]
+        )
+        queryset._iterable_class = record_iterable(record_class, {})
+
+        return queryset
+
+    def handle(self, *args, **options):
+        limit = options["limit"]
+        repeat = options["repeat"]
+
+        for label, model, record_class, fields in (
+            (
+                "products",
+                Product,
+                ProductRecord,
+                ("id", "slug", "sort_key", "count_access", "is_visible"),
+            ),
+            (
+                "variants",
+                Variant,
+                VariantRecord,
+                ("id", "slug", "price", "price_sale", "is_visible"),
+            ),
+        ):
+            queryset = model.objects.order_by("pk")[:limit]
+            instance_time = self.measure(queryset, fields, repeat)
+            record_time = self.measure(
+                self.records(model.objects.order_by("pk"), record_class)[:limit],
+                fields,
+                repeat,
+            )
+
+            self.stdout.write(
+                "{}: instances {:.2f} ms, records {:.2f} ms, {:.1f}x".format(
+                    label,
+                    instance_time * 1000,
+                    record_time * 1000,
+                    instance_time / record_time if record_time else 0,
+                )
+            )
@@ -0,0 +1,110 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.core.management.base import BaseCommand
+
+SCRIPT = """
+import json
+import sys
+import time
+
+started_at = time.perf_counter()
+import django
+
+django.setup()
+setup_at = time.perf_counter()
+
+module = __import__({module!r}, fromlist=["builder"])
+imported_at = time.perf_counter()
+
+module.builder.get_schema()
+built_at = time.perf_counter()
+
+module.builder.introspect("query IntrospectionQuery {{ __schema {{ types {{ name }} }} }}")
+introspected_at = time.perf_counter()
+
+module.builder.introspect("query IntrospectionQuery {{ __schema {{ types {{ name }} }} }}")
+cached_at = time.perf_counter()
+
+print(json.dumps({{
+    "setup": setup_at - started_at,
+    "import": imported_at - setup_at,
+    "build": built_at - imported_at,
+    "build_import": module.builder.timings["import"],
+    "introspect": introspected_at - built_at,
+    "introspect_cached": cached_at - introspected_at,
+    "foreign_modules": sorted(
+        name for name in sys.modules if name.startswith({foreign!r})
+    ),
+}}))
+"""
+
+
+class Command(BaseCommand):
+    help = "Measure cold import and build time of the GraphQL schemas."
+
+    schemas = {
+        "storefront": (
+            "django_mall_product.graphql.schema_storefront",
+            "django_mall_product.graphql.dashboard",
+        ),
+        "dashboard": (
+            "django_mall_product.graphql.schema_dashboard",
+            "django_mall_product.graphql.storefront",
+        ),
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--schema", choices=list(self.schemas), action="append", default=[]
+        )
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def run(self, module, foreign):
+        output = subprocess.run(
+            [sys.executable, "-c", SCRIPT.format(module=module, foreign=foreign)],
+            check=True,
+            capture_output=True,
+            env=os.environ.copy(),
+            text=True,
+        ).stdout
+
+        return json.loads(output.strip().splitlines()[-1])
+
+    def handle(self, *args, **options):
+        for name in options["schema"] or list(self.schemas):
+            module, foreign = self.schemas[name]
+            results = [self.run(module, foreign) for _ in range(options["repeat"])]
+
+            timings = {
+                key: min(result[key] for result in results) * 1000
+                for key in (
+                    "setup",
+                    "import",
+                    "build",
+                    "build_import",
+                    "introspect",
+                    "introspect_cached",
+                )
+            }
+            self.stdout.write(
+                "{}: {}".format(
+                    name,
+                    ", ".join(
+                        "{} {:.1f} ms".format(key, value)
+                        for key, value in timings.items()
+                    ),
+                )
+            )
+
+            foreign_modules = results[0]["foreign_modules"]
+            if foreign_modules:
+                self.stdout.write(
+                    self.style.WARNING(
+                        "{} imported {}".format(name, ", ".join(foreign_modules))
+                    )
+                )
+            else:
+                self.stdout.write(self.style.SUCCESS("{} is isolated.".format(name)))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from django_mall_product.helpers.popularity_helper import PopularityHelper
+
+
+class Command(BaseCommand):
+    help = "Recompute the time-decayed popularity score of every product."
+
+    def handle(self, *args, **options):
+        count = PopularityHelper().compute()
+
+        self.stdout.write(
+            self.style.SUCCESS("Updated the popularity of {} products.".format(count))
+        )
@@ -0,0 +1,15 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from django_mall_product.helpers.trans_helper import deduplicate_translations
+
+
+class Command(BaseCommand):
+    help = "Delete duplicate translations before adding their unique constraint."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            deduplicate_translations(apps)
+
+        self.stdout.write(self.style.SUCCESS("Deduplicated translations."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from django_mall_product.helpers.stat_helper import StatHelper
+
+
+class Command(BaseCommand):
+    help = "Roll buffered product events up into the hourly and daily stats."
+
+    def handle(self, *args, **options):
+        count = StatHelper().flush()
+
+        self.stdout.write(
+            self.style.SUCCESS("Flushed {} product events.".format(count))
+        )
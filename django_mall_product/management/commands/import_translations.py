@@ -0,0 +1,44 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from django_mall_product.helpers.product_page_helper import ProductPageHelper
+from django_mall_product.helpers.trans_helper import TranslationImportHelper
+
+
+class Command(BaseCommand):
+    help = "Import product, option and option value translations from a file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=("csv", "xliff"))
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        format = options["format"] or ("xliff" if path.endswith(".xlf") else "csv")
+
+        try:
+            with open(path, encoding="utf-8") as file:
+                content = file.read()
+        except OSError as error:
+            raise CommandError(error)
+
+        try:
+            with transaction.atomic():
+                result = TranslationImportHelper(
+                    chunk_size=options["chunk_size"]
+                ).import_content(content, format)
+        except ValidationError as error:
+            raise CommandError("; ".join(error.messages))
+
+        if result["product_ids"]:
+            ProductPageHelper().rebuild(result["product_ids"])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Imported {} translations, {} not found, {} invalid.".format(
+                    result["done"], len(result["not_found"]), len(result["error"])
+                )
+            )
+        )
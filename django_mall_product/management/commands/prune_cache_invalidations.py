@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from django_mall_product.helpers.invalidation_helper import InvalidationHelper
+
+
+class Command(BaseCommand):
+    help = "Delete cache invalidation messages older than the retention window."
+
+    def handle(self, *args, **options):
+        count = InvalidationHelper().prune()
+
+        self.stdout.write(
+            self.style.SUCCESS("Pruned {} cache invalidations.".format(count))
+        )
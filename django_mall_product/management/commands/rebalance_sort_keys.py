@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from django_mall_product.helpers.sort_key_helper import SortKeyHelper
+from django_mall_product.models import Product, ProductOption, ProductOptionValue
+
+
+class Command(BaseCommand):
+    help = "Respace product, option and option value sort keys evenly."
+
+    def handle(self, *args, **options):
+        sort_key_helper = SortKeyHelper()
+
+        for model in (Product, ProductOption, ProductOptionValue):
+            with transaction.atomic():
+                count = sort_key_helper.rebalance_all(model)
+
+            self.stdout.write(
+                self.style.SUCCESS(
+                    "Rebalanced {} {} sort keys.".format(
+                        count, model._meta.verbose_name
+                    )
+                )
+            )
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from django_mall_product.helpers.inventory_helper import InventoryHelper
+
+
+class Command(BaseCommand):
+    help = "Release expired stock reservations back to the available stock."
+
+    def handle(self, *args, **options):
+        count = InventoryHelper().sweep()
+
+        self.stdout.write(
+            self.style.SUCCESS("Released {} stock reservations.".format(count))
+        )
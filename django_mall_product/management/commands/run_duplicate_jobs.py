@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from django_mall_product.helpers.duplicate_helper import DuplicateHelper
+
+
+class Command(BaseCommand):
+    help = "Run pending and stale background product duplications."
+
+    def handle(self, *args, **options):
+        count = DuplicateHelper().run_pending_jobs()
+
+        self.stdout.write(self.style.SUCCESS("Duplicated {} products.".format(count)))
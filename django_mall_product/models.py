@@ -2,6 +2,7 @@ import uuid
 
 from django.conf import settings
 from django.db import models
+from django.db.models import F, Prefetch, Q
 
 from django_prices.models import MoneyField
 from safedelete.models import SOFT_DELETE_CASCADE
@@ -45,7 +46,7 @@ class ProductTrans(CommonDateAndSafeDeleteMixin, TranslationModel):
 
     class Meta:
         db_table = settings.APP_NAME + "_product_product_trans"
-        index_together = (("language_code", "product"),)
+        unique_together = (("language_code", "product"),)
         ordering = ["language_code"]
 
     def __str__(self):
@@ -80,7 +81,7 @@ class ProductOptionTrans(CommonDateAndSafeDeleteMixin, TranslationModel):
     class Meta:
         db_table = settings.APP_NAME + "_product_product_option_trans"
         get_latest_by = "updated_at"
-        index_together = (("language_code", "product_option"),)
+        unique_together = (("language_code", "product_option"),)
         ordering = ["language_code"]
 
     def __str__(self):
@@ -115,7 +116,7 @@ class ProductOptionValueTrans(CommonDateAndSafeDeleteMixin, TranslationModel):
     class Meta:
         db_table = settings.APP_NAME + "_product_product_option_value_trans"
         get_latest_by = "updated_at"
-        index_together = (("language_code", "product_option_value"),)
+        unique_together = (("language_code", "product_option_value"),)
         ordering = ["language_code"]
 
     def __str__(self):
@@ -164,6 +165,25 @@ class Variant(CommonDateAndSafeDeleteMixin, PublishableModel):
     def __str__(self):
         return str(self.id)
 
+    def get_selected_option_values(self):
+        # Prefetched links give a list, skipping values the prefetch filtered
+        # out. Otherwise a queryset is returned.
+        if "variantoptionvalue_set" in getattr(self, "_prefetched_objects_cache", {}):
+            return sorted(
+                (
+                    link.product_option_value
+                    for link in self.variantoptionvalue_set.all()
+                    if link.product_option_value is not None
+                ),
+                key=lambda value: (value.sort_key, str(value.pk)),
+            )
+
+        return ProductOptionValue.objects.filter(
+            pk__in=VariantOptionValue.objects.filter(variant=self).values(
+                "product_option_value_id"
+            )
+        )
+
 
 class VariantOptionValue(CommonDateAndSafeDeleteMixin):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -178,3 +198,200 @@ class VariantOptionValue(CommonDateAndSafeDeleteMixin):
 
     def __str__(self):
         return str(self.id)
+
+
+def prefetch_selected_option_values(lookup="selected_option_values", queryset=None):
+    # Prefetch through VariantOptionValue rather than the M2M so the safedelete
+    # manager drops soft-deleted links and each value stays on its own variant.
+    if queryset is None:
+        queryset = ProductOptionValue.objects.all()
+
+    prefix = lookup[: -len("selected_option_values")]
+
+    return Prefetch(
+        prefix + "variantoptionvalue_set",
+        queryset=VariantOptionValue.objects.prefetch_related(
+            Prefetch("product_option_value", queryset=queryset)
+        ),
+    )
+
+
+class ProductPage(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    product = models.ForeignKey(Product, models.CASCADE)
+    slug = models.CharField(max_length=255)
+    language_code = models.CharField(max_length=255)
+    payload = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = settings.APP_NAME + "_product_product_page"
+        unique_together = (("product", "language_code"),)
+        index_together = (("slug", "language_code"),)
+
+    def __str__(self):
+        return str(self.id)
+
+
+class ProductEvent(models.Model):
+    KIND_CHOICES = (
+        ("count_access", "count_access"),
+        ("count_add_to_cart", "count_add_to_cart"),
+    )
+
+    id = models.BigAutoField(primary_key=True)
+    product_id = models.UUIDField()
+    variant_id = models.UUIDField(null=True)
+    kind = models.CharField(max_length=32, choices=KIND_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = settings.APP_NAME + "_product_product_event"
+
+    def __str__(self):
+        return str(self.id)
+
+
+class ProductStat(models.Model):
+    GRANULARITY_CHOICES = (
+        ("hour", "hour"),
+        ("day", "day"),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    product = models.ForeignKey(Product, models.CASCADE)
+    variant = models.ForeignKey(Variant, models.CASCADE, null=True)
+    granularity = models.CharField(max_length=8, choices=GRANULARITY_CHOICES)
+    period_start = models.DateTimeField()
+    count_access = models.PositiveIntegerField(default=0)
+    count_add_to_cart = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = settings.APP_NAME + "_product_product_stat"
+        index_together = (
+            ("product", "granularity", "period_start"),
+            ("granularity", "period_start"),
+        )
+        constraints = [
+            models.UniqueConstraint(
+                fields=["product", "granularity", "period_start"],
+                condition=Q(variant__isnull=True),
+                name="%(app_label)s_product_stat_product_period",
+            ),
+            models.UniqueConstraint(
+                fields=["product", "variant", "granularity", "period_start"],
+                condition=Q(variant__isnull=False),
+                name="%(app_label)s_product_stat_variant_period",
+            ),
+        ]
+
+    def __str__(self):
+        return str(self.id)
+
+
+class ProductPopularity(models.Model):
+    product = models.OneToOneField(
+        Product,
+        related_name="popularity",
+        on_delete=models.CASCADE,
+        primary_key=True,
+    )
+    score = models.FloatField(default=0, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = settings.APP_NAME + "_product_product_popularity"
+
+    def __str__(self):
+        return str(self.product_id)
+
+
+class ProductVisitorSketch(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    product = models.ForeignKey(Product, models.CASCADE)
+    day = models.DateField(db_index=True)
+    registers = models.BinaryField()
+
+    class Meta:
+        db_table = settings.APP_NAME + "_product_product_visitor_sketch"
+        unique_together = (("product", "day"),)
+
+    def __str__(self):
+        return str(self.id)
+
+
+class ProductDuplicateJob(models.Model):
+    STATUS_CHOICES = (
+        ("pending", "pending"),
+        ("running", "running"),
+        ("succeeded", "succeeded"),
+        ("failed", "failed"),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    product = models.ForeignKey(Product, models.CASCADE)
+    new_product_id = models.UUIDField(unique=True)
+    slug = models.CharField(max_length=255)
+    status = models.CharField(
+        max_length=16, choices=STATUS_CHOICES, default="pending", db_index=True
+    )
+    error = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = settings.APP_NAME + "_product_duplicate_job"
+
+    def __str__(self):
+        return str(self.id)
+
+
+class VariantStock(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    variant = models.ForeignKey(Variant, models.CASCADE)
+    warehouse = models.CharField(max_length=64, default="default")
+    quantity_on_hand = models.PositiveIntegerField(default=0)
+    quantity_reserved = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = settings.APP_NAME + "_product_variant_stock"
+        unique_together = (("variant", "warehouse"),)
+        constraints = [
+            models.CheckConstraint(
+                check=Q(quantity_reserved__lte=F("quantity_on_hand")),
+                name="%(app_label)s_variant_stock_reserved_lte_on_hand",
+            ),
+        ]
+
+    def __str__(self):
+        return str(self.id)
+
+
+class StockReservation(models.Model):
+    id = models.BigAutoField(primary_key=True)
+    key = models.UUIDField(db_index=True)
+    variant = models.ForeignKey(Variant, models.CASCADE)
+    warehouse = models.CharField(max_length=64)
+    quantity = models.PositiveIntegerField()
+    expires_at = models.DateTimeField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = settings.APP_NAME + "_product_stock_reservation"
+
+    def __str__(self):
+        return str(self.id)
+
+
+class CacheInvalidation(models.Model):
+    id = models.BigAutoField(primary_key=True)
+    entity = models.CharField(max_length=64)
+    ids = models.JSONField(default=list)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        db_table = settings.APP_NAME + "_product_cache_invalidation"
+
+    def __str__(self):
+        return str(self.id)
@@ -0,0 +1,66 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+import random
+
+from django.conf import settings
+from django.db import connections
+
+_read_from_replica = ContextVar("product_read_from_replica", default=False)
+
+
+def get_primary_alias():
+    return getattr(settings, "PRODUCT_DATABASE_PRIMARY", "default")
+
+
+def get_replica_aliases():
+    return getattr(settings, "PRODUCT_DATABASE_REPLICAS", [])
+
+
+def is_reading_from_replica():
+    return _read_from_replica.get()
+
+
+@contextmanager
+def read_from_replica(enabled=True):
+    token = _read_from_replica.set(enabled)
+    try:
+        yield
+    finally:
+        _read_from_replica.reset(token)
+
+
+class ProductReplicaRouter:
+    app_labels = {"django_mall_product"}
+
+    def _is_routed(self, model):
+        return model._meta.app_label in getattr(
+            settings, "PRODUCT_REPLICA_APP_LABELS", self.app_labels
+        )
+
+    def db_for_read(self, model, **hints):
+        if not self._is_routed(model):
+            return None
+
+        primary = get_primary_alias()
+        replicas = get_replica_aliases()
+        if (
+            not replicas
+            or not _read_from_replica.get()
+            or connections[primary].in_atomic_block
+        ):
+            return primary
+
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        if not self._is_routed(model):
+            return None
+
+        return get_primary_alias()
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {get_primary_alias(), *get_replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+
+        return None
@@ -6,8 +6,13 @@ setup(
     packages=find_packages(exclude=["tests*"]),
     install_requires=[
         "Django>=4.2",
+        "aiodataloader",
+        "defusedxml",
         "django-app-organization>=1.0",
     ],
+    extras_require={
+        "catalog": ["numpy"],
+    },
     author="Walker Chiu",
     author_email="chenjen.chiou@gmail.com",
     description="",
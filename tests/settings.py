@@ -0,0 +1,45 @@
+import os
+
+SECRET_KEY = "tests"
+USE_TZ = True
+
+INSTALLED_APPS = [
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "django.contrib.sessions",
+    "safedelete",
+    "django_app_core",
+    "django_app_organization",
+    "django_mall_product",
+]
+
+if os.environ.get("TEST_POSTGRES_NAME"):
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ["TEST_POSTGRES_NAME"],
+            "USER": os.environ.get("TEST_POSTGRES_USER", "postgres"),
+            "PASSWORD": os.environ.get("TEST_POSTGRES_PASSWORD", ""),
+            "HOST": os.environ.get("TEST_POSTGRES_HOST", "localhost"),
+            "PORT": os.environ.get("TEST_POSTGRES_PORT", "5432"),
+        },
+    }
+else:
+    DATABASES = {
+        "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"},
+    }
+
+DATABASES["replica"] = {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+
+DATABASE_ROUTERS = ["django_mall_product.routers.ProductReplicaRouter"]
+
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+}
+
+APP_NAME = "test"
+LANGUAGES = [("en", "English"), ("zh-hant", "Traditional Chinese")]
+DEFAULT_CURRENCY_CODE = "USD"
+DEFAULT_CURRENCY_CODE_LENGTH = 3
+DEFAULT_MAX_DIGITS = 12
+DEFAULT_DECIMAL_PLACES = 2
@@ -0,0 +1,39 @@
+import asyncio
+import threading
+
+from django.test import SimpleTestCase
+
+import graphene
+
+from django_mall_product.graphql.middleware import AsyncORMMiddleware
+
+barrier = threading.Barrier(2, timeout=5)
+
+
+class Query(graphene.ObjectType):
+    first = graphene.String()
+    second = graphene.String()
+
+    @staticmethod
+    def resolve_first(root, info):
+        barrier.wait()
+        return threading.current_thread().name
+
+    @staticmethod
+    def resolve_second(root, info):
+        barrier.wait()
+        return threading.current_thread().name
+
+
+class AsyncORMMiddlewareTest(SimpleTestCase):
+    def test_sibling_fields_overlap(self):
+        # Each resolver waits for the other, so this only succeeds when both
+        # run at the same time.
+        result = asyncio.run(
+            graphene.Schema(query=Query).execute_async(
+                "{ first second }", middleware=[AsyncORMMiddleware()]
+            )
+        )
+
+        self.assertIsNone(result.errors)
+        self.assertNotEqual(result.data["first"], result.data["second"])
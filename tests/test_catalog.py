@@ -0,0 +1,120 @@
+import datetime
+import unittest
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from graphql_relay import to_global_id
+
+from django_mall_product.helpers.catalog_helper import CatalogHelper, numpy
+from django_mall_product.models import Product, ProductPopularity, ProductTrans
+from tests.utils import create_product, execute_storefront
+
+
+@unittest.skipUnless(numpy, "The catalog engine needs numpy.")
+@override_settings(PRODUCT_CATALOG_ENGINE=True)
+class CatalogEngineTest(TestCase):
+    query = """
+        query ($name: String, $orderBy: [String], $createdAtGte: DateTime) {
+            catalogProducts(
+                name: $name, orderBy: $orderBy, createdAtGte: $createdAtGte,
+                pageSize: 100
+            ) {
+                engine
+                totalCount
+                results { id }
+            }
+        }
+    """
+
+    def setUp(self):
+        CatalogHelper.clear()
+        self.products = {}
+        for name, sort_key, serial, score in (
+            ("Red Shirt", 1, "b", 0.5),
+            ("Blue Shirt", 1, "a", 0.9),
+            ("Red Hat", 2, "c", None),
+            ("Green Hat", 3, "d", 0.1),
+        ):
+            self.products[name] = self.create_product(
+                name, sort_key=sort_key, serial=serial, is_published=True
+            )
+            if score is not None:
+                ProductPopularity.objects.create(
+                    product=self.products[name], score=score
+                )
+
+        self.create_product("Red Hidden", sort_key=4, is_published=False)
+        self.create_product(
+            "Red Future",
+            sort_key=5,
+            is_published=True,
+            published_at=datetime.date.today() + datetime.timedelta(days=10),
+        )
+
+    def tearDown(self):
+        CatalogHelper.clear()
+
+    def create_product(self, name, **kwargs):
+        product = create_product(**kwargs)
+        ProductTrans.objects.create(product=product, language_code="en", name=name)
+
+        return product
+
+    def execute(self, **variables):
+        result = execute_storefront(self.query, **variables)
+
+        self.assertIsNone(result.errors)
+
+        return result.data["catalogProducts"]
+
+    def assertMatchesSql(self, **variables):
+        memory = self.execute(**variables)
+        with override_settings(PRODUCT_CATALOG_ENGINE=False):
+            sql = self.execute(**variables)
+
+        self.assertEqual(memory["engine"], "memory")
+        self.assertEqual(sql["engine"], "sql")
+        self.assertEqual(memory["totalCount"], sql["totalCount"])
+        self.assertEqual(memory["results"], sql["results"])
+
+        return memory
+
+    def test_default_ordering_and_visibility(self):
+        result = self.assertMatchesSql()
+
+        self.assertEqual(result["totalCount"], 4)
+
+    def test_filters(self):
+        self.assertEqual(self.assertMatchesSql(name="red")["totalCount"], 2)
+        self.assertMatchesSql(
+            createdAtGte=(timezone.now() - datetime.timedelta(days=1)).isoformat()
+        )
+
+    def test_trending_with_nulls(self):
+        self.assertMatchesSql(orderBy=["-trending"])
+        self.assertMatchesSql(orderBy=["trending"])
+
+    @unittest.skipUnless(
+        connection.vendor == "postgresql", "The engine sorts NULLs like PostgreSQL."
+    )
+    def test_sort_key_with_nulls(self):
+        Product.objects.filter(pk=self.products["Red Hat"].pk).update(sort_key=None)
+
+        self.assertMatchesSql(orderBy=["sort_key"])
+        self.assertMatchesSql(orderBy=["-sort_key"])
+
+    def test_refresh(self):
+        blue = to_global_id("ProductNode", str(self.products["Blue Shirt"].pk))
+        red = to_global_id("ProductNode", str(self.products["Red Shirt"].pk))
+        result = self.assertMatchesSql()
+        self.assertEqual(result["results"][:2], [{"id": blue}, {"id": red}])
+
+        product = self.products["Blue Shirt"]
+        Product.objects.filter(pk=product.pk).update(serial="zz")
+        ProductTrans.objects.filter(product=product).update(name="Red Sweater")
+        CatalogHelper.refresh([product.pk])
+
+        result = self.assertMatchesSql()
+        self.assertEqual(result["results"][:2], [{"id": red}, {"id": blue}])
+        self.assertEqual(self.assertMatchesSql(name="red")["totalCount"], 3)
@@ -0,0 +1,22 @@
+import asyncio
+
+from django.test import SimpleTestCase
+
+from django_mall_product.graphql.coalescing import SingleFlight
+
+
+class SingleFlightTest(SimpleTestCase):
+    def test_cancelled_leader_releases_the_flight(self):
+        flights = SingleFlight()
+
+        async def run():
+            task = asyncio.ensure_future(flights.do_async("key", asyncio.Event().wait))
+            await asyncio.sleep(0)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(run())
+
+        self.assertEqual(flights.get_metrics()["in_flight"], 0)
+        self.assertEqual(flights.do("key", lambda: 1), 1)
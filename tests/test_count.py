@@ -0,0 +1,77 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from django_mall_product.helpers.count_helper import CountHelper, with_count_mode
+from django_mall_product.models import Product
+from tests.utils import create_product, execute_storefront
+
+
+@override_settings(PRODUCT_COUNT_CAP=2)
+class CountModeTest(TestCase):
+    def setUp(self):
+        for _ in range(5):
+            create_product()
+
+    def test_count_stays_exact(self):
+        queryset = with_count_mode(Product.objects.all(), "capped")
+
+        self.assertEqual(queryset.count(), 5)
+        self.assertEqual(queryset.filter(pk__isnull=False).count(), 5)
+
+    def test_capped_count(self):
+        queryset = with_count_mode(Product.objects.all(), "capped")
+
+        self.assertEqual(
+            CountHelper().count(queryset, queryset.count_mode), (2, False, "capped")
+        )
+
+
+class CountedConnectionTest(TestCase):
+    def setUp(self):
+        CountHelper().invalidate()
+        for _ in range(5):
+            create_product(is_published=True)
+
+    def execute(self, count_mode, first, total_count=False):
+        query = """
+            query ($countMode: String, $first: Int) {
+                products(countMode: $countMode, first: $first) {
+                    %s
+                    pageInfo { hasNextPage }
+                    edges { node { id } }
+                }
+            }
+        """ % ("totalCount" if total_count else "")
+        with CaptureQueriesContext(connection) as context:
+            result = execute_storefront(query, countMode=count_mode, first=first)
+
+        self.assertIsNone(result.errors)
+        counts = [query for query in context if "COUNT(" in query["sql"].upper()]
+
+        return result.data["products"], counts
+
+    def test_capped_pages_without_count(self):
+        data, counts = self.execute("capped", 2)
+
+        self.assertEqual(counts, [])
+        self.assertEqual(len(data["edges"]), 2)
+        self.assertTrue(data["pageInfo"]["hasNextPage"])
+
+        data, counts = self.execute("capped", 5)
+
+        self.assertEqual(counts, [])
+        self.assertEqual(len(data["edges"]), 5)
+        self.assertFalse(data["pageInfo"]["hasNextPage"])
+
+    def test_exact_count_is_cached(self):
+        data, counts = self.execute("exact", 2, total_count=True)
+
+        self.assertEqual(data["totalCount"], 5)
+        self.assertEqual(len(counts), 1)
+
+        data, counts = self.execute("exact", 2, total_count=True)
+
+        self.assertEqual(data["totalCount"], 5)
+        self.assertTrue(data["pageInfo"]["hasNextPage"])
+        self.assertEqual(counts, [])
@@ -0,0 +1,47 @@
+import uuid
+
+from django.test import TestCase
+
+from django_mall_product.helpers.duplicate_helper import DuplicateHelper
+from django_mall_product.models import Product, ProductDuplicateJob
+from tests.utils import create_option, create_product, create_variant
+
+
+class DuplicateJobTest(TestCase):
+    def setUp(self):
+        self.product = create_product()
+        _, values = create_option(self.product, ["S", "M"])
+        create_variant(self.product, values[:1])
+
+    def create_job(self, **kwargs):
+        kwargs.setdefault("product", self.product)
+        kwargs.setdefault("new_product_id", uuid.uuid4())
+
+        return ProductDuplicateJob.objects.create(slug=uuid.uuid4().hex, **kwargs)
+
+    def test_job_succeeds(self):
+        job = self.create_job()
+
+        self.assertTrue(DuplicateHelper().run_job(job.id))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, "succeeded")
+        copy = Product.objects.get(pk=job.new_product_id)
+        self.assertEqual(copy.variant_set.count(), 1)
+
+    def test_job_failure_is_recorded(self):
+        job = self.create_job()
+        self.product.delete()
+
+        with self.assertLogs("django_mall_product.helpers.duplicate_helper"):
+            self.assertFalse(DuplicateHelper().run_job(job.id))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, "failed")
+        self.assertTrue(job.error)
+
+    def test_claimed_job_is_not_run_twice(self):
+        job = self.create_job(status="running")
+
+        self.assertFalse(DuplicateHelper().run_job(job.id))
+        self.assertEqual(DuplicateHelper().run_pending_jobs(), 0)
@@ -0,0 +1,22 @@
+from django.test import TestCase
+
+from django_mall_product.helpers.invalidation_helper import DatabaseTransport
+from django_mall_product.models import CacheInvalidation
+
+
+class DatabaseTransportTest(TestCase):
+    def test_late_commit_is_delivered_once(self):
+        transport = DatabaseTransport()
+        cursor = transport.get_cursor()
+
+        CacheInvalidation.objects.create(id=10, entity="product", ids=["a"])
+        cursor, messages = transport.poll(cursor)
+        self.assertEqual(messages, [("product", ["a"])])
+
+        # A lower id that commits after a higher one was already read.
+        CacheInvalidation.objects.create(id=5, entity="product", ids=["b"])
+        cursor, messages = transport.poll(cursor)
+        self.assertEqual(messages, [("product", ["b"])])
+
+        cursor, messages = transport.poll(cursor)
+        self.assertEqual(messages, [])
@@ -0,0 +1,73 @@
+from concurrent.futures import ThreadPoolExecutor
+import unittest
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+from django_mall_product.helpers.inventory_helper import (
+    InsufficientStockError,
+    InventoryHelper,
+)
+from django_mall_product.models import StockReservation, VariantStock
+from tests.utils import create_product, create_variant
+
+
+class SetOnHandTest(TestCase):
+    def setUp(self):
+        self.variant = create_variant(create_product())
+        InventoryHelper().set_on_hand(self.variant.id, 5)
+
+    def test_rejects_on_hand_below_reserved(self):
+        InventoryHelper().reserve([(self.variant.id, 3, None)])
+
+        with self.assertRaises(ValidationError):
+            InventoryHelper().set_on_hand(self.variant.id, 2)
+
+        InventoryHelper().set_on_hand(self.variant.id, 3)
+        stock = VariantStock.objects.get(variant=self.variant)
+        self.assertEqual((stock.quantity_on_hand, stock.quantity_reserved), (3, 3))
+
+
+@unittest.skipUnless(connection.vendor == "postgresql", "Row locking needs PostgreSQL.")
+class ConcurrentReservationTest(TransactionTestCase):
+    def setUp(self):
+        product = create_product()
+        self.first = create_variant(product)
+        self.second = create_variant(product)
+
+    def run_in_threads(self, calls):
+        def run(items):
+            try:
+                InventoryHelper().reserve(items)
+                return True
+            except InsufficientStockError:
+                return False
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+            return list(executor.map(run, calls))
+
+    def test_does_not_oversell(self):
+        InventoryHelper().set_on_hand(self.first.id, 5)
+
+        results = self.run_in_threads([[(self.first.id, 1, None)]] * 20)
+
+        self.assertEqual(results.count(True), 5)
+        stock = VariantStock.objects.get(variant=self.first)
+        self.assertEqual(stock.quantity_reserved, 5)
+        self.assertEqual(StockReservation.objects.count(), 5)
+
+    def test_overlapping_carts_do_not_deadlock(self):
+        InventoryHelper().set_on_hand(self.first.id, 100)
+        InventoryHelper().set_on_hand(self.second.id, 100)
+
+        forward = [(self.first.id, 1, None), (self.second.id, 1, None)]
+        results = self.run_in_threads([forward, forward[::-1]] * 10)
+
+        self.assertTrue(all(results))
+        self.assertEqual(
+            sorted(VariantStock.objects.values_list("quantity_reserved", flat=True)),
+            [20, 20],
+        )
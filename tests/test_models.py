@@ -0,0 +1,49 @@
+from django.test import TestCase
+
+from django_mall_product.models import (
+    ProductOptionValue,
+    Variant,
+    VariantOptionValue,
+    prefetch_selected_option_values,
+)
+from tests.utils import create_option, create_product, create_variant
+
+
+class SelectedOptionValuesTest(TestCase):
+    def setUp(self):
+        self.product = create_product()
+        _, (self.a, self.b, self.c) = create_option(self.product, "abc")
+        self.first = create_variant(self.product, [self.b, self.c])
+        self.second = create_variant(self.product, [self.b])
+        VariantOptionValue.objects.get(
+            variant=self.first, product_option_value=self.c
+        ).delete()
+
+    def test_prefetch_keeps_shared_values_on_their_variants(self):
+        variants = {
+            variant.pk: variant
+            for variant in Variant.objects.prefetch_related(
+                prefetch_selected_option_values()
+            )
+        }
+
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                list(variants[self.first.pk].get_selected_option_values()), [self.b]
+            )
+            self.assertEqual(
+                list(variants[self.second.pk].get_selected_option_values()), [self.b]
+            )
+
+    def test_filtered_prefetch_skips_missing_values(self):
+        variant = Variant.objects.prefetch_related(
+            prefetch_selected_option_values(
+                queryset=ProductOptionValue.objects.exclude(pk=self.b.pk)
+            )
+        ).get(pk=self.first.pk)
+
+        self.assertEqual(variant.get_selected_option_values(), [])
+
+    def test_without_prefetch_skips_soft_deleted_links(self):
+        self.assertEqual(list(self.first.get_selected_option_values()), [self.b])
+        self.assertEqual(list(self.second.get_selected_option_values()), [self.b])
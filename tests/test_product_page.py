@@ -0,0 +1,25 @@
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from django_mall_product.helpers.product_page_helper import ProductPageHelper
+from django_mall_product.models import ProductPage
+from tests.utils import create_product
+
+
+class ProductPageTest(TestCase):
+    def setUp(self):
+        self.product = create_product(is_published=True)
+
+    def test_unknown_language_code_is_rejected(self):
+        with self.assertRaises(ValidationError):
+            ProductPageHelper().get_payload(self.product.slug, "xx-bogus")
+
+        self.assertFalse(ProductPage.objects.exists())
+
+    def test_page_is_built_lazily(self):
+        payload = ProductPageHelper().get_payload(self.product.slug, "en")
+
+        self.assertEqual(payload["slug"], self.product.slug)
+        self.assertEqual(
+            list(ProductPage.objects.values_list("language_code", flat=True)), ["en"]
+        )
@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+
+from django.test import TestCase
+
+from graphql import parse
+
+from django_mall_product.graphql.storefront.projection import (
+    get_selections,
+    product_projection,
+)
+from django_mall_product.models import Product
+from tests.utils import create_product, create_variant
+
+
+def get_info(query):
+    operation = parse(query).definitions[0]
+
+    return SimpleNamespace(
+        field_nodes=[operation.selection_set.selections[0]], fragments={}
+    )
+
+
+class ProjectionTest(TestCase):
+    query = """
+        {
+            products {
+                edges {
+                    node {
+                        slug
+                        variantSet {
+                            edges { node { slug sku } }
+                        }
+                    }
+                }
+            }
+        }
+    """
+
+    def test_nested_connections_are_unwrapped(self):
+        tree = get_selections(get_info(self.query))
+
+        self.assertEqual(tree["variant_set"], {"slug": {}, "sku": {}})
+
+    def test_nested_connection_is_prefetched_with_its_columns(self):
+        for _ in range(3):
+            product = create_product()
+            create_variant(product, sku="a")
+            create_variant(product, sku="b")
+
+        queryset = product_projection.project(
+            Product.objects.all(), get_info(self.query)
+        )
+
+        with self.assertNumQueries(2):
+            skus = sorted(
+                variant.sku
+                for product in queryset
+                for variant in product.variant_set.all()
+                if variant.slug
+            )
+
+        self.assertEqual(skus, ["a", "a", "a", "b", "b", "b"])
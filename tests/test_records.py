@@ -0,0 +1,88 @@
+import unittest
+
+from django.test import RequestFactory, TestCase, override_settings
+
+from django_mall_product.graphql.schema_storefront import builder
+from django_mall_product.graphql.storefront.records import (
+    ProductRecord,
+    supports_records,
+)
+from django_mall_product.helpers.catalog_helper import CatalogHelper, numpy
+from django_mall_product.models import ProductTrans
+from tests.utils import create_product, create_variant
+
+
+class RowModeTest(TestCase):
+    query = """
+        query Products($rowMode: Boolean) {
+            products(rowMode: $rowMode, orderBy: ["created_at"]) {
+                edges {
+                    node {
+                        id
+                        slug
+                        isVisible
+                        translations { languageCode name }
+                    }
+                }
+            }
+            variants(rowMode: $rowMode, orderBy: ["created_at"]) {
+                edges { node { id slug isPrimary price { amount currency } } }
+            }
+        }
+    """
+
+    def setUp(self):
+        for index in range(3):
+            product = create_product(is_published=True)
+            ProductTrans.objects.create(
+                product=product, language_code="en", name="Product {}".format(index)
+            )
+            create_variant(
+                product, is_published=True, is_primary=True, price_amount=index
+            )
+
+    def execute(self, row_mode):
+        result = builder.get_schema().execute(
+            self.query,
+            variable_values={"rowMode": row_mode},
+            context_value=RequestFactory().post("/storefront/graphql"),
+        )
+        self.assertIsNone(result.errors)
+
+        return result.data
+
+    def test_row_mode_matches_instance_mode(self):
+        self.assertEqual(self.execute(True), self.execute(False))
+
+    def test_unknown_nested_field_falls_back(self):
+        self.assertTrue(supports_records(ProductRecord, {"translations": {"name": {}}}))
+        self.assertFalse(
+            supports_records(ProductRecord, {"translations": {"description": {}}})
+        )
+
+    @unittest.skipUnless(numpy, "The catalog engine needs numpy.")
+    @override_settings(PRODUCT_CATALOG_ENGINE=True)
+    def test_catalog_row_mode_uses_engine(self):
+        CatalogHelper.clear()
+        query = """
+            query ($rowMode: Boolean) {
+                catalogProducts(rowMode: $rowMode) {
+                    engine
+                    results { id slug }
+                }
+            }
+        """
+        results = []
+        for row_mode in (True, False):
+            result = builder.get_schema().execute(
+                query,
+                variable_values={"rowMode": row_mode},
+                context_value=RequestFactory().post("/storefront/graphql"),
+            )
+            self.assertIsNone(result.errors)
+            self.assertEqual(result.data["catalogProducts"]["engine"], "memory")
+            results.append(result.data["catalogProducts"]["results"])
+        CatalogHelper.clear()
+
+        self.assertEqual(len(results[0]), 3)
+        self.assertEqual(results[0], results[1])
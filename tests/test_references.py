@@ -0,0 +1,21 @@
+from django.test import SimpleTestCase
+
+from graphql_relay import to_global_id
+
+from django_mall_product.graphql.dashboard.product import resolve_references
+from django_mall_product.helpers.reference_helper import MissingReferenceError
+
+
+class ResolveReferencesTest(SimpleTestCase):
+    def test_no_references(self):
+        self.assertEqual(
+            resolve_references(None, None, [], None), (None, None, set(), None)
+        )
+
+    def test_reference_to_missing_model_is_rejected(self):
+        place_id = to_global_id("ProductPlaceNode", "1")
+
+        with self.assertRaises(MissingReferenceError) as context:
+            resolve_references(place_id, None, [], None)
+
+        self.assertEqual(context.exception.ids, {"placeId": [place_id]})
@@ -0,0 +1,76 @@
+import time
+from types import SimpleNamespace
+
+from django.contrib.sessions.backends.signed_cookies import SessionStore
+from django.db import transaction
+from django.test import RequestFactory, TransactionTestCase, override_settings
+
+from graphql.language import OperationType
+
+from django_mall_product.graphql.middleware import (
+    PRIMARY_PINNED_UNTIL_SESSION_KEY,
+    DatabaseRouterMiddleware,
+    should_read_from_replica,
+)
+from django_mall_product.models import Product
+from django_mall_product.routers import ProductReplicaRouter, read_from_replica
+from tests.utils import create_product
+
+
+@override_settings(PRODUCT_DATABASE_REPLICAS=["replica"])
+class ProductReplicaRouterTest(TransactionTestCase):
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        self.router = ProductReplicaRouter()
+        self.product = create_product()
+
+    def test_reads_go_to_replica(self):
+        with read_from_replica():
+            queryset = Product.objects.filter(pk=self.product.pk)
+
+            self.assertEqual(queryset.db, "replica")
+            self.assertFalse(queryset.exists())
+
+        self.assertTrue(Product.objects.filter(pk=self.product.pk).exists())
+
+    def test_writes_go_to_primary(self):
+        with read_from_replica():
+            self.assertEqual(self.router.db_for_write(Product), "default")
+
+            product = create_product()
+
+        self.assertEqual(product._state.db, "default")
+        self.assertTrue(Product.objects.using("default").filter(pk=product.pk).exists())
+
+    def test_reads_in_atomic_block_stay_on_primary(self):
+        with read_from_replica(), transaction.atomic():
+            self.assertEqual(self.router.db_for_read(Product), "default")
+
+    def test_session_sticks_to_primary_after_mutation(self):
+        request = RequestFactory().post("/storefront/graphql/")
+        request.session = SessionStore()
+        self.assertTrue(should_read_from_replica(request))
+
+        info = SimpleNamespace(
+            context=request,
+            operation=SimpleNamespace(operation=OperationType.MUTATION),
+            path=SimpleNamespace(prev=None),
+        )
+        databases = []
+
+        def resolve(root, info):
+            databases.append(self.router.db_for_read(Product))
+
+        DatabaseRouterMiddleware().resolve(resolve, None, info)
+
+        self.assertEqual(databases, ["default"])
+        self.assertGreater(
+            request.session[PRIMARY_PINNED_UNTIL_SESSION_KEY], time.time()
+        )
+        self.assertFalse(should_read_from_replica(request))
+
+        info.operation = SimpleNamespace(operation=OperationType.QUERY)
+        DatabaseRouterMiddleware().resolve(resolve, None, info)
+
+        self.assertEqual(databases, ["default", "default"])
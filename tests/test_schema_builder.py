@@ -0,0 +1,41 @@
+from django.test import SimpleTestCase
+
+from graphene import ObjectType, String
+
+from django_mall_product.graphql.schema_builder import (
+    SchemaBuilder,
+    normalize_introspection_query,
+)
+
+
+class Query(ObjectType):
+    name = String()
+
+
+class SchemaBuilderTest(SimpleTestCase):
+    def test_introspection_cache_is_bounded(self):
+        builder = SchemaBuilder("test", queries=["tests.test_schema_builder.Query"])
+        builder.max_introspections = 2
+        queries = [
+            "{ __schema { queryType { name } } }",
+            "{ __schema { types { name } } }",
+            "{ __schema { directives { name } } }",
+        ]
+
+        for query in queries:
+            self.assertIsNotNone(builder.introspect(query))
+        builder.introspect(queries[1])
+
+        self.assertEqual(
+            list(builder.introspections),
+            [
+                normalize_introspection_query(queries[2], None),
+                normalize_introspection_query(queries[1], None),
+            ],
+        )
+
+    def test_non_introspection_query_is_not_cached(self):
+        builder = SchemaBuilder("test", queries=["tests.test_schema_builder.Query"])
+
+        self.assertIsNone(builder.introspect("{ name }"))
+        self.assertEqual(len(builder.introspections), 0)
@@ -0,0 +1,33 @@
+from django.test import RequestFactory, TestCase
+
+from graphql_relay import to_global_id
+
+from django_mall_product.graphql.schema_storefront import builder
+from tests.utils import create_product
+
+
+class StorefrontSchemaTest(TestCase):
+    def test_schema_builds(self):
+        schema = builder.get_schema()
+
+        self.assertIn("products", schema.graphql_schema.query_type.fields)
+        self.assertIn("collectionProducts", schema.graphql_schema.query_type.fields)
+
+    def test_collection_filters_without_collections(self):
+        create_product(is_published=True)
+        collection_id = to_global_id("CollectionNode", "1")
+
+        result = builder.get_schema().execute(
+            """
+            query Products($ids: [ID]) {
+                included: products(collectionIn: $ids) { edges { node { id } } }
+                excluded: products(collectionNotIn: $ids) { edges { node { id } } }
+            }
+            """,
+            variable_values={"ids": [collection_id]},
+            context_value=RequestFactory().post("/storefront/graphql"),
+        )
+
+        self.assertIsNone(result.errors)
+        self.assertEqual(result.data["included"]["edges"], [])
+        self.assertEqual(len(result.data["excluded"]["edges"]), 1)
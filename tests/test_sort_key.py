@@ -0,0 +1,45 @@
+from django.test import TestCase
+
+from django_mall_product.helpers.sort_key_helper import SortKeyHelper
+from django_mall_product.models import Product, ProductOptionValue
+from tests.utils import create_option, create_product
+
+
+class SortKeyHelperTest(TestCase):
+    def get_order(self, queryset):
+        return list(SortKeyHelper().order(queryset).values_list("id", flat=True))
+
+    def test_move_uses_the_gap(self):
+        product = create_product()
+        option, values = create_option(product, ["S", "M", "L"])
+        SortKeyHelper().rebalance_all(ProductOptionValue)
+
+        changed_ids = SortKeyHelper().move(values[2], values[0])
+
+        self.assertEqual(changed_ids, [values[2].id])
+        self.assertEqual(values[2].sort_key, 1536)
+
+    def test_exhausted_gap_rebalances_siblings(self):
+        product = create_product()
+        option, values = create_option(product, ["S", "M", "L"])
+
+        changed_ids = SortKeyHelper().move(values[2], values[0])
+
+        self.assertEqual(set(changed_ids), {values[0].id, values[1].id, values[2].id})
+        siblings = ProductOptionValue.objects.filter(product_option=option)
+        self.assertEqual(
+            self.get_order(siblings), [values[0].id, values[2].id, values[1].id]
+        )
+        self.assertEqual(
+            sorted(siblings.values_list("sort_key", flat=True)), [1024, 1536, 2048]
+        )
+
+    def test_ties_follow_model_ordering(self):
+        second = create_product(serial="b")
+        first = create_product(serial="a")
+
+        SortKeyHelper().rebalance_all(Product)
+
+        self.assertEqual(self.get_order(Product.objects.all()), [first.id, second.id])
+        first.refresh_from_db()
+        self.assertEqual(first.sort_key, 1024)
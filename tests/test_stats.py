@@ -0,0 +1,48 @@
+from django.test import TestCase
+from django.utils import timezone
+
+from django_mall_product.helpers.stat_helper import StatHelper
+from django_mall_product.models import ProductStat
+from tests.utils import create_product, create_variant
+
+
+class StatMergeTest(TestCase):
+    def setUp(self):
+        self.product = create_product()
+        self.variant = create_variant(self.product)
+        self.period_start = timezone.now().replace(minute=0, second=0, microsecond=0)
+
+    def get_rows(self):
+        return [
+            {
+                "product_id": self.product.id,
+                "variant_id": variant_id,
+                "period_start": self.period_start,
+                "count_access": 2,
+                "count_add_to_cart": 1,
+            }
+            for variant_id in (None, self.variant.id)
+        ]
+
+    def test_merge_increments_existing_rows(self):
+        StatHelper().merge("hour", self.get_rows())
+        StatHelper().merge("hour", self.get_rows())
+
+        stats = ProductStat.objects.filter(granularity="hour")
+        self.assertEqual(stats.count(), 2)
+        for stat in stats:
+            self.assertEqual((stat.count_access, stat.count_add_to_cart), (4, 2))
+
+    def test_flush_accumulates(self):
+        stat_helper = StatHelper()
+        stat_helper.record(self.product.id, "count_access", self.variant.id)
+        stat_helper.flush()
+        stat_helper.record(self.product.id, "count_access")
+        stat_helper.flush()
+
+        product_stat = ProductStat.objects.get(granularity="day", variant=None)
+        variant_stat = ProductStat.objects.get(granularity="day", variant=self.variant)
+        self.assertEqual(product_stat.count_access, 2)
+        self.assertEqual(variant_stat.count_access, 1)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.count_access, 2)
@@ -0,0 +1,104 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import (
+    create_option,
+    create_product,
+    create_variant,
+    execute_storefront,
+)
+
+
+class StorefrontQueryCountTest(TestCase):
+    def create_catalog(self, count):
+        for _ in range(count):
+            product = create_product(is_published=True)
+            _, values = create_option(product, ["S", "M"])
+            create_variant(product, values, is_published=True)
+
+    def count_queries(self, query):
+        with CaptureQueriesContext(connection) as context:
+            result = execute_storefront(query)
+
+        self.assertIsNone(result.errors)
+
+        return len(context), result.data
+
+    def test_selected_option_values_are_prefetched(self):
+        query = """
+            {
+                variants {
+                    edges {
+                        node {
+                            id
+                            selectedOptionValues {
+                                edges { node { id sortKey } }
+                            }
+                        }
+                    }
+                }
+            }
+        """
+
+        self.create_catalog(2)
+        few, _ = self.count_queries(query)
+        self.create_catalog(3)
+        many, data = self.count_queries(query)
+
+        self.assertEqual(few, many)
+        self.assertEqual(len(data["variants"]["edges"]), 5)
+        for edge in data["variants"]["edges"]:
+            self.assertEqual(len(edge["node"]["selectedOptionValues"]["edges"]), 2)
+
+    def test_nested_connections_are_prefetched(self):
+        query = """
+            {
+                products {
+                    edges {
+                        node {
+                            id
+                            variantSet {
+                                edges {
+                                    node {
+                                        id
+                                        selectedOptionValues {
+                                            edges { node { id } }
+                                        }
+                                    }
+                                }
+                            }
+                            productoptionSet {
+                                edges {
+                                    node {
+                                        id
+                                        productoptionvalueSet {
+                                            edges { node { id sortKey } }
+                                        }
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        """
+
+        self.create_catalog(2)
+        few, _ = self.count_queries(query)
+        self.create_catalog(3)
+        many, data = self.count_queries(query)
+
+        self.assertEqual(few, many)
+        self.assertEqual(len(data["products"]["edges"]), 5)
+        for edge in data["products"]["edges"]:
+            variants = edge["node"]["variantSet"]["edges"]
+            self.assertEqual(len(variants), 1)
+            self.assertEqual(
+                len(variants[0]["node"]["selectedOptionValues"]["edges"]), 2
+            )
+            options = edge["node"]["productoptionSet"]["edges"]
+            self.assertEqual(len(options), 1)
+            self.assertEqual(
+                len(options[0]["node"]["productoptionvalueSet"]["edges"]), 2
+            )
@@ -0,0 +1,52 @@
+import uuid
+
+from django.test import TestCase
+from graphql_relay import to_global_id
+
+from django_mall_product.helpers.trans_helper import TranslationImportHelper
+from django_mall_product.models import ProductTrans
+from tests.utils import create_product
+
+
+class TranslationImportTest(TestCase):
+    def setUp(self):
+        self.product = create_product()
+
+    def import_rows(self, *rows):
+        content = "type,id,language_code,name\n" + "".join(
+            ",".join(row) + "\n" for row in rows
+        )
+
+        return TranslationImportHelper().import_content(content)
+
+    def test_bad_rows_are_reported_individually(self):
+        option_id = to_global_id("ProductOptionNode", str(self.product.pk))
+        result = self.import_rows(
+            ("product", "not-an-id", "en", "Bad id"),
+            ("product", to_global_id("ProductNode", "1"), "en", "Bad pk"),
+            ("product", option_id, "en", "Wrong type"),
+            ("product", str(self.product.pk), "xx-bogus", "Bad language"),
+            ("product", to_global_id("ProductNode", str(self.product.pk)), "en", "Ok"),
+        )
+
+        self.assertEqual(result["done"], 1)
+        self.assertEqual(
+            result["error"],
+            [
+                "not-an-id",
+                to_global_id("ProductNode", "1"),
+                option_id,
+                str(self.product.pk),
+            ],
+        )
+        self.assertEqual(
+            list(ProductTrans.objects.values_list("language_code", "name")),
+            [("en", "Ok")],
+        )
+
+    def test_unknown_id_is_not_found(self):
+        pk = str(uuid.uuid4())
+        result = self.import_rows(("product", pk, "zh-hant", "Missing"))
+
+        self.assertEqual(result["not_found"], [pk])
+        self.assertEqual(result["error"], [])
@@ -0,0 +1,44 @@
+import uuid
+
+from django.test import RequestFactory
+
+from django_mall_product.graphql.schema_storefront import builder
+from django_mall_product.models import (
+    Product,
+    ProductOption,
+    ProductOptionValue,
+    Variant,
+    VariantOptionValue,
+)
+
+
+def create_product(**kwargs):
+    kwargs.setdefault("slug", uuid.uuid4().hex)
+
+    return Product.objects.create(**kwargs)
+
+
+def create_option(product, values, sort_key=0):
+    option = ProductOption.objects.create(product=product, sort_key=sort_key)
+
+    return option, [
+        ProductOptionValue.objects.create(product_option=option, sort_key=index)
+        for index, _ in enumerate(values)
+    ]
+
+
+def create_variant(product, values=(), **kwargs):
+    kwargs.setdefault("slug", uuid.uuid4().hex)
+    variant = Variant.objects.create(product=product, **kwargs)
+    for value in values:
+        VariantOptionValue.objects.create(variant=variant, product_option_value=value)
+
+    return variant
+
+
+def execute_storefront(query, **variables):
+    return builder.get_schema().execute(
+        query,
+        variable_values=variables,
+        context_value=RequestFactory().post("/storefront/graphql"),
+    )